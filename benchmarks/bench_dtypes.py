@@ -0,0 +1,70 @@
+"""Measure the memory and join time of compact panel dtypes."""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.keys import align_rows
+from forecastkernel.utils.dtypes import compact_panel, frame_memory
+
+
+def make_panel(n_series: int, n_times: int, seed: int = 0) -> pd.DataFrame:
+    """Build a long-format panel with object ids and ``float64`` values."""
+    rng = np.random.default_rng(seed)
+    ids = np.repeat(np.array([f"store_{i:06d}_sku" for i in range(n_series)], dtype=object), n_times)
+    ds = np.tile(pd.date_range("2020-01-01", periods=n_times, freq="D").to_numpy(), n_series)
+    return pd.DataFrame({"unique_id": ids, "ds": ds, "y": rng.gamma(2.0, 10.0, len(ids))})
+
+
+def _best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark compact panel dtypes")
+    parser.add_argument("--n_series", type=int, default=100_000)
+    parser.add_argument("--n_times", type=int, default=100)
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    panel = make_panel(args.n_series, args.n_times)
+    compact = compact_panel(panel)
+    compact32 = compact_panel(panel, y_float32=True)
+    print(f"rows={len(panel):,} series={args.n_series:,}")
+    for label, frame in [("object ids, float64", panel), ("categorical ids", compact),
+                         ("categorical ids, float32", compact32)]:
+        print(f"memory {label:<26}: {frame_memory(frame)['total'] / 2**20:8.1f} MB")
+
+    # Join the last ``horizon`` days of every series (the holdout) back onto
+    # the panel in shuffled order, as evaluation and anchor bias do
+    tail = panel["ds"] >= panel["ds"].max() - pd.Timedelta(days=args.horizon - 1)
+    shuffled = np.random.default_rng(1).permutation(int(tail.sum()))
+    left = panel[tail].iloc[shuffled].reset_index(drop=True)
+    left_compact = compact[tail.to_numpy()].iloc[shuffled].reset_index(drop=True)
+
+    def merge(lhs, rhs):
+        return lhs[["unique_id", "ds"]].merge(rhs, on=["unique_id", "ds"], how="left")
+
+    timings = {
+        "merge, object ids": _best_of(lambda: merge(left, panel), args.repeats),
+        "merge, categorical ids": _best_of(lambda: merge(left_compact, compact), args.repeats),
+        "integer keys": _best_of(lambda: align_rows(left_compact, compact), args.repeats),
+    }
+    rows = align_rows(left_compact, compact)
+    np.testing.assert_array_equal(compact["y"].to_numpy()[rows], merge(left, panel)["y"].to_numpy())
+
+    print(f"join of {len(left):,} rows onto the panel")
+    for label, seconds in timings.items():
+        print(f"join {label:<28}: {seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
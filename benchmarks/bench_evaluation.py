@@ -0,0 +1,82 @@
+"""Compare the single-join evaluation engine with the per-model merge loop."""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.evaluation import evaluate_forecasts
+
+
+def legacy_evaluate_forecasts(
+    forecasts: pd.DataFrame, true_future: pd.DataFrame, forecast_cols: list[str]
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Reference implementation that merges actuals once per model."""
+    metrics = []
+    residuals = []
+    for model in forecast_cols:
+        joined = forecasts[["unique_id", "ds", model]].merge(
+            true_future, on=["unique_id", "ds"], how="left", suffixes=("", "_true")
+        )
+        y_true = joined["y"]
+        y_pred = joined[model]
+        mae = (y_true - y_pred).abs().mean()
+        bias = (y_true - y_pred).mean()
+        metrics.append({"model": model, "mae": mae, "bias": bias, "score": mae + abs(bias)})
+
+        residual_df = joined[["unique_id", "ds"]].copy()
+        residual_df[model] = y_true - y_pred
+        residuals.append(residual_df.set_index(["unique_id", "ds"]))
+    return pd.DataFrame(metrics), pd.concat(residuals, axis=1).reset_index()
+
+
+def make_panel(n_series: int, h: int, n_models: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """Build synthetic forecasts and actuals for ``n_series`` series."""
+    rng = np.random.default_rng(seed)
+    ids = np.repeat([f"id_{i}" for i in range(n_series)], h)
+    ds = np.tile(pd.date_range("2024-01-01", periods=h, freq="D").to_numpy(), n_series)
+    y = rng.normal(100, 10, len(ids))
+    true_future = pd.DataFrame({"unique_id": ids, "ds": ds, "y": y})
+
+    forecast_cols = [f"model_{m}" for m in range(n_models)]
+    forecasts = pd.DataFrame({"unique_id": ids, "ds": ds})
+    for col in forecast_cols:
+        forecasts[col] = y + rng.normal(0, 5, len(ids))
+    return forecasts, true_future, forecast_cols
+
+
+def _best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark evaluate_forecasts")
+    parser.add_argument("--n_series", type=int, default=100_000)
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--n_models", type=int, default=6)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    forecasts, true_future, cols = make_panel(args.n_series, args.horizon, args.n_models)
+
+    legacy = _best_of(lambda: legacy_evaluate_forecasts(forecasts, true_future, cols), args.repeats)
+    columnar = _best_of(lambda: evaluate_forecasts(forecasts, true_future, cols, ""), args.repeats)
+
+    ref, _ = legacy_evaluate_forecasts(forecasts, true_future, cols)
+    new, _ = evaluate_forecasts(forecasts, true_future, cols, "")
+    np.testing.assert_allclose(ref["score"], new["score"])
+
+    print(f"rows={len(forecasts):,} models={len(cols)}")
+    print(f"legacy per-model merge : {legacy:.3f}s")
+    print(f"single-join columnar   : {columnar:.3f}s")
+    print(f"speedup                : {legacy / columnar:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Synthetic long-format panels for the benchmark suite."""
+
+import numpy as np
+import pandas as pd
+
+# Panel shapes used by ``run_suite.py``. ``intermittency`` is the share of
+# zero demand and ``ragged`` draws series lengths between half and the full
+# ``length``.
+SIZES = {
+    "1k": {"n_series": 1_000, "length": 120, "intermittency": 0.0, "ragged": False},
+    "1k_intermittent": {"n_series": 1_000, "length": 120, "intermittency": 0.6, "ragged": True},
+    "100k": {"n_series": 100_000, "length": 60, "intermittency": 0.0, "ragged": False},
+    "100k_intermittent": {"n_series": 100_000, "length": 60, "intermittency": 0.6, "ragged": True},
+}
+
+
+def make_panel(
+    n_series: int,
+    length: int,
+    intermittency: float = 0.0,
+    ragged: bool = False,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Build a daily panel of seasonal, optionally intermittent demand.
+
+    Parameters
+    ----------
+    n_series : int
+        Number of series.
+    length : int
+        Observations per series (the longest series when ``ragged``).
+    intermittency : float, optional
+        Probability that an observation is zero.
+    ragged : bool, optional
+        Draw every series length uniformly from ``[length // 2, length]``;
+        all series end on the same day.
+    seed : int, optional
+        Random seed.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``unique_id``, ``ds`` and ``y`` sorted by series and time.
+    """
+    rng = np.random.default_rng(seed)
+    if ragged:
+        lengths = rng.integers(max(length // 2, 1), length + 1, n_series)
+    else:
+        lengths = np.full(n_series, length)
+    ids = np.repeat(np.array([f"id_{i:06d}" for i in range(n_series)], dtype=object), lengths)
+
+    # Position of every row counted from the end of its series
+    ends = np.cumsum(lengths)
+    from_end = np.repeat(ends, lengths) - np.arange(ends[-1]) - 1
+    days = pd.date_range("2020-01-01", periods=length, freq="D").to_numpy()
+    ds = days[length - 1 - from_end]
+
+    level = np.repeat(rng.gamma(2.0, 20.0, n_series), lengths)
+    season = 1.0 + 0.3 * np.sin(2 * np.pi * (length - from_end) / 7)
+    y = level * season * rng.lognormal(0.0, 0.2, len(ids))
+    if intermittency > 0:
+        y[rng.random(len(ids)) < intermittency] = 0.0
+    return pd.DataFrame({"unique_id": ids, "ds": ds, "y": y})
+
+
+def make_forecasts(
+    panel: pd.DataFrame, h: int, n_models: int = 6, seed: int = 1
+) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """Return noisy forecasts of the last ``h`` days of every series.
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, pandas.DataFrame, list[str]]
+        Forecasts with one column per model, the matching actuals and the
+        model column names.
+    """
+    rng = np.random.default_rng(seed)
+    true_future = panel[panel["ds"] > panel["ds"].max() - pd.Timedelta(days=h)].reset_index(drop=True)
+    forecast_cols = [f"model_{m}" for m in range(n_models)]
+    forecasts = true_future[["unique_id", "ds"]].copy()
+    scale = true_future["y"].to_numpy().std()
+    for m, col in enumerate(forecast_cols):
+        forecasts[col] = true_future["y"].to_numpy() + rng.normal(0.05 * m * scale, 0.3 * scale, len(forecasts))
+    return forecasts, true_future, forecast_cols
+
+
+def make_residuals(panel: pd.DataFrame, n_models: int = 6, seed: int = 2) -> tuple[pd.DataFrame, list[str]]:
+    """Return residuals for every row of ``panel`` with a late shift in some series."""
+    rng = np.random.default_rng(seed)
+    models = [f"model_{m}" for m in range(n_models)]
+    residuals = panel[["unique_id", "ds"]].copy()
+    late = (panel["ds"] > panel["ds"].max() - pd.Timedelta(days=14)).to_numpy()
+    shifted = (pd.util.hash_array(panel["unique_id"].to_numpy()) % 10 == 0) & late
+    for col in models:
+        residuals[col] = rng.normal(0.0, 1.0, len(panel)) + 1.5 * shifted
+    return residuals, models
@@ -0,0 +1,270 @@
+"""Time the core kernels and the baseline flow and compare with a saved baseline.
+
+Every case runs on the synthetic panels of :data:`panels.SIZES`. Wall time is
+the best of ``--repeats`` runs; peak memory is the largest traced allocation
+(:mod:`tracemalloc`, which numpy reports to) of one extra run, so it measures
+what the case allocates on top of its inputs. Results are written as JSON
+with ``--output``; ``--baseline`` compares against such a file and exits
+with status 1 when a case got slower or larger than the tolerances allow.
+
+    python benchmarks/run_suite.py --sizes 1k --output baseline.json
+    python benchmarks/run_suite.py --sizes 1k --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from panels import SIZES, make_forecasts, make_panel, make_residuals
+
+HORIZON = 14
+SEASON_LENGTH = 7
+# Series fitted by the end-to-end baseline case, which is dominated by the
+# StatsForecast fit and would otherwise take minutes
+FLOW_SERIES = 200
+
+
+def _fixtures(spec: dict, workdir: str) -> dict:
+    """Build the inputs shared by all cases of one panel size."""
+    panel = make_panel(**spec)
+    forecasts, true_future, forecast_cols = make_forecasts(panel, HORIZON)
+    residuals, models = make_residuals(panel)
+
+    # Ten atomic series per parent; the anchor is the parent-level total
+    mapping = pd.Series(
+        [f"parent_{i // 10:05d}" for i in range(spec["n_series"])],
+        index=[f"id_{i:06d}" for i in range(spec["n_series"])],
+    )
+    anchor = forecasts.assign(unique_id=forecasts["unique_id"].map(mapping))
+    anchor = anchor.groupby(["unique_id", "ds"], as_index=False)[forecast_cols].sum()
+
+    # One long series for the single-series forecastability metrics
+    single = panel.iloc[:min(len(panel), 100_000)].assign(unique_id="all")
+
+    flow_panel = panel[panel["unique_id"].isin(mapping.index[:FLOW_SERIES])]
+    data_path = os.path.join(workdir, "panel.parquet")
+    flow_panel.to_parquet(data_path, index=False)
+    return {
+        "panel": panel, "forecasts": forecasts, "true_future": true_future,
+        "forecast_cols": forecast_cols, "residuals": residuals, "models": models,
+        "mapping": mapping, "anchor": anchor, "single": single,
+        "data_path": data_path, "flow_rows": len(flow_panel), "workdir": workdir,
+    }
+
+
+def bench_holdout_split(data: dict):
+    from forecastkernel.core.splits import holdout_split
+
+    return lambda: holdout_split(data["panel"], HORIZON), len(data["panel"])
+
+
+def bench_evaluate_forecasts(data: dict):
+    from forecastkernel.core.evaluation import evaluate_forecasts
+
+    return lambda: evaluate_forecasts(
+        data["forecasts"], data["true_future"], data["forecast_cols"], "", per_series=True
+    ), len(data["forecasts"])
+
+
+def bench_decompose_errors(data: dict):
+    from forecastkernel.core.decomposition import decompose_errors
+
+    return lambda: decompose_errors(data["residuals"], data["models"], SEASON_LENGTH), len(data["residuals"])
+
+
+def bench_detect_residual_drift(data: dict):
+    from forecastkernel.core.drift import detect_residual_drift
+
+    return lambda: detect_residual_drift(data["residuals"], data["models"][0], HORIZON), len(data["residuals"])
+
+
+def bench_detect_panel_drift(data: dict):
+    from forecastkernel.core.drift import detect_panel_drift
+
+    return lambda: detect_panel_drift(data["residuals"], data["models"], HORIZON), len(data["residuals"])
+
+
+def bench_compute_forecastability_metrics(data: dict):
+    from forecastkernel.core.forecastability import compute_forecastability_metrics
+
+    return lambda: compute_forecastability_metrics(data["single"]), len(data["single"])
+
+
+def bench_profile_forecastability(data: dict):
+    from forecastkernel.core.forecastability import profile_forecastability
+
+    return lambda: profile_forecastability(data["panel"]), len(data["panel"])
+
+
+def bench_compute_anchor_bias(data: dict):
+    from forecastkernel.core.aggregation import compute_anchor_bias
+
+    return lambda: compute_anchor_bias(
+        data["forecasts"], data["anchor"], data["forecast_cols"][0], data["mapping"]
+    ), len(data["forecasts"])
+
+
+def bench_baseline_sf(data: dict):
+    from forecastkernel.scripts.baseline_sf import make_config, run_baseline
+
+    # The first FLOW_SERIES series only, fitted and backtested one process at
+    # a time. Plots are skipped: their number is capped by
+    # --plot_max_series, not by the panel, and rendering would dominate
+    config = make_config(
+        data["data_path"], output_dir=os.path.join(data["workdir"], "baseline"),
+        horizon=HORIZON, season_length=SEASON_LENGTH, n_jobs=1, cv_workers=1, no_plots=True,
+        no_mlflow=True, no_cache=True,
+    )
+    return lambda: run_baseline(config), data["flow_rows"]
+
+
+# Case name -> (factory returning the timed callable and its input rows,
+# sizes it runs on or None for all sizes)
+CASES = {
+    "holdout_split": (bench_holdout_split, None),
+    "evaluate_forecasts": (bench_evaluate_forecasts, None),
+    "decompose_errors": (bench_decompose_errors, None),
+    "detect_residual_drift": (bench_detect_residual_drift, None),
+    "detect_panel_drift": (bench_detect_panel_drift, None),
+    "compute_forecastability_metrics": (bench_compute_forecastability_metrics, None),
+    "profile_forecastability": (bench_profile_forecastability, None),
+    "compute_anchor_bias": (bench_compute_anchor_bias, None),
+    "baseline_sf": (bench_baseline_sf, ("1k", "1k_intermittent")),
+}
+
+
+def measure(fn, repeats: int) -> dict:
+    """Return the best wall time and the traced peak memory of ``fn``."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 2**20}
+
+
+def run_suite(sizes: list[str], cases: list[str], repeats: int) -> dict:
+    """Run ``cases`` on every panel size and return the results payload."""
+    from forecastkernel.utils.git_utils import get_git_commit_hash
+
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            data = _fixtures(SIZES[size], workdir)
+            for name in cases:
+                factory, case_sizes = CASES[name]
+                if case_sizes is not None and size not in case_sizes:
+                    continue
+                fn, rows = factory(data)
+                result = measure(fn, repeats)
+                result["rows"] = rows
+                results[f"{name}[{size}]"] = result
+                print(f"{name}[{size}]: {result['seconds']:.4f}s, {result['peak_mb']:.1f} MB", flush=True)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": get_git_commit_hash(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    time_tolerance: float = 0.25,
+    memory_tolerance: float = 0.25,
+    min_seconds: float = 0.005,
+) -> list[dict]:
+    """Compare two results payloads case by case.
+
+    A case regresses when its time exceeds the baseline by more than
+    ``time_tolerance`` (relative) and ``min_seconds`` (absolute, to ignore
+    timer noise on fast cases), or its peak memory by more than
+    ``memory_tolerance`` and 1 MB. Cases missing from the baseline are
+    reported as new.
+
+    Returns
+    -------
+    list[dict]
+        One row per case of ``current``.
+    """
+    rows = []
+    for case, result in current["results"].items():
+        ref = baseline["results"].get(case)
+        row = {"case": case, "seconds": result["seconds"], "peak_mb": result["peak_mb"]}
+        if ref is None:
+            rows.append({**row, "status": "new"})
+            continue
+        slower = (
+            result["seconds"] > ref["seconds"] * (1 + time_tolerance)
+            and result["seconds"] - ref["seconds"] > min_seconds
+        )
+        larger = (
+            result["peak_mb"] > ref["peak_mb"] * (1 + memory_tolerance)
+            and result["peak_mb"] - ref["peak_mb"] > 1.0
+        )
+        status = " and ".join(label for label, hit in [("slower", slower), ("larger", larger)] if hit)
+        rows.append({
+            **row,
+            "time_ratio": result["seconds"] / ref["seconds"] if ref["seconds"] else np.nan,
+            "memory_ratio": result["peak_mb"] / ref["peak_mb"] if ref["peak_mb"] else np.nan,
+            "status": f"REGRESSION ({status})" if status else "ok",
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the core kernels and the baseline flow")
+    parser.add_argument("--sizes", type=str, default="1k,1k_intermittent", help=f"Comma-separated panel sizes out of {', '.join(SIZES)}")
+    parser.add_argument("--cases", type=str, default=None, help="Comma-separated cases to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case; the best is kept")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=str, default=None, help="Results file to compare against")
+    parser.add_argument("--time_tolerance", type=float, default=0.25, help="Relative slowdown flagged as a regression")
+    parser.add_argument("--memory_tolerance", type=float, default=0.25, help="Relative peak memory growth flagged as a regression")
+    args = parser.parse_args()
+
+    sizes = args.sizes.split(",")
+    cases = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [s for s in sizes if s not in SIZES] + [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"Unknown sizes or cases: {unknown}")
+
+    current = run_suite(sizes, cases, args.repeats)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        from tabulate import tabulate
+
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.time_tolerance, args.memory_tolerance)
+        print(tabulate(pd.DataFrame(rows), headers="keys", showindex=False, floatfmt=".3f"))
+        if any(row["status"].startswith("REGRESSION") for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
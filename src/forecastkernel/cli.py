@@ -1 +1,70 @@
-# Entry point for command line interface.
+"""Entry point for the ``forecastkernel`` command line interface.
+
+Each subcommand names a module under :mod:`forecastkernel.scripts` that is
+imported only when that subcommand runs, so ``forecastkernel --help`` and the
+lightweight checks never load statsforecast, MLflow or matplotlib.
+"""
+
+import importlib
+import sys
+
+# Subcommand -> (module, one-line description)
+COMMANDS = {
+    "baseline": ("forecastkernel.scripts.baseline_sf", "Run the StatsForecast baseline pipeline"),
+    "cascade": ("forecastkernel.scripts.cascade", "Run cascade levels against their parent runs"),
+    "partition": ("forecastkernel.scripts.partitioned_baseline", "Run the baseline over hash partitions"),
+    "reconcile": ("forecastkernel.scripts.reconcile", "Aggregate a hierarchy and reconcile forecasts"),
+    "preflight": ("forecastkernel.scripts.data_preflight", "Check an input dataset before training"),
+    "validate-hashes": ("forecastkernel.scripts.validate_hashes", "Validate run outputs against an audit log"),
+    "ci-check": ("forecastkernel.scripts.run_ci_check", "Validate CI audit log hashes"),
+    "publish": ("forecastkernel.scripts.publish_forecasts", "Compile run forecasts into a serving store"),
+    "serve": ("forecastkernel.scripts.serve_forecasts", "Serve forecast stores over HTTP"),
+    "check-storage": ("forecastkernel.scripts.check_storage", "Report storage used by run outputs"),
+    "visual-audit": ("forecastkernel.scripts.visual_delta_audit", "Plot forecast deltas between runs"),
+}
+
+
+def _usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: forecastkernel <command> [options]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {help_text}" for name, (_, help_text) in COMMANDS.items()]
+    lines += ["", "Run 'forecastkernel <command> --help' for the options of a command."]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Dispatch ``argv`` to the ``main`` of the selected script.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments without the program name. Defaults to
+        ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        Process exit status.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_usage())
+        return 0 if argv else 2
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"forecastkernel: unknown command '{command}'\n\n{_usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(COMMANDS[command][0])
+    # Scripts parse sys.argv themselves; present them with their own options
+    saved_argv = sys.argv
+    sys.argv = [f"forecastkernel {command}", *args]
+    try:
+        module.main()
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Mergeable column moments for statistics computed over chunks.
+
+An accumulator holds, per column, the count of finite values, their mean,
+the sum of squared deviations from the mean (``m2``) and the sum of absolute
+values. Accumulators of disjoint row blocks are combined with the pairwise
+update of Chan, Golub and LeVeque, so the result equals a single pass over
+all rows regardless of how they were split, without the cancellation of
+naive sum-of-squares formulas.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def empty_moments(n_cols: int) -> dict:
+    """Return an accumulator of ``n_cols`` columns with no observations."""
+    return {
+        "n": np.zeros(n_cols, dtype=np.int64),
+        "mean": np.zeros(n_cols),
+        "m2": np.zeros(n_cols),
+        "abs_sum": np.zeros(n_cols),
+    }
+
+
+def block_moments(values: np.ndarray) -> dict:
+    """Return the moments of every column of ``values``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Array of shape ``(n_rows,)`` or ``(n_rows, n_cols)``. ``NaN`` and
+        infinite entries are ignored.
+
+    Returns
+    -------
+    dict
+        ``n``, ``mean``, ``m2`` and ``abs_sum`` arrays of length ``n_cols``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values.reshape(len(values), -1)
+    valid = np.isfinite(values)
+    filled = np.where(valid, values, 0.0)
+    n = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(n > 0, filled.sum(axis=0) / n, 0.0)
+    m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+    return {"n": n.astype(np.int64), "mean": mean, "m2": m2, "abs_sum": np.abs(filled).sum(axis=0)}
+
+
+def merge_moments(left: dict, right: dict) -> dict:
+    """Combine the accumulators of two disjoint row blocks."""
+    n = left["n"] + right["n"]
+    delta = right["mean"] - left["mean"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(n > 0, right["n"] / n, 0.0)
+    return {
+        "n": n,
+        "mean": left["mean"] + delta * share,
+        "m2": left["m2"] + right["m2"] + delta ** 2 * left["n"] * share,
+        "abs_sum": left["abs_sum"] + right["abs_sum"],
+    }
+
+
+def moment_stats(moments: dict) -> dict:
+    """Return ``n``, ``mean``, population ``var`` and ``mean_abs`` per column.
+
+    Columns without observations have ``NaN`` statistics.
+    """
+    n = moments["n"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "n": n,
+            "mean": np.where(n > 0, moments["mean"], np.nan),
+            "var": np.where(n > 0, moments["m2"] / n, np.nan),
+            "mean_abs": np.where(n > 0, moments["abs_sum"] / n, np.nan),
+        }
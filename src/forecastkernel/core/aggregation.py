@@ -4,13 +4,19 @@ from __future__ import annotations
 
 import json
 import os
+
+import numpy as np
 import pandas as pd
 
+from forecastkernel.core.keys import align_rows
+from forecastkernel.utils.io_utils import find_artifact
+
 
 def compute_anchor_bias(
     atomic_forecasts: pd.DataFrame,
     anchor_forecasts: pd.DataFrame,
     model: str,
+    mapping: pd.Series | dict | None = None,
 ) -> pd.Series:
     """Return the bias between atomic and aggregate forecasts.
 
@@ -22,6 +28,11 @@ def compute_anchor_bias(
         Forecasts from the upstream aggregation level with the same columns.
     model : str
         Column name of the forecast to compare.
+    mapping : pandas.Series or dict, optional
+        Parent ``unique_id`` of every atomic series (see
+        :func:`forecastkernel.core.hierarchy.parent_map`). When given, atomic
+        forecasts are summed per parent before comparison; otherwise both
+        levels must share identifiers.
 
     Returns
     -------
@@ -30,13 +41,19 @@ def compute_anchor_bias(
         ``unique_id`` and ``ds``.
     """
     atomic = atomic_forecasts[["unique_id", "ds", model]].copy()
-    anchor = anchor_forecasts[["unique_id", "ds", model]].copy()
-
-    joined = atomic.merge(anchor, on=["unique_id", "ds"], how="left", suffixes=("", "_anchor"))
-    if joined[f"{model}_anchor"].isna().any():
+    if mapping is not None:
+        atomic["unique_id"] = atomic["unique_id"].map(mapping)
+        if atomic["unique_id"].isna().any():
+            raise ValueError("Hierarchy mapping missing for some atomic series.")
+        atomic = atomic.groupby(["unique_id", "ds"], as_index=False, sort=True, observed=True)[model].sum()
+
+    rows = align_rows(atomic, anchor_forecasts)
+    if (rows < 0).any():
         raise ValueError("Anchor forecasts missing for some timestamps.")
-
-    return joined[model] - joined[f"{model}_anchor"]
+    anchor = anchor_forecasts[model].to_numpy(dtype=np.float64)[rows]
+    if np.isnan(anchor).any():
+        raise ValueError("Anchor forecasts missing for some timestamps.")
+    return pd.Series(atomic[model].to_numpy(dtype=np.float64) - anchor, index=pd.RangeIndex(len(atomic)))
 
 
 def enforce_cascade_checks(parent_dir: str) -> None:
@@ -65,7 +82,13 @@ def enforce_cascade_checks(parent_dir: str) -> None:
     if drift.get("drift_detected", False):
         raise ValueError("❌ Drift unresolved in parent run. Cascade blocked.")
 
-    forecast_path = os.path.join(parent_dir, "baseline_forecasts.csv")
-    if not os.path.exists(forecast_path):
+    # Online monitor status written after the run (see core.drift_monitor)
+    online_path = os.path.join(parent_dir, "drift_monitor.json")
+    if os.path.exists(online_path):
+        with open(online_path, "r") as f:
+            if json.load(f).get("drift_detected", False):
+                raise ValueError("❌ Online drift monitor alarmed in parent run. Cascade blocked.")
+
+    if find_artifact(parent_dir, "baseline_forecasts") is None:
         raise FileNotFoundError("Missing anchor forecasts for cascade.")
 
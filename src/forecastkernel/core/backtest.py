@@ -0,0 +1,239 @@
+"""Rolling-origin backtesting with per-window results streamed to disk."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.evaluation import grouped_metrics
+from forecastkernel.core.splits import rolling_origin_splits
+
+WINDOW_FILE = "window_{:03d}.parquet"
+
+
+def _run_window(
+    window: int, window_df: pd.DataFrame, models: list, h: int, freq: str, output_dir: str,
+    n_jobs: int = 1,
+) -> str:
+    """Cross-validate one forecast origin and write its rows to Parquet."""
+    from statsforecast import StatsForecast
+
+    sf = StatsForecast(models=models, freq=freq, n_jobs=n_jobs)
+    cv = sf.cross_validation(df=window_df, h=h, n_windows=1)
+    if "Naive" in cv.columns and "SeasonalNaive" in cv.columns:
+        cv["ensemble_naive"] = (cv["Naive"] + cv["SeasonalNaive"]) / 2
+    cv.insert(0, "window", window)
+
+    path = os.path.join(output_dir, WINDOW_FILE.format(window))
+    cv.to_parquet(path, index=False)
+    return path
+
+
+def _collect_window(future, window: int, n_optional: int, paths: dict) -> None:
+    """Record a finished window, dropping optional windows that failed."""
+    try:
+        paths[window] = future.result()
+    except Exception:
+        if window >= n_optional:
+            raise
+
+
+def run_backtest_windows(
+    df: pd.DataFrame,
+    models: list,
+    h: int,
+    n_windows: int,
+    output_dir: str,
+    step_size: int | None = None,
+    freq: str = "D",
+    max_workers: int | None = None,
+    n_jobs: int = 1,
+    required_windows: int | None = None,
+) -> list[str]:
+    """Forecast several rolling origins, in a process pool or in-process.
+
+    Each window is the panel truncated at its origin and evaluated with
+    StatsForecast's cross-validation path for one window, so every series
+    contributes its own last ``h`` observations before the origin. At most
+    ``max_workers`` windows are in flight at once and each writes its result
+    straight to disk, so parent memory does not grow with ``n_windows``.
+    With ``max_workers=1`` the windows run one after another in this
+    process, which avoids starting and importing StatsForecast in workers.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format panel with ``unique_id``, ``ds`` and ``y`` columns.
+    models : list
+        StatsForecast model instances.
+    h : int
+        Forecast horizon per window.
+    n_windows : int
+        Number of forecast origins.
+    output_dir : str
+        Directory receiving ``window_XXX.parquet`` files.
+    step_size : int, optional
+        Distance between origins. Defaults to ``h``.
+    freq : str, optional
+        Pandas frequency passed to StatsForecast.
+    max_workers : int, optional
+        Number of concurrent windows. Defaults to the CPU count.
+    n_jobs : int, optional
+        StatsForecast processes fitting the series of each window (``-1``
+        uses all cores). Keep it at 1 when several windows run at once.
+    required_windows : int, optional
+        Number of latest origins that must be fitted. Earlier windows whose
+        fit raises, typically because the history before their origin is too
+        short for a model, are skipped. Defaults to all windows.
+
+    Returns
+    -------
+    list[str]
+        Window result paths ordered from the earliest origin to the latest.
+        Skipped windows have no entry, so fewer than ``n_windows`` paths may
+        be returned.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    splits = rolling_origin_splits(df, h, n_windows=n_windows, step_size=step_size)
+    max_workers = max_workers or os.cpu_count() or 1
+    n_optional = 0 if required_windows is None else max(n_windows - required_windows, 0)
+
+    paths = {}
+    if max_workers == 1:
+        for window, (train_idx, holdout_idx) in enumerate(splits):
+            window_df = df.take(np.concatenate([train_idx, holdout_idx]))
+            try:
+                paths[window] = _run_window(window, window_df, models, h, freq, output_dir, n_jobs)
+            except Exception:
+                if window >= n_optional:
+                    raise
+        return [paths[w] for w in sorted(paths)]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        pending = {}
+        for window, (train_idx, holdout_idx) in enumerate(splits):
+            if len(pending) >= max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _collect_window(future, pending.pop(future), n_optional, paths)
+            window_df = df.take(np.concatenate([train_idx, holdout_idx]))
+            future = pool.submit(_run_window, window, window_df, models, h, freq, output_dir, n_jobs)
+            pending[future] = window
+        for future, window in pending.items():
+            _collect_window(future, window, n_optional, paths)
+
+    return [paths[w] for w in sorted(paths)]
+
+
+def score_backtest(
+    window_paths: list[str], forecast_cols: list[str], series_metrics_path: str | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Score window results one file at a time.
+
+    Parameters
+    ----------
+    window_paths : list of str
+        Files produced by :func:`run_backtest_windows`.
+    forecast_cols : list
+        Model columns to score.
+    series_metrics_path : str, optional
+        If given, per-window :func:`grouped_metrics` tables are appended to
+        this Parquet file as they are computed.
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, pandas.DataFrame]
+        Metrics pooled over all windows in the ``evaluate_forecasts`` layout
+        (``model``, ``mae``, ``bias``, ``score``) and a per-window table with
+        an extra ``window`` column.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    abs_sum = np.zeros(len(forecast_cols))
+    err_sum = np.zeros(len(forecast_cols))
+    n_obs = 0
+    window_rows = []
+    writer = None
+    try:
+        for path in window_paths:
+            cv = pd.read_parquet(path, columns=["window", "unique_id", "y", *forecast_cols])
+            resid = cv["y"].to_numpy(np.float64)[:, None] - cv[forecast_cols].to_numpy(np.float64)
+
+            abs_sum += np.abs(resid).sum(axis=0)
+            err_sum += resid.sum(axis=0)
+            n_obs += len(resid)
+
+            mae = np.abs(resid).mean(axis=0)
+            bias = resid.mean(axis=0)
+            window_rows.append(pd.DataFrame({
+                "window": int(cv["window"].iloc[0]),
+                "model": forecast_cols,
+                "mae": mae,
+                "bias": bias,
+                "score": mae + np.abs(bias),
+            }))
+
+            if series_metrics_path:
+                table = grouped_metrics(cv["unique_id"], resid, forecast_cols)
+                table.insert(0, "window", int(cv["window"].iloc[0]))
+                arrow = pa.Table.from_pandas(table, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(series_metrics_path, arrow.schema)
+                writer.write_table(arrow)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    mae = abs_sum / max(n_obs, 1)
+    bias = err_sum / max(n_obs, 1)
+    pooled = pd.DataFrame({
+        "model": forecast_cols,
+        "mae": mae,
+        "bias": bias,
+        "score": mae + np.abs(bias),
+    })
+    per_window = pd.concat(window_rows, ignore_index=True) if window_rows else pd.DataFrame()
+    return pooled, per_window
+
+
+def backtest_residuals(
+    window_paths: list[str], forecast_cols: list[str], center: bool = False
+) -> pd.DataFrame:
+    """Collect out-of-sample residuals of all windows in time order.
+
+    Parameters
+    ----------
+    window_paths : list of str
+        Files produced by :func:`run_backtest_windows`, earliest origin first.
+    forecast_cols : list
+        Model columns to difference against ``y``.
+    center : bool, optional
+        Subtract each series' mean residual within every window. Level
+        forecasts such as Naive carry the error of their origin value into
+        the whole window, so pooling uncentred windows mixes per-origin
+        offsets into the residual distribution.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``unique_id``, ``ds`` and one residual column per model, laid out like
+        the residual frame of :func:`evaluate_forecasts`. When windows overlap
+        the residual from the latest origin is kept.
+    """
+    frames = []
+    for path in window_paths:
+        cv = pd.read_parquet(path, columns=["unique_id", "ds", "y", *forecast_cols])
+        resid = cv["y"].to_numpy(np.float64)[:, None] - cv[forecast_cols].to_numpy(np.float64)
+        resid = pd.DataFrame(resid, columns=forecast_cols)
+        if center:
+            resid -= resid.groupby(cv["unique_id"].to_numpy()).transform("mean")
+        frames.append(pd.concat([cv[["unique_id", "ds"]], resid], axis=1))
+    residuals = pd.concat(frames, ignore_index=True)
+    return residuals.drop_duplicates(["unique_id", "ds"], keep="last").reset_index(drop=True)
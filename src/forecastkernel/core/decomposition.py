@@ -5,36 +5,193 @@ import json
 import os
 import pandas as pd
 
-def decompose_errors(
-    residuals_df: pd.DataFrame, forecast_cols: list[str]
+from forecastkernel.core.accumulators import block_moments, merge_moments, moment_stats
+from forecastkernel.core.segments import segment_order, segment_sum
+from forecastkernel.core.splits import series_positions
+
+COMPONENTS = {
+    "bias_error": "Bias Error",
+    "variance_error": "Variance Error",
+    "noise": "Noise",
+    "seasonality_miss": "Seasonality Miss",
+}
+
+
+def _series_layout(residuals_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return row order, position within series and segment starts.
+
+    Rows are grouped by ``unique_id`` and ordered by ``ds`` when those columns
+    exist; otherwise the frame is treated as one series in its given order.
+    """
+    n = len(residuals_df)
+    if "unique_id" not in residuals_df.columns:
+        order = np.arange(n)
+        return order, order.copy(), np.zeros(min(n, 1), dtype=np.intp)
+    if "ds" in residuals_df.columns:
+        order, position, _ = series_positions(residuals_df)
+        return order, position, np.flatnonzero(position == 0)
+    order, starts, _ = segment_order(residuals_df["unique_id"])
+    position = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+    return order, position, starts
+
+
+def _seasonal_abs_diff(values: np.ndarray, position: np.ndarray, season_length: int) -> np.ndarray:
+    """Return ``|r_t - r_{t-s}|`` within each series, ``NaN`` where undefined."""
+    out = np.full_like(values, np.nan)
+    if season_length < len(values):
+        out[season_length:] = np.abs(values[season_length:] - values[:-season_length])
+    out[position < season_length] = np.nan
+    return out
+
+
+def _nan_segment_mean(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(values)
+    counts = segment_sum(valid.astype(np.int64), starts)
+    sums = segment_sum(np.where(valid, values, 0.0), starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def decompose_series_errors(
+    residuals_df: pd.DataFrame, forecast_cols: list[str], season_length: int = 7
+) -> pd.DataFrame:
+    """Return the error breakdown of every series and model in one pass.
+
+    Parameters
+    ----------
+    residuals_df : pandas.DataFrame
+        Residuals with ``unique_id``, ``ds`` and one column per model.
+    forecast_cols : list
+        Names of forecast columns to analyse.
+    season_length : int, optional
+        Lag of the seasonal difference used for ``seasonality_miss``. Lags
+        never reach across series boundaries.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``unique_id``, ``model``, ``n_obs`` and the ``bias_error``,
+        ``variance_error``, ``noise`` and ``seasonality_miss`` components.
+        Missing residuals are ignored; ``seasonality_miss`` is ``NaN`` for
+        series shorter than ``season_length + 1``.
+    """
+    order, position, starts = _series_layout(residuals_df)
+    values = residuals_df[forecast_cols].to_numpy(np.float64)[order]
+    lengths = np.diff(np.r_[starts, len(order)])
+    group = np.repeat(np.arange(len(starts)), lengths)
+
+    bias = _nan_segment_mean(values, starts)
+    centred = values - bias[group]
+    variance = _nan_segment_mean(centred ** 2, starts)
+    noise = _nan_segment_mean(np.abs(centred), starts)
+    seasonal = _nan_segment_mean(_seasonal_abs_diff(values, position, season_length), starts)
+    n_obs = segment_sum((~np.isnan(values)).astype(np.int64), starts)
+
+    ids = residuals_df["unique_id"].to_numpy()[order][starts] if "unique_id" in residuals_df else [None] * len(starts)
+    n_models = len(forecast_cols)
+    return pd.DataFrame({
+        "unique_id": np.repeat(ids, n_models),
+        "model": np.tile(forecast_cols, len(starts)),
+        "n_obs": n_obs.ravel(),
+        "bias_error": bias.ravel(),
+        "variance_error": variance.ravel(),
+        "noise": noise.ravel(),
+        "seasonality_miss": seasonal.ravel(),
+    })
+
+
+def error_moments(
+    residuals_df: pd.DataFrame, forecast_cols: list[str], season_length: int = 7
 ) -> dict:
-    """Return bias, variance and noise components for each model.
+    """Return the mergeable first pass of :func:`decompose_errors`.
 
     Parameters
     ----------
     residuals_df : pandas.DataFrame
-        DataFrame of residuals with columns matching ``forecast_cols``.
+        Residual rows of whole series; seasonal differences never cross a
+        series boundary, so a series must not be split between blocks.
     forecast_cols : list
         Names of forecast columns to analyse.
+    season_length : int, optional
+        Lag of the seasonal difference.
 
     Returns
     -------
     dict
-        Mapping of model name to a dictionary of error breakdown statistics.
+        :func:`~forecastkernel.core.accumulators.block_moments` of the
+        residuals (``"residuals"``) and of the seasonal absolute differences
+        (``"seasonal"``). Combine blocks with :func:`merge_error_moments`.
     """
+    order, position, _ = _series_layout(residuals_df)
+    values = residuals_df[forecast_cols].to_numpy(np.float64)[order]
+    seasonal = _seasonal_abs_diff(values, position, season_length)
+    return {"residuals": block_moments(values), "seasonal": block_moments(seasonal)}
 
-    breakdown = {}
-    for model in forecast_cols:
-        resids = residuals_df[model].dropna()
-        bias_error = np.mean(resids)
-        variance_error = np.var(resids)
-        noise = np.mean(np.abs(resids - bias_error))
-        seasonality_miss = np.mean(np.abs(resids.diff(7)))
 
+def merge_error_moments(left: dict, right: dict) -> dict:
+    """Combine two :func:`error_moments` results of disjoint series."""
+    return {key: merge_moments(left[key], right[key]) for key in left}
+
+
+def breakdown_from_moments(moments: dict, forecast_cols: list[str], noise: np.ndarray) -> dict:
+    """Return the :func:`decompose_errors` payload from accumulated moments.
+
+    Parameters
+    ----------
+    moments : dict
+        Output of :func:`error_moments`, possibly merged over blocks.
+    forecast_cols : list
+        Model names matching the accumulator columns.
+    noise : numpy.ndarray
+        Mean absolute deviation of each model's residuals from its bias,
+        which needs the pooled bias and therefore a second pass.
+
+    Returns
+    -------
+    dict
+        Mapping of model name to rounded error components.
+    """
+    residual = moment_stats(moments["residuals"])
+    seasonal = moment_stats(moments["seasonal"])
+    breakdown = {}
+    for j, model in enumerate(forecast_cols):
+        stats = {
+            "bias_error": residual["mean"][j],
+            "variance_error": residual["var"][j],
+            "noise": noise[j],
+            "seasonality_miss": seasonal["mean"][j],
+        }
         breakdown[model] = {
-            "Bias Error": round(float(bias_error), 4),
-            "Variance Error": round(float(variance_error), 4),
-            "Noise": round(float(noise), 4),
-            "Seasonality Miss": round(float(seasonality_miss), 4)
+            label: round(float(stats[key]), 4) if np.isfinite(stats[key]) else None
+            for key, label in COMPONENTS.items()
         }
     return breakdown
+
+
+def decompose_errors(
+    residuals_df: pd.DataFrame, forecast_cols: list[str], season_length: int = 7
+) -> dict:
+    """Return bias, variance and noise components for each model.
+
+    Parameters
+    ----------
+    residuals_df : pandas.DataFrame
+        DataFrame of residuals with columns matching ``forecast_cols``. When a
+        ``unique_id`` column is present, seasonal differences are taken
+        within each series.
+    forecast_cols : list
+        Names of forecast columns to analyse.
+    season_length : int, optional
+        Lag of the seasonal difference used for ``Seasonality Miss``.
+
+    Returns
+    -------
+    dict
+        Mapping of model name to a dictionary of error breakdown statistics,
+        pooled over all series. Undefined components are ``None``.
+    """
+    moments = error_moments(residuals_df, forecast_cols, season_length)
+    bias = moment_stats(moments["residuals"])["mean"]
+    values = residuals_df[forecast_cols].to_numpy(np.float64)
+    noise = moment_stats(block_moments(np.abs(values - bias)))["mean"]
+    return breakdown_from_moments(moments, forecast_cols, noise)
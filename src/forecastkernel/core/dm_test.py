@@ -1,9 +1,14 @@
 """Diebold-Mariano statistical test utilities."""
 
-from statsmodels.stats.diagnostic import acorr_ljungbox
-from scipy.stats import ttest_rel
+from itertools import combinations
+
+from scipy.stats import norm, t as student_t, ttest_rel
+import numpy as np
 import pandas as pd
 
+from forecastkernel.core.segments import segment_lengths, segment_sum
+from forecastkernel.core.splits import series_positions
+
 def compute_dm_test(
     forecasts_df: pd.DataFrame, actuals_df: pd.DataFrame, model_1: str, model_2: str
 ) -> dict:
@@ -39,3 +44,211 @@ def compute_dm_test(
         "dm_stat": round(stat, 3),
         "p_value": round(pval, 3)
     }
+
+
+def panel_dm_test(
+    residuals_df: pd.DataFrame,
+    models: list[str],
+    loss: str = "squared",
+    h: int = 1,
+) -> pd.DataFrame:
+    """Run Diebold-Mariano tests for every model pair and series at once.
+
+    The loss differential of all ``k * (k - 1) / 2`` pairs is built as one
+    matrix and reduced per series with segment sums. The long-run variance
+    uses Newey-West (Bartlett) weights up to lag ``h - 1`` and the statistic
+    carries the Harvey, Leybourne and Newbold small-sample correction with
+    Student-t p-values on ``T - 1`` degrees of freedom.
+
+    Parameters
+    ----------
+    residuals_df : pandas.DataFrame
+        Residuals with ``unique_id``, ``ds`` and one column per model, e.g. the
+        residual frame of :func:`~forecastkernel.core.evaluation.evaluate_forecasts`.
+    models : list of str
+        Residual columns to compare.
+    loss : {"squared", "absolute"}, optional
+        Loss applied to the residuals.
+    h : int, optional
+        Forecast horizon of the errors. Pass the horizon of multi-step
+        residuals; the default ``h=1`` treats them as one-step errors, which
+        ignores their autocorrelation and overstates significance.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per series and pair with ``unique_id``, ``model_1``,
+        ``model_2``, ``n_obs``, ``mean_diff`` (mean of ``loss_1 - loss_2``,
+        negative when ``model_1`` is better), ``lrv`` (long-run variance of
+        the differential), ``dm_stat`` and ``p_value``. Pairs whose variance
+        is not positive, and series with too few residuals for the
+        correction at horizon ``h`` (at most ``h``, e.g. a single holdout),
+        have ``NaN`` statistics.
+    """
+    if loss not in ("squared", "absolute"):
+        raise ValueError(f"Unsupported loss: {loss}")
+
+    order, position, _ = series_positions(residuals_df)
+    starts = np.flatnonzero(position == 0)
+    n_rows, n_series = len(order), len(starts)
+    n_obs = segment_lengths(starts, n_rows)
+    group = np.repeat(np.arange(n_series), n_obs)
+
+    errors = residuals_df[models].to_numpy(np.float64)[order]
+    losses = errors ** 2 if loss == "squared" else np.abs(errors)
+    pairs = list(combinations(range(len(models)), 2))
+    first, second = (np.array(idx, dtype=np.intp) for idx in zip(*pairs)) if pairs else ([], [])
+    diff = losses[:, first] - losses[:, second]
+
+    T = n_obs[:, None].astype(np.float64)
+    mean_diff = segment_sum(diff, starts) / T
+    centred = diff - mean_diff[group]
+
+    lrv = segment_sum(centred ** 2, starts) / T
+    for lag in range(1, h):
+        prod = np.zeros_like(centred)
+        prod[lag:] = centred[lag:] * centred[:-lag]
+        prod[position < lag] = 0.0
+        lrv += 2 * (1 - lag / h) * segment_sum(prod, starts) / T
+
+    correction = (T + 1 - 2 * h + h * (h - 1) / T) / T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dm_stat = mean_diff / np.sqrt(lrv / T)
+        dm_stat *= np.sqrt(np.maximum(correction, 0.0))
+    dm_stat[~(lrv > 0) | (T < 2) | ~(correction > 0)] = np.nan
+    p_value = 2 * student_t.sf(np.abs(dm_stat), T - 1)
+
+    ids = residuals_df["unique_id"].to_numpy()[order][starts]
+    n_pairs = len(pairs)
+    return pd.DataFrame({
+        "unique_id": np.repeat(ids, n_pairs),
+        "model_1": np.tile([models[i] for i in first], n_series),
+        "model_2": np.tile([models[j] for j in second], n_series),
+        "n_obs": np.repeat(n_obs, n_pairs),
+        "mean_diff": mean_diff.ravel(),
+        "lrv": lrv.ravel(),
+        "dm_stat": dm_stat.ravel(),
+        "p_value": p_value.ravel(),
+    })
+
+
+def accumulate_dm_tests(dm_table: pd.DataFrame, alpha: float = 0.05) -> pd.DataFrame:
+    """Reduce per-series DM results to mergeable sums per model pair.
+
+    Parameters
+    ----------
+    dm_table : pandas.DataFrame
+        Output of :func:`panel_dm_test`.
+    alpha : float, optional
+        Significance level for the per-series win counts.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``model_1``, ``model_2``, ``n_series``, ``n_obs``, ``weighted_diff``,
+        ``weighted_lrv``, ``n_model_1_better`` and ``n_model_2_better``.
+        Tables of disjoint series are combined with
+        :func:`merge_dm_accumulators`.
+    """
+    valid = dm_table[dm_table["dm_stat"].notna()]
+    significant = valid["p_value"] < alpha
+    return valid.assign(
+        weighted_diff=valid["mean_diff"] * valid["n_obs"],
+        weighted_lrv=valid["lrv"] * valid["n_obs"],
+        model_1_better=significant & (valid["mean_diff"] < 0),
+        model_2_better=significant & (valid["mean_diff"] > 0),
+    ).groupby(["model_1", "model_2"], sort=False).agg(
+        n_series=("unique_id", "size"),
+        n_obs=("n_obs", "sum"),
+        weighted_diff=("weighted_diff", "sum"),
+        weighted_lrv=("weighted_lrv", "sum"),
+        n_model_1_better=("model_1_better", "sum"),
+        n_model_2_better=("model_2_better", "sum"),
+    ).reset_index()
+
+
+def merge_dm_accumulators(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """Combine two :func:`accumulate_dm_tests` tables of disjoint series."""
+    return pd.concat([left, right], ignore_index=True).groupby(
+        ["model_1", "model_2"], sort=False
+    ).sum().reset_index()
+
+
+def finalize_dm_tests(pooled: pd.DataFrame) -> pd.DataFrame:
+    """Turn accumulated DM sums into the :func:`summarize_dm_tests` table."""
+    mean_diff = pooled["weighted_diff"] / pooled["n_obs"]
+    dm_stat = mean_diff / np.sqrt(pooled["weighted_lrv"] / pooled["n_obs"] ** 2)
+    return pd.DataFrame({
+        "model_1": pooled["model_1"],
+        "model_2": pooled["model_2"],
+        "n_series": pooled["n_series"],
+        "mean_diff": mean_diff,
+        "dm_stat": dm_stat,
+        "p_value": 2 * norm.sf(np.abs(dm_stat)),
+        "share_model_1": pooled["n_model_1_better"] / pooled["n_series"],
+        "share_model_2": pooled["n_model_2_better"] / pooled["n_series"],
+    })
+
+
+def summarize_dm_tests(dm_table: pd.DataFrame, alpha: float = 0.05) -> pd.DataFrame:
+    """Pool per-series DM results into one row per model pair.
+
+    Series are treated as independent, so the pooled mean differential is
+    weighted by ``n_obs`` and its variance is the ``n_obs``-weighted sum of the
+    per-series long-run variances.
+
+    Parameters
+    ----------
+    dm_table : pandas.DataFrame
+        Output of :func:`panel_dm_test`.
+    alpha : float, optional
+        Significance level for the per-series win shares.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``model_1``, ``model_2``, ``n_series``, ``mean_diff``, ``dm_stat``,
+        ``p_value`` (normal approximation) and the shares of series where
+        ``model_1`` is significantly better (``share_model_1``) or worse
+        (``share_model_2``).
+    """
+    return finalize_dm_tests(accumulate_dm_tests(dm_table, alpha))
+
+
+def dm_pair_result(dm_summary: pd.DataFrame, model: str, reference: str) -> dict:
+    """Return the pooled DM result of ``model`` against ``reference``.
+
+    Parameters
+    ----------
+    dm_summary : pandas.DataFrame
+        Output of :func:`summarize_dm_tests`.
+    model : str
+        Model under test.
+    reference : str
+        Benchmark model.
+
+    Returns
+    -------
+    dict
+        ``vs``, ``dm_stat`` and ``p_value`` as in :func:`compute_dm_test`
+        (negative statistics favour ``model``) plus ``n_series`` and the
+        shares of series where ``model`` is significantly better or worse.
+        Statistics are ``None`` when the pair was not tested.
+    """
+    forward = (dm_summary["model_1"] == model) & (dm_summary["model_2"] == reference)
+    backward = (dm_summary["model_1"] == reference) & (dm_summary["model_2"] == model)
+    result = {"vs": reference, "dm_stat": None, "p_value": None}
+    if not (forward.any() or backward.any()):
+        return result
+
+    row = dm_summary[forward | backward].iloc[0]
+    sign = 1.0 if forward.any() else -1.0
+    better, worse = ("share_model_1", "share_model_2") if forward.any() else ("share_model_2", "share_model_1")
+    result.update(
+        dm_stat=round(float(sign * row["dm_stat"]), 3),
+        p_value=round(float(row["p_value"]), 3),
+        n_series=int(row["n_series"]),
+        share_better=round(float(row[better]), 4),
+        share_worse=round(float(row[worse]), 4),
+    )
+    return result
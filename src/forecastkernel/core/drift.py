@@ -1,8 +1,13 @@
 """Residual drift detection utilities."""
 
 from scipy.stats import ks_2samp
+import numpy as np
 import pandas as pd
 
+from forecastkernel.core.segments import segment_lengths, segment_max, segment_starts, segment_sum
+from forecastkernel.core.splits import series_positions
+
+
 def detect_residual_drift(
     residuals_df: pd.DataFrame, model: str, window_size: int = 14
 ) -> dict:
@@ -34,3 +39,165 @@ def detect_residual_drift(
     stat, p = ks_2samp(past, recent)
     return {"drift_detected": p < 0.05, "p_value": round(p, 4)}
 
+
+def _segment_ks_statistic(
+    values: np.ndarray, segments: np.ndarray, weights: np.ndarray, n_segments: int
+) -> np.ndarray:
+    """Return the two-sample KS distance of every segment, scaled by ``n1 * n2``.
+
+    ``weights`` is ``+n_recent`` for reference rows and ``-n_past`` for recent
+    rows, so the running sum over a segment sorted by value is the scaled
+    difference of the two empirical CDFs and stays in exact integer arithmetic.
+    """
+    # Sorting by (segment, global value rank) as one integer key is several
+    # times faster than ``np.lexsort`` on a float and an integer key
+    n = len(values)
+    result = np.zeros(n_segments, dtype=np.int64)
+    if n == 0:
+        return result
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(values)] = np.arange(n)
+    order = np.argsort(segments.astype(np.int64) * n + rank)
+    seg = segments[order]
+    val = values[order]
+    cum = np.cumsum(weights[order])
+
+    starts = segment_starts(seg)
+    offset = np.r_[0, cum[starts[1:] - 1]]
+    cum = cum - np.repeat(offset, segment_lengths(starts, len(seg)))
+
+    # The ECDFs are only compared after the last of a run of tied values
+    run_end = np.r_[(seg[1:] != seg[:-1]) | (val[1:] != val[:-1]), True]
+    distance = np.where(run_end, np.abs(cum), 0)
+
+    result[seg[starts]] = segment_max(distance, starts)
+    return result
+
+
+def detect_panel_drift(
+    residuals_df: pd.DataFrame,
+    models: list[str],
+    window_size: int = 14,
+    alpha: float = 0.05,
+) -> pd.DataFrame:
+    """Run a two-sample KS drift test for every series and model at once.
+
+    For each series the last ``window_size`` residuals are compared with all
+    earlier residuals of the same series. All (series, model) pairs are
+    sorted together and reduced with segment operations, so the cost is one
+    sort of the residual block regardless of the number of series. P-values
+    use the asymptotic Kolmogorov distribution (as
+    ``ks_2samp(method="asymp")``) and are adjusted per model with the
+    Benjamini-Hochberg procedure.
+
+    Parameters
+    ----------
+    residuals_df : pandas.DataFrame
+        Residuals with ``unique_id``, ``ds`` and one column per model.
+    models : list of str
+        Residual columns to test.
+    window_size : int, optional
+        Number of recent observations per series. Series with fewer than
+        ``window_size`` earlier observations are not tested.
+    alpha : float, optional
+        False discovery rate used for the ``drift_detected`` flag.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per series and model with ``unique_id``, ``model``,
+        ``n_past``, ``n_recent``, ``ks_stat``, ``p_value``, ``p_adjusted``
+        and ``drift_detected``. Untested series have ``NaN`` statistics and
+        ``drift_detected`` set to ``False``.
+    """
+    from scipy.stats import kstwo
+    from statsmodels.stats.multitest import multipletests
+
+    order, position, remaining = series_positions(residuals_df)
+    n_rows = len(order)
+    starts = np.flatnonzero(position == 0)
+    n_series = len(starts)
+    sizes = segment_lengths(starts, n_rows)
+    series = np.repeat(np.arange(n_series), sizes)
+
+    n_recent = np.minimum(sizes, window_size)
+    n_past = sizes - n_recent
+    is_recent = remaining <= window_size
+
+    values = residuals_df[models].to_numpy(np.float64)[order]
+    finite = segment_sum((~np.isfinite(values)).astype(np.int64), starts) == 0
+    tested = (n_past >= window_size)[:, None] & finite
+
+    # Only rows of testable (series, model) pairs enter the sort
+    n_models = len(models)
+    keep = tested[series]
+    row, col = np.nonzero(keep)
+    segments = col * n_series + series[row]
+    weights = np.where(is_recent[row], -n_past[series[row]], n_recent[series[row]])
+    scaled = _segment_ks_statistic(values[row, col], segments, weights, n_models * n_series)
+
+    denom = (n_past * n_recent).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ks_stat = scaled.reshape(n_models, n_series) / denom
+        en = np.round(n_past * n_recent / np.maximum(sizes, 1))
+    ks_stat = np.where(tested.T, ks_stat, np.nan)
+    p_value = np.full_like(ks_stat, np.nan)
+    p_adjusted = np.full_like(ks_stat, np.nan)
+    for j in range(n_models):
+        mask = tested[:, j]
+        if mask.any():
+            # The statistic is a multiple of 1 / (n_past * n_recent), so the
+            # distinct (statistic, en) pairs are few and kstwo is slow per call
+            pairs = np.column_stack([ks_stat[j, mask], en[mask]])
+            unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+            p = np.clip(kstwo.sf(unique[:, 0], unique[:, 1]), 0.0, 1.0)[inverse.ravel()]
+            p_value[j, mask] = p
+            p_adjusted[j, mask] = multipletests(p, alpha=alpha, method="fdr_bh")[1]
+
+    ids = residuals_df["unique_id"].to_numpy()[order][starts]
+    return pd.DataFrame({
+        "unique_id": np.tile(ids, n_models),
+        "model": np.repeat(models, n_series),
+        "n_past": np.tile(n_past, n_models),
+        "n_recent": np.tile(n_recent, n_models),
+        "ks_stat": ks_stat.ravel(),
+        "p_value": p_value.ravel(),
+        "p_adjusted": p_adjusted.ravel(),
+        "drift_detected": (p_adjusted < alpha).ravel(),
+    })
+
+
+def summarize_panel_drift(drift_table: pd.DataFrame, model: str, max_share: float = 0.0) -> dict:
+    """Collapse a :func:`detect_panel_drift` table into the CI gate payload.
+
+    Parameters
+    ----------
+    drift_table : pandas.DataFrame
+        Output of :func:`detect_panel_drift`.
+    model : str
+        Model whose series are gated, usually the selected model.
+    max_share : float, optional
+        Largest tolerated share of tested series with significant drift.
+
+    Returns
+    -------
+    dict
+        ``drift_detected`` and ``p_value`` (smallest adjusted p-value) as in
+        :func:`detect_residual_drift`, plus ``n_series_tested``,
+        ``n_series_drifted``, ``drift_share`` and ``inconclusive``. When no
+        series had enough residuals to be tested ``p_value`` is ``None`` and
+        ``inconclusive`` is true; callers gating on the result should report
+        that rather than treat it as no drift.
+    """
+    rows = drift_table[(drift_table["model"] == model) & drift_table["p_adjusted"].notna()]
+    n_tested = len(rows)
+    n_drifted = int(rows["drift_detected"].sum())
+    share = n_drifted / n_tested if n_tested else 0.0
+    return {
+        "drift_detected": bool(share > max_share),
+        "p_value": round(float(rows["p_adjusted"].min()), 4) if n_tested else None,
+        "n_series_tested": n_tested,
+        "n_series_drifted": n_drifted,
+        "drift_share": round(share, 4),
+        "inconclusive": not n_tested,
+    }
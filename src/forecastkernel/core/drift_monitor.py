@@ -0,0 +1,251 @@
+"""Online residual drift monitor with constant-time updates per observation.
+
+The monitor state is a dict of NumPy arrays with one slot per series. Each
+incoming residual updates the series' running moments (Welford) and a
+two-sided Page-Hinkley test on the residual standardised by the moments seen
+so far. A series alarms once either Page-Hinkley statistic exceeds
+``threshold`` and stays alarmed until it is reset after retraining.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+STATUS_FILE = "drift_monitor.json"
+_ARRAYS = {
+    "n_obs": np.int64,
+    "mean": np.float64,
+    "m2": np.float64,
+    "ph_up": np.float64,
+    "ph_up_min": np.float64,
+    "ph_down": np.float64,
+    "ph_down_min": np.float64,
+    "alarm": bool,
+}
+_PARAMS = ("delta", "threshold", "min_obs")
+
+
+def init_monitor(delta: float = 1.0, threshold: float = 6.0, min_obs: int = 14) -> dict:
+    """Return an empty monitor state.
+
+    Parameters
+    ----------
+    delta : float, optional
+        Tolerated drift magnitude in standard deviations; deviations smaller
+        than this never accumulate.
+    threshold : float, optional
+        Page-Hinkley alarm level in standard deviations.
+    min_obs : int, optional
+        Observations used to estimate a series' moments before it can alarm.
+
+    Returns
+    -------
+    dict
+        Monitor state accepted by :func:`update_monitor`.
+    """
+    state = {name: np.zeros(0, dtype=dtype) for name, dtype in _ARRAYS.items()}
+    state["unique_id"] = np.zeros(0, dtype=object)
+    state.update(delta=float(delta), threshold=float(threshold), min_obs=int(min_obs))
+    state["_index"] = pd.Index(state["unique_id"])
+    return state
+
+
+def _slots(state: dict, unique_ids: np.ndarray) -> np.ndarray:
+    """Return the slot of every id, allocating slots for unseen series."""
+    slots = state["_index"].get_indexer(unique_ids)
+    missing = slots < 0
+    if missing.any():
+        new_ids = pd.unique(unique_ids[missing])
+        n_old, n_new = len(state["unique_id"]), len(new_ids)
+        for name, dtype in _ARRAYS.items():
+            state[name] = np.concatenate([state[name], np.zeros(n_new, dtype=dtype)])
+        state["unique_id"] = np.concatenate([state["unique_id"], new_ids.astype(object)])
+        state["_index"] = pd.Index(state["unique_id"])
+        slots[missing] = n_old + pd.Index(new_ids).get_indexer(unique_ids[missing])
+    return slots
+
+
+def _update_slots(state: dict, slots: np.ndarray, values: np.ndarray) -> None:
+    """Apply one observation to each of the distinct ``slots``."""
+    n = state["n_obs"][slots]
+    mean = state["mean"][slots]
+    m2 = state["m2"][slots]
+
+    # Standardise against the moments before this observation
+    armed = n >= state["min_obs"]
+    std = np.sqrt(np.divide(m2, n - 1, out=np.zeros_like(m2), where=n > 1))
+    z = np.divide(values - mean, std, out=np.zeros_like(values), where=armed & (std > 0))
+
+    up = np.where(armed, state["ph_up"][slots] + z - state["delta"], 0.0)
+    down = np.where(armed, state["ph_down"][slots] - z - state["delta"], 0.0)
+    up_min = np.minimum(state["ph_up_min"][slots], up)
+    down_min = np.minimum(state["ph_down_min"][slots], down)
+    state["ph_up"][slots] = up
+    state["ph_down"][slots] = down
+    state["ph_up_min"][slots] = up_min
+    state["ph_down_min"][slots] = down_min
+    state["alarm"][slots] |= armed & (
+        (up - up_min > state["threshold"]) | (down - down_min > state["threshold"])
+    )
+
+    n = n + 1
+    delta = values - mean
+    mean = mean + delta / n
+    state["n_obs"][slots] = n
+    state["mean"][slots] = mean
+    state["m2"][slots] = m2 + delta * (values - mean)
+
+
+def update_monitor(state: dict, unique_ids, residuals) -> dict:
+    """Ingest residuals in arrival order.
+
+    Parameters
+    ----------
+    state : dict
+        Monitor state from :func:`init_monitor` or :func:`load_monitor`.
+    unique_ids : array-like
+        Series of each residual. A batch may contain several observations of
+        the same series; they are applied in the order given.
+    residuals : array-like
+        ``actual - forecast`` values.
+
+    Returns
+    -------
+    dict
+        The updated ``state`` (modified in place).
+    """
+    unique_ids = np.asarray(unique_ids, dtype=object).ravel()
+    residuals = np.asarray(residuals, dtype=np.float64).ravel()
+    if len(unique_ids) != len(residuals):
+        raise ValueError("unique_ids and residuals must have the same length.")
+    keep = np.isfinite(residuals)
+    unique_ids, residuals = unique_ids[keep], residuals[keep]
+    if len(residuals) == 0:
+        return state
+
+    slots = _slots(state, unique_ids)
+    # Each round holds at most one observation per series, so every round
+    # is a vectorised update and repeated series keep their arrival order
+    occurrence = pd.Series(slots).groupby(slots).cumcount().to_numpy()
+    for k in range(occurrence.max() + 1):
+        rows = np.flatnonzero(occurrence == k)
+        _update_slots(state, slots[rows], residuals[rows])
+    return state
+
+
+def reset_series(state: dict, unique_ids) -> dict:
+    """Clear the moments and alarms of ``unique_ids`` (e.g. after a refit)."""
+    slots = state["_index"].get_indexer(np.asarray(unique_ids, dtype=object).ravel())
+    slots = slots[slots >= 0]
+    for name, dtype in _ARRAYS.items():
+        state[name][slots] = np.zeros(1, dtype=dtype)
+    return state
+
+
+def monitor_table(state: dict) -> pd.DataFrame:
+    """Return the per-series monitor state as a DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``unique_id``, ``n_obs``, ``mean``, ``std``, ``ph_up``, ``ph_down``
+        (Page-Hinkley excursions above their running minimum) and
+        ``drift_detected``.
+    """
+    n = state["n_obs"]
+    m2 = state["m2"]
+    return pd.DataFrame({
+        "unique_id": state["unique_id"],
+        "n_obs": n,
+        "mean": state["mean"],
+        "std": np.sqrt(np.divide(m2, n - 1, out=np.full_like(m2, np.nan), where=n > 1)),
+        "ph_up": state["ph_up"] - state["ph_up_min"],
+        "ph_down": state["ph_down"] - state["ph_down_min"],
+        "drift_detected": state["alarm"].copy(),
+    })
+
+
+def monitor_status(state: dict, max_share: float = 0.0) -> dict:
+    """Summarise the monitor in the ``drift_monitor`` payload layout.
+
+    Parameters
+    ----------
+    state : dict
+        Monitor state.
+    max_share : float, optional
+        Largest tolerated share of armed series that have alarmed, as in
+        :func:`forecastkernel.core.drift.summarize_panel_drift`.
+
+    Returns
+    -------
+    dict
+        ``drift_detected``, ``n_series_tested`` (series past ``min_obs``),
+        ``n_series_drifted``, ``drift_share`` and ``last_updated``.
+    """
+    tested = state["n_obs"] > state["min_obs"]
+    n_tested = int(tested.sum())
+    n_drifted = int((state["alarm"] & tested).sum())
+    share = n_drifted / n_tested if n_tested else 0.0
+    return {
+        "drift_detected": bool(share > max_share),
+        "n_series_tested": n_tested,
+        "n_series_drifted": n_drifted,
+        "drift_share": round(share, 4),
+        "last_updated": datetime.now().isoformat(),
+    }
+
+
+def write_monitor_status(state: dict, run_dir: str, max_share: float = 0.0) -> str:
+    """Write :func:`monitor_status` next to a run for cascade checks.
+
+    :func:`forecastkernel.core.aggregation.enforce_cascade_checks` blocks a
+    cascade when this file reports ``drift_detected``.
+
+    Returns
+    -------
+    str
+        Path of the written ``drift_monitor.json``.
+    """
+    path = os.path.join(run_dir, STATUS_FILE)
+    with open(path, "w") as f:
+        json.dump(monitor_status(state, max_share), f, indent=2)
+    return path
+
+
+def save_monitor(state: dict, path: str) -> str:
+    """Checkpoint the monitor to a compressed ``.npz`` file.
+
+    The file is written to a temporary name and renamed so a crash never
+    leaves a truncated checkpoint behind.
+
+    Returns
+    -------
+    str
+        The path written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        unique_id=state["unique_id"].astype(str),
+        params=np.array([state[p] for p in _PARAMS], dtype=np.float64),
+        **{name: state[name] for name in _ARRAYS},
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_monitor(path: str) -> dict:
+    """Restore a monitor saved with :func:`save_monitor`."""
+    with np.load(path, allow_pickle=False) as data:
+        delta, threshold, min_obs = data["params"]
+        state = init_monitor(delta, threshold, int(min_obs))
+        for name, dtype in _ARRAYS.items():
+            state[name] = data[name].astype(dtype)
+        state["unique_id"] = data["unique_id"].astype(object)
+    state["_index"] = pd.Index(state["unique_id"])
+    return state
@@ -1,17 +1,61 @@
 """Utilities for evaluating forecast accuracy and residuals."""
 
 import os
+import numpy as np
 import pandas as pd
-from sklearn.metrics import mean_absolute_error
+
+from forecastkernel.core.accumulators import moment_stats
+from forecastkernel.core.keys import align_rows
+from forecastkernel.core.segments import segment_lengths, segment_mean, segment_order
+
+
+def align_forecasts(
+    forecasts: pd.DataFrame,
+    true_future: pd.DataFrame,
+    forecast_cols: list[str],
+) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Join forecasts to actuals once and return a dense prediction block.
+
+    Rows are matched on integer ``(unique_id, ds)`` keys, see
+    :func:`~forecastkernel.core.keys.align_rows`.
+
+    Parameters
+    ----------
+    forecasts : pandas.DataFrame
+        Forecast output for each model with ``unique_id`` and ``ds`` columns.
+    true_future : pandas.DataFrame
+        Actual observations with ``unique_id``, ``ds`` and ``y`` columns.
+    forecast_cols : list
+        Names of columns in ``forecasts`` corresponding to model predictions.
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, numpy.ndarray, numpy.ndarray]
+        The ``unique_id``/``ds`` keys in forecast order, the aligned actuals of
+        shape ``(n_rows,)`` and the predictions of shape
+        ``(n_rows, len(forecast_cols))``.
+    """
+    rows = align_rows(forecasts, true_future)
+    found = rows >= 0
+    y_true = np.full(len(rows), np.nan)
+    y_true[found] = true_future["y"].to_numpy(dtype=np.float64)[rows[found]]
+    keys = forecasts[["unique_id", "ds"]].reset_index(drop=True)
+    y_pred = forecasts[forecast_cols].to_numpy(dtype=np.float64)
+    return keys, y_true, y_pred
+
 
 def evaluate_forecasts(
     forecasts: pd.DataFrame,
     true_future: pd.DataFrame,
     forecast_cols: list[str],
     output_path: str,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
+    per_series: bool = False,
+) -> tuple[pd.DataFrame, ...]:
     """Compute MAE, bias and residuals for multiple forecast columns.
 
+    Actuals are joined to the forecasts a single time and every model is
+    scored together on a ``(rows, models)`` residual block.
+
     Parameters
     ----------
     forecasts : pandas.DataFrame
@@ -22,41 +66,114 @@ def evaluate_forecasts(
         Names of columns in ``forecasts`` corresponding to model predictions.
     output_path : str
         Directory where intermediate outputs may be saved (unused).
+    per_series : bool, optional
+        If ``True`` also return metrics for every ``unique_id`` and model.
 
     Returns
     -------
-    tuple[pandas.DataFrame, pandas.DataFrame]
-        A DataFrame of metrics per model and a DataFrame of residuals.
+    tuple[pandas.DataFrame, ...]
+        A DataFrame of metrics per model and a DataFrame of residuals. When
+        ``per_series`` is set the :func:`grouped_metrics` table is appended.
     """
-
-    metrics = []
-    residuals = []
-
-    for model in forecast_cols:
-        joined = forecasts[["unique_id", "ds", model]].merge(
-            true_future, on=["unique_id", "ds"], how="left", suffixes=("", "_true")
-        )
-
-        y_true = joined["y"]
-        y_pred = joined[model]
-        mae = mean_absolute_error(y_true, y_pred)
-        bias = (y_true - y_pred).mean()
-        score = mae + abs(bias)
-
-        metrics.append({
-            "model": model,
-            "mae": mae,
-            "bias": bias,
-            "score": score
-        })
-
-        residual_df = joined[["unique_id", "ds"]].copy()
-        residual_df[model] = y_true - y_pred
-        residual_df = residual_df.set_index(["unique_id", "ds"])
-        residuals.append(residual_df)
-
-    if residuals:
-        residuals_df = pd.concat(residuals, axis=1).reset_index()
-    else:
+    if not forecast_cols:
+        empty = pd.DataFrame(columns=["model", "mae", "bias", "score"])
         residuals_df = pd.DataFrame(columns=["unique_id", "ds"])
-    return pd.DataFrame(metrics), residuals_df
+        if per_series:
+            series = pd.DataFrame(columns=["unique_id", "model", "n_obs", "mae", "bias", "score"])
+            return empty, residuals_df, series
+        return empty, residuals_df
+
+    keys, y_true, y_pred = align_forecasts(forecasts, true_future, forecast_cols)
+    if np.isnan(y_true).any() or np.isnan(y_pred).any():
+        raise ValueError("Input contains NaN.")
+
+    resid = y_true[:, None] - y_pred
+    mae = np.abs(resid).mean(axis=0)
+    bias = resid.mean(axis=0)
+    metrics = pd.DataFrame({
+        "model": forecast_cols,
+        "mae": mae,
+        "bias": bias,
+        "score": mae + np.abs(bias),
+    })
+
+    residuals_df = pd.concat(
+        [keys.reset_index(drop=True), pd.DataFrame(resid, columns=forecast_cols)], axis=1
+    )
+
+    if not per_series:
+        return metrics, residuals_df
+
+    series_metrics = grouped_metrics(keys["unique_id"], resid, forecast_cols)
+    return metrics, residuals_df, series_metrics
+
+
+def metrics_from_moments(moments: dict, forecast_cols: list[str]) -> pd.DataFrame:
+    """Return the :func:`evaluate_forecasts` metrics table from residual moments.
+
+    Parameters
+    ----------
+    moments : dict
+        Accumulated :func:`~forecastkernel.core.accumulators.block_moments`
+        of the residual block, one column per model.
+    forecast_cols : list
+        Model names matching the accumulator columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``model``, ``mae``, ``bias`` and ``score`` for every model.
+    """
+    stats = moment_stats(moments)
+    return pd.DataFrame({
+        "model": forecast_cols,
+        "mae": stats["mean_abs"],
+        "bias": stats["mean"],
+        "score": stats["mean_abs"] + np.abs(stats["mean"]),
+    })
+
+
+def grouped_metrics(
+    unique_ids: pd.Series | np.ndarray,
+    residuals: np.ndarray,
+    forecast_cols: list[str],
+) -> pd.DataFrame:
+    """Return MAE, bias and score for every ``unique_id`` and model.
+
+    Rows are stably ordered by series once and each metric is reduced per
+    segment with :func:`numpy.add.reduceat`, so the cost does not depend on the
+    number of series.
+
+    Parameters
+    ----------
+    unique_ids : array-like
+        Series identifier of every residual row.
+    residuals : numpy.ndarray
+        Residual block of shape ``(n_rows, len(forecast_cols))`` computed as
+        ``y_true - y_pred``.
+    forecast_cols : list
+        Model names matching the columns of ``residuals``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long table with ``unique_id``, ``model``, ``n_obs``, ``mae``, ``bias``
+        and ``score`` columns sorted by ``unique_id`` then model order.
+    """
+    residuals = np.asarray(residuals, dtype=np.float64).reshape(len(unique_ids), len(forecast_cols))
+    order, starts, labels = segment_order(unique_ids)
+    resid = residuals[order]
+
+    mae = segment_mean(np.abs(resid), starts)
+    bias = segment_mean(resid, starts)
+    n_obs = segment_lengths(starts, len(resid))
+
+    n_models = len(forecast_cols)
+    return pd.DataFrame({
+        "unique_id": np.repeat(labels, n_models),
+        "model": np.tile(np.asarray(forecast_cols, dtype=object), len(labels)),
+        "n_obs": np.repeat(n_obs, n_models),
+        "mae": mae.ravel(),
+        "bias": bias.ravel(),
+        "score": (mae + np.abs(bias)).ravel(),
+    })
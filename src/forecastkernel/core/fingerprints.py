@@ -0,0 +1,72 @@
+"""Per-series content fingerprints for incremental refits."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.segments import segment_lengths, segment_sum
+from forecastkernel.core.splits import series_positions
+
+
+def series_fingerprints(df: pd.DataFrame) -> pd.DataFrame:
+    """Hash the ``(ds, y)`` block of every series in one vectorised pass.
+
+    Each row is hashed with :func:`pandas.util.hash_pandas_object`, weighted by
+    an odd multiplier derived from its position so that reordering values
+    changes the result, and summed per series with wrapping ``uint64``
+    arithmetic.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format frame with ``unique_id``, ``ds`` and ``y`` columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``unique_id``, ``n_obs`` and ``fingerprint`` (``uint64``) per series,
+        sorted by ``unique_id``.
+    """
+    order, position, _ = series_positions(df)
+    ids = df["unique_id"].to_numpy()[order]
+    starts = np.flatnonzero(position == 0)
+
+    row_hash = pd.util.hash_pandas_object(
+        df[["ds", "y"]].iloc[order], index=False
+    ).to_numpy(dtype=np.uint64)
+    weight = position.astype(np.uint64) * np.uint64(2) + np.uint64(1)
+    with np.errstate(over="ignore"):
+        fingerprint = segment_sum(row_hash * weight, starts)
+
+    return pd.DataFrame({
+        "unique_id": ids[starts],
+        "n_obs": segment_lengths(starts, len(order)),
+        "fingerprint": fingerprint.astype(np.uint64),
+    })
+
+
+def changed_series(previous: pd.DataFrame, current: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Compare two fingerprint tables.
+
+    Parameters
+    ----------
+    previous : pandas.DataFrame
+        Fingerprints of the last run.
+    current : pandas.DataFrame
+        Fingerprints of the current input.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        ``unique_id`` values that are new or whose data changed, and those
+        that disappeared from the current input.
+    """
+    prev = pd.Series(previous["fingerprint"].to_numpy(np.uint64), index=previous["unique_id"])
+    cur = pd.Series(current["fingerprint"].to_numpy(np.uint64), index=current["unique_id"])
+
+    common = cur.index.intersection(prev.index)
+    modified = common[cur[common].to_numpy() != prev[common].to_numpy()]
+    added = cur.index.difference(prev.index)
+    removed = prev.index.difference(cur.index)
+    return added.append(modified).to_numpy(), removed.to_numpy()
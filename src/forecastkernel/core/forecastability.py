@@ -2,9 +2,15 @@
 
 import numpy as np
 import pandas as pd
+import scipy.fft
 from scipy.stats import variation
 from scipy.signal import periodogram
 
+from forecastkernel.core.segments import segment_lengths, segment_starts, segment_sum
+from forecastkernel.core.splits import series_positions
+
+FORECASTABILITY_CLASSES = ["Lumpy", "Intermittent", "Noisy", "Strongly Seasonal", "Moderate"]
+
 
 def spectral_entropy(series: pd.Series | np.ndarray) -> float:
     """Compute normalized spectral entropy of a series.
@@ -55,6 +61,35 @@ def classify_forecastability(adi: float, cv2: float, entropy: float) -> str:
         return "Moderate"
 
 
+def classify_forecastability_batch(
+    adi: np.ndarray, cv2: np.ndarray, entropy: np.ndarray
+) -> np.ndarray:
+    """Vectorised :func:`classify_forecastability` over arrays of statistics.
+
+    Parameters
+    ----------
+    adi : numpy.ndarray
+        Average demand interval per series.
+    cv2 : numpy.ndarray
+        Squared coefficient of variation per series.
+    entropy : numpy.ndarray
+        Normalised spectral entropy per series.
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of class labels, one per series.
+    """
+    adi, cv2, entropy = (np.asarray(a, dtype=np.float64) for a in (adi, cv2, entropy))
+    conditions = [
+        (adi >= 1.32) & (cv2 >= 0.49),
+        adi >= 1.32,
+        entropy > 0.6,
+        entropy < 0.3,
+    ]
+    return np.select(conditions, FORECASTABILITY_CLASSES[:4], default="Moderate").astype(object)
+
+
 def compute_forecastability_metrics(df: pd.DataFrame) -> dict:
     """Return ADI, CV² and entropy stats for a single-series DataFrame.
 
@@ -84,3 +119,113 @@ def compute_forecastability_metrics(df: pd.DataFrame) -> dict:
         "classification": classification
     }
 
+
+
+def _batched_spectral_entropy(block: np.ndarray) -> np.ndarray:
+    """Row-wise :func:`spectral_entropy` for equal-length series.
+
+    Reproduces the default :func:`scipy.signal.periodogram` (constant detrend,
+    boxcar window, one-sided density) with a single real FFT over the block.
+    """
+    n = block.shape[1]
+    detrended = block - block.mean(axis=1, keepdims=True)
+    power = np.abs(scipy.fft.rfft(detrended, axis=1)) ** 2 / n
+    if n % 2 == 0:
+        power[:, 1:-1] *= 2
+    else:
+        power[:, 1:] *= 2
+
+    positive = power > 0
+    total = np.where(positive, power, 0.0).sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(positive, power / total, 1.0)
+        entropy = -np.sum(p * np.log(p), axis=1) / np.log(positive.sum(axis=1))
+    return entropy
+
+
+def profile_forecastability(
+    df: pd.DataFrame, max_block_size: int = 2**24
+) -> pd.DataFrame:
+    """Compute ADI, CV², entropy and class for every series in a panel.
+
+    Series are bucketed by exact length so each bucket is a dense
+    ``(n_series, length)`` matrix processed with one batched FFT; exact-length
+    buckets avoid the spectral leakage zero-padding would introduce, keeping
+    results identical to :func:`compute_forecastability_metrics`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format DataFrame with ``unique_id``, ``ds`` and ``y`` columns for
+        any number of series.
+    max_block_size : int, optional
+        Upper bound on the number of values materialised per FFT call. Large
+        buckets are split into several calls of at most this size.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per series with ``unique_id``, ``n_obs``, ``ADI``, ``CV2``,
+        ``SpectralEntropy`` and categorical ``classification`` columns, sorted
+        by ``unique_id``.
+    """
+    order, _, _ = series_positions(df)
+    ids = df["unique_id"].to_numpy()[order]
+    y = df["y"].to_numpy(dtype=np.float64)[order]
+
+    starts = segment_starts(pd.factorize(ids)[0])
+    lengths = segment_lengths(starts, len(y))
+
+    nonzero = segment_sum((y != 0).astype(np.int64), starts)
+    sums = segment_sum(y, starts)
+    means = sums / lengths
+    centred = y - np.repeat(means, lengths)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adi = lengths / nonzero
+        std = np.sqrt(segment_sum(centred**2, starts) / (lengths - 1))
+        cv2 = (std / means) ** 2
+
+    entropy = np.full(len(starts), np.nan)
+    for length in np.unique(lengths):
+        members = np.flatnonzero(lengths == length)
+        rows_per_call = max(1, max_block_size // int(length))
+        for offset in range(0, len(members), rows_per_call):
+            chunk = members[offset:offset + rows_per_call]
+            block = y[starts[chunk, None] + np.arange(length)]
+            entropy[chunk] = _batched_spectral_entropy(block)
+
+    return pd.DataFrame({
+        "unique_id": ids[starts],
+        "n_obs": lengths,
+        "ADI": adi,
+        "CV2": cv2,
+        "SpectralEntropy": entropy,
+        "classification": pd.Categorical(
+            classify_forecastability_batch(adi, cv2, entropy),
+            categories=FORECASTABILITY_CLASSES,
+        ),
+    })
+
+
+def summarize_forecastability(profile: pd.DataFrame) -> dict:
+    """Collapse a panel profile into the single-run forecastability summary.
+
+    Parameters
+    ----------
+    profile : pandas.DataFrame
+        Output of :func:`profile_forecastability`.
+
+    Returns
+    -------
+    dict
+        Median ADI, CV² and entropy, the most common class label and the
+        number of series per class.
+    """
+    counts = profile["classification"].value_counts()
+    return {
+        "ADI": round(float(profile["ADI"].median()), 2),
+        "CV2": round(float(profile["CV2"].median()), 2),
+        "SpectralEntropy": round(float(profile["SpectralEntropy"].median()), 3),
+        "classification": str(counts.idxmax()),
+        "class_counts": {str(k): int(v) for k, v in counts.items() if v},
+    }
@@ -0,0 +1,330 @@
+"""Sparse hierarchical aggregation and forecast reconciliation.
+
+A hierarchy is described by a *spec* frame with one row per bottom series
+(``unique_id``) and one column per grouping attribute, plus a list of
+*levels*, each a list of spec columns (``[]`` is the grand total). Nodes are
+named ``"total"`` for the empty level, the ``/``-joined attribute values for
+the other levels and their own ``unique_id`` at the bottom level.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+TOTAL = "total"
+BOTTOM_LEVEL = "unique_id"
+RECONCILIATION_METHODS = ("bottom_up", "top_down", "ols", "wls_struct", "mint_shrink")
+
+
+def _level_name(cols: list[str]) -> str:
+    return "/".join(cols) if cols else TOTAL
+
+
+def _level_codes(spec: pd.DataFrame, cols: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Return the node code of every bottom row and the node names of a level."""
+    if not cols:
+        return np.zeros(len(spec), dtype=np.int64), np.array([TOTAL], dtype=object)
+    grouped = spec.groupby(cols, sort=True)
+    codes = grouped.ngroup().to_numpy(np.int64)
+    keys = grouped.size().index.to_frame(index=False).astype(str)
+    names = keys.iloc[:, 0].str.cat(keys.iloc[:, 1:], sep="/") if len(cols) > 1 else keys.iloc[:, 0]
+    return codes, names.to_numpy(dtype=object)
+
+
+def summing_matrix(spec: pd.DataFrame, levels: list[list[str]]):
+    """Build the sparse summing matrix of a hierarchy.
+
+    Parameters
+    ----------
+    spec : pandas.DataFrame
+        One row per bottom series with ``unique_id`` and the attribute columns
+        referenced by ``levels``.
+    levels : list of list of str
+        Aggregation levels from the top down, e.g. ``[[], ["region"]]``. The
+        bottom level is always appended.
+
+    Returns
+    -------
+    tuple[scipy.sparse.csr_matrix, pandas.DataFrame]
+        ``S`` of shape ``(n_nodes, n_bottom)`` with one nonzero per bottom
+        series and level, and a ``nodes`` frame with ``unique_id`` and
+        ``level`` describing the rows of ``S``. The last ``n_bottom`` nodes are
+        the bottom series sorted by ``unique_id``, matching the columns of
+        ``S``.
+    """
+    from scipy import sparse
+
+    if spec["unique_id"].duplicated().any():
+        raise ValueError("Hierarchy spec contains duplicate unique_id values.")
+    spec = spec.sort_values("unique_id", kind="stable").reset_index(drop=True)
+    n_bottom = len(spec)
+    columns = np.arange(n_bottom)
+
+    rows, names, level_labels = [], [], []
+    offset = 0
+    for cols in levels:
+        codes, level_nodes = _level_codes(spec, list(cols))
+        rows.append(codes + offset)
+        names.append(level_nodes)
+        level_labels.append(np.full(len(level_nodes), _level_name(list(cols)), dtype=object))
+        offset += len(level_nodes)
+    rows.append(columns + offset)
+    names.append(spec["unique_id"].to_numpy(dtype=object))
+    level_labels.append(np.full(n_bottom, BOTTOM_LEVEL, dtype=object))
+    offset += n_bottom
+
+    row_idx = np.concatenate(rows)
+    S = sparse.csr_matrix(
+        (np.ones(len(row_idx)), (row_idx, np.tile(columns, len(rows)))),
+        shape=(offset, n_bottom),
+    )
+    nodes = pd.DataFrame({"unique_id": np.concatenate(names), "level": np.concatenate(level_labels)})
+    if nodes["unique_id"].duplicated().any():
+        raise ValueError("Node names are not unique across hierarchy levels.")
+    return S, nodes
+
+
+def parent_map(spec: pd.DataFrame, cols: list[str]) -> pd.Series:
+    """Map every bottom ``unique_id`` to its node name at level ``cols``."""
+    codes, names = _level_codes(spec, list(cols))
+    return pd.Series(names[codes], index=spec["unique_id"].to_numpy(), name="parent_id")
+
+
+def to_matrix(
+    df: pd.DataFrame, node_ids, value_col: str, times=None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pivot a long frame to a ``(len(node_ids), n_times)`` matrix.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long frame with ``unique_id``, ``ds`` and ``value_col``.
+    node_ids : array-like
+        Row order of the result. Rows of ``df`` for other ids are ignored.
+    value_col : str
+        Column to pivot.
+    times : array-like, optional
+        Column order of the result. Defaults to the sorted ``ds`` values.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        Values (``NaN`` where missing), a boolean mask of observed cells and
+        the time labels of the columns.
+    """
+    rows = pd.Index(node_ids).get_indexer(df["unique_id"])
+    if times is None:
+        times = np.sort(df["ds"].unique())
+    cols = pd.Index(times).get_indexer(df["ds"])
+    keep = (rows >= 0) & (cols >= 0)
+
+    values = np.full((len(node_ids), len(times)), np.nan)
+    values[rows[keep], cols[keep]] = df[value_col].to_numpy(np.float64)[keep]
+    return values, ~np.isnan(values), np.asarray(times)
+
+
+def from_matrix(values: np.ndarray, node_ids, times, value_col: str, mask=None) -> pd.DataFrame:
+    """Inverse of :func:`to_matrix`, keeping only cells where ``mask`` is set."""
+    node_ids = np.asarray(node_ids, dtype=object)
+    if mask is None:
+        mask = ~np.isnan(values)
+    rows, cols = np.nonzero(mask)
+    return pd.DataFrame({
+        "unique_id": node_ids[rows],
+        "ds": np.asarray(times)[cols],
+        value_col: values[rows, cols],
+    })
+
+
+def aggregate_hierarchy(
+    df: pd.DataFrame, S, nodes: pd.DataFrame, value_cols: list[str]
+) -> pd.DataFrame:
+    """Aggregate bottom-level series to every node with one sparse product.
+
+    Missing bottom observations contribute zero; a node/time cell is kept
+    when at least one of its bottom series is observed.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Bottom-level long frame with ``unique_id``, ``ds`` and ``value_cols``.
+    S : scipy.sparse.csr_matrix
+        Summing matrix from :func:`summing_matrix`.
+    nodes : pandas.DataFrame
+        Node table from :func:`summing_matrix`.
+    value_cols : list of str
+        Columns to aggregate, e.g. ``["y"]`` or forecast columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long frame over all nodes with ``unique_id``, ``ds`` and
+        ``value_cols``, ordered by node then time.
+    """
+    bottom_ids = nodes["unique_id"].to_numpy()[-S.shape[1]:]
+    times = np.sort(df["ds"].unique())
+    aggregated, covered = {}, None
+    for col in value_cols:
+        values, observed, _ = to_matrix(df, bottom_ids, col, times)
+        aggregated[col] = S @ np.nan_to_num(values)
+        col_covered = (S @ observed.astype(np.float64)) > 0
+        covered = col_covered if covered is None else covered | col_covered
+
+    rows, cols = np.nonzero(covered)
+    out = pd.DataFrame({"unique_id": nodes["unique_id"].to_numpy()[rows], "ds": times[cols]})
+    for col in value_cols:
+        out[col] = aggregated[col][rows, cols]
+    return out
+
+
+def top_down_proportions(bottom_history: np.ndarray) -> np.ndarray:
+    """Return each bottom series' share of the historical total.
+
+    Parameters
+    ----------
+    bottom_history : numpy.ndarray
+        Bottom-level actuals of shape ``(n_bottom, n_times)``; ``NaN`` counts
+        as zero.
+
+    Returns
+    -------
+    numpy.ndarray
+        Proportions summing to one (historical averages method).
+    """
+    totals = np.nansum(bottom_history, axis=1)
+    grand = totals.sum()
+    if grand == 0:
+        return np.full(len(totals), 1.0 / len(totals))
+    return totals / grand
+
+
+def _shrunk_covariance(residuals: np.ndarray) -> np.ndarray:
+    """Schäfer-Strimmer shrinkage of the residual covariance to its diagonal.
+
+    ``residuals`` has shape ``(n_times, n_nodes)``.
+    """
+    n = residuals.shape[0]
+    centred = residuals - residuals.mean(axis=0)
+    std = centred.std(axis=0, ddof=1)
+    std[std == 0] = 1.0
+    xs = centred / std
+    corr = xs.T @ xs / (n - 1)
+    products = xs ** 2
+    var_corr = n / (n - 1) ** 3 * (products.T @ products - (xs.T @ xs) ** 2 / n)
+
+    off = ~np.eye(corr.shape[0], dtype=bool)
+    denom = (corr[off] ** 2).sum()
+    lam = 1.0 if denom == 0 else float(np.clip(var_corr[off].sum() / denom, 0.0, 1.0))
+    cov = np.cov(centred, rowvar=False, ddof=1)
+    return lam * np.diag(np.diag(cov)) + (1 - lam) * cov
+
+
+def _weighted_least_squares(
+    S, base: np.ndarray, weights: np.ndarray, max_dense_nodes: int
+) -> np.ndarray:
+    """Return ``(S' W^-1 S)^-1 S' W^-1 y`` for diagonal ``W``.
+
+    The bottom block of ``S`` is the identity, so ``S' W^-1 S`` is diagonal
+    plus a low-rank term from the aggregate rows and the Woodbury identity
+    reduces the solve to a dense ``n_agg x n_agg`` system. Hierarchies with
+    more than ``max_dense_nodes`` aggregate nodes fall back to LSQR.
+    """
+    n_nodes, n_bottom = S.shape
+    n_agg = n_nodes - n_bottom
+    w_agg, w_bottom = weights[:n_agg], weights[n_agg:]
+
+    if n_agg <= max_dense_nodes:
+        A = S[:n_agg]
+        rhs = A.T @ (base[:n_agg] / w_agg[:, None]) + base[n_agg:] / w_bottom[:, None]
+        scaled = w_bottom[:, None] * rhs
+        K = (A.multiply(w_bottom) @ A.T).toarray() + np.diag(w_agg)
+        return scaled - w_bottom[:, None] * (A.T @ np.linalg.solve(K, A @ scaled))
+
+    from scipy import sparse
+    from scipy.sparse.linalg import lsqr
+
+    scale = sparse.diags(1.0 / np.sqrt(weights))
+    M = (scale @ S).tocsr()
+    rhs = scale @ base
+    bottom = np.empty((n_bottom, base.shape[1]))
+    for j in range(base.shape[1]):
+        bottom[:, j] = lsqr(M, rhs[:, j], atol=1e-12, btol=1e-12)[0]
+    return bottom
+
+
+def reconcile(
+    base: np.ndarray,
+    S,
+    method: str = "ols",
+    proportions: np.ndarray | None = None,
+    residuals: np.ndarray | None = None,
+    max_dense_nodes: int = 5000,
+) -> np.ndarray:
+    """Reconcile base forecasts of all nodes so that they add up.
+
+    Parameters
+    ----------
+    base : numpy.ndarray
+        Base forecasts of shape ``(n_nodes, h)`` in the row order of ``S``.
+    S : scipy.sparse.csr_matrix
+        Summing matrix from :func:`summing_matrix`.
+    method : str, optional
+        ``"bottom_up"``, ``"top_down"`` (requires ``proportions`` and a single
+        top node), ``"ols"``, ``"wls_struct"`` (weights are the number of
+        bottom series below each node) or ``"mint_shrink"`` (requires
+        ``residuals``). The least-squares methods only factor a dense matrix
+        over the aggregate nodes (sparse LSQR beyond ``max_dense_nodes`` of
+        them), so they scale to millions of bottom series; ``mint_shrink``
+        needs a dense ``n_nodes x n_nodes`` covariance and is limited to
+        ``max_dense_nodes`` nodes.
+    proportions : numpy.ndarray, optional
+        Bottom-level shares for ``"top_down"``.
+    residuals : numpy.ndarray, optional
+        In-sample residuals of shape ``(n_times, n_nodes)`` for
+        ``"mint_shrink"``.
+    max_dense_nodes : int, optional
+        Size guard for dense solves.
+
+    Returns
+    -------
+    numpy.ndarray
+        Coherent forecasts of shape ``(n_nodes, h)``.
+    """
+    if method not in RECONCILIATION_METHODS:
+        raise ValueError(f"Unknown reconciliation method: {method}")
+    base = np.asarray(base, dtype=np.float64)
+    if base.ndim == 1:
+        base = base[:, None]
+    if np.isnan(base).any():
+        raise ValueError("Base forecasts contain NaN.")
+    n_nodes, n_bottom = S.shape
+
+    if method == "bottom_up":
+        bottom = base[n_nodes - n_bottom:]
+    elif method == "top_down":
+        if proportions is None:
+            raise ValueError("top_down reconciliation requires proportions.")
+        if S[0].nnz != n_bottom:
+            raise ValueError("top_down reconciliation requires a single top node.")
+        bottom = np.asarray(proportions, dtype=np.float64)[:, None] * base[:1]
+    elif method == "ols":
+        bottom = _weighted_least_squares(S, base, np.ones(n_nodes), max_dense_nodes)
+    elif method == "wls_struct":
+        bottom = _weighted_least_squares(
+            S, base, np.asarray(S.sum(axis=1)).ravel(), max_dense_nodes
+        )
+    else:
+        if residuals is None:
+            raise ValueError("mint_shrink reconciliation requires residuals.")
+        if n_nodes > max_dense_nodes:
+            raise ValueError(
+                f"mint_shrink needs a dense {n_nodes}x{n_nodes} covariance; "
+                f"use ols or wls_struct above {max_dense_nodes} nodes."
+            )
+        W = _shrunk_covariance(np.asarray(residuals, dtype=np.float64))
+        S_dense = S.toarray()
+        winv_s = np.linalg.solve(W, S_dense)
+        bottom = np.linalg.solve(S_dense.T @ winv_s, winv_s.T @ base)
+
+    return np.asarray(S @ bottom)
@@ -0,0 +1,102 @@
+"""Integer join keys for long-format panels.
+
+Joining two panels on ``(unique_id, ds)`` with :meth:`pandas.DataFrame.merge`
+hashes every id string on both sides. Here each side's ids are turned into
+codes of one shared dictionary (free when both are categoricals from
+:func:`forecastkernel.utils.dtypes.compact_panel`), timestamps into dense
+codes, and the pair into a single ``int64`` key, so a join is one integer
+hash lookup per row.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def _encode(ids: pd.Series, categories: pd.Index) -> np.ndarray:
+    if isinstance(ids.dtype, pd.CategoricalDtype):
+        return ids.cat.set_categories(categories).cat.codes.to_numpy(np.int64)
+    codes = pd.Categorical(ids, categories=categories).codes.astype(np.int64)
+    unknown = codes < 0
+    if unknown.any():
+        # Ids outside the dictionary get codes past its end, distinct per id
+        extra, _ = pd.factorize(ids.to_numpy()[unknown])
+        codes[unknown] = len(categories) + extra
+    return codes
+
+
+def shared_id_codes(left: pd.Series, right: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Encode two id columns against one dictionary.
+
+    Parameters
+    ----------
+    left, right : pandas.Series
+        Series identifiers, as strings or categoricals.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        Non-negative ``int64`` codes of ``left`` and ``right``; equal ids get
+        equal codes.
+    """
+    left_cat = isinstance(left.dtype, pd.CategoricalDtype)
+    right_cat = isinstance(right.dtype, pd.CategoricalDtype)
+    if left_cat and right_cat:
+        # Recode through the categories only, without hashing every row
+        categories = left.cat.categories
+        if not categories.equals(right.cat.categories):
+            categories = categories.union(right.cat.categories)
+        return _encode(left, categories), _encode(right, categories)
+    if left_cat or right_cat:
+        # Strings absent from the categorical's dictionary cannot match it,
+        # so they only need codes distinct from each other
+        categories = (left if left_cat else right).cat.categories
+        return _encode(left, categories), _encode(right, categories)
+    codes, _ = pd.factorize(np.concatenate([left.to_numpy(), right.to_numpy()]))
+    return codes[:len(left)].astype(np.int64), codes[len(left):].astype(np.int64)
+
+
+def panel_join_keys(
+    left: pd.DataFrame, right: pd.DataFrame, id_col: str = "unique_id", time_col: str = "ds"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return one ``int64`` key per row of each frame for ``(id, time)``.
+
+    Equal ``(id, time)`` pairs get equal keys on both sides.
+    """
+    left_ids, right_ids = shared_id_codes(left[id_col], right[id_col])
+    times = np.concatenate([left[time_col].to_numpy(), right[time_col].to_numpy()])
+    time_codes, time_uniques = pd.factorize(times)
+    n_times = max(len(time_uniques), 1)
+    return (
+        left_ids * n_times + time_codes[:len(left)],
+        right_ids * n_times + time_codes[len(left):],
+    )
+
+
+def align_rows(
+    left: pd.DataFrame, right: pd.DataFrame, id_col: str = "unique_id", time_col: str = "ds"
+) -> np.ndarray:
+    """Return the row of ``right`` matching every row of ``left``.
+
+    Parameters
+    ----------
+    left, right : pandas.DataFrame
+        Frames with ``id_col`` and ``time_col`` columns.
+
+    Returns
+    -------
+    numpy.ndarray
+        Positional index into ``right`` for each ``left`` row, ``-1`` where
+        ``right`` has no matching row.
+
+    Raises
+    ------
+    ValueError
+        If ``right`` contains duplicate ``(id, time)`` pairs.
+    """
+    left_keys, right_keys = panel_join_keys(left, right, id_col, time_col)
+    index = pd.Index(right_keys)
+    if not index.is_unique:
+        raise ValueError(f"Duplicate ({id_col}, {time_col}) rows cannot be aligned.")
+    return index.get_indexer(left_keys)
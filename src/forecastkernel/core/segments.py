@@ -0,0 +1,95 @@
+"""Segment reductions over rows grouped by a sorted key."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def segment_order(keys: pd.Series | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return a stable ordering that makes equal keys contiguous.
+
+    Parameters
+    ----------
+    keys : array-like
+        Group label of every row, e.g. ``unique_id``.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        ``order`` (row permutation grouping equal keys while preserving their
+        relative order), ``starts`` (offset of each segment in the permuted
+        rows) and ``labels`` (sorted unique key of each segment).
+    """
+    # Categoricals are factorized through their codes (in category order)
+    codes, labels = pd.factorize(keys if isinstance(keys, pd.Series) else np.asarray(keys), sort=True)
+    order = np.argsort(codes, kind="stable")
+    starts = segment_starts(codes[order])
+    return order, starts, np.asarray(labels)
+
+
+def segment_starts(sorted_codes: np.ndarray) -> np.ndarray:
+    """Return the first row of every run of equal values in ``sorted_codes``.
+
+    Parameters
+    ----------
+    sorted_codes : numpy.ndarray
+        Group codes where equal values are already contiguous.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer offsets of each segment start.
+    """
+    sorted_codes = np.asarray(sorted_codes)
+    if len(sorted_codes) == 0:
+        return np.empty(0, dtype=np.intp)
+    change = sorted_codes[1:] != sorted_codes[:-1]
+    return np.r_[0, np.flatnonzero(change) + 1].astype(np.intp)
+
+
+def segment_lengths(starts: np.ndarray, n_rows: int) -> np.ndarray:
+    """Return the number of rows in every segment."""
+    return np.diff(np.r_[starts, n_rows])
+
+
+def segment_ids(starts: np.ndarray, n_rows: int) -> np.ndarray:
+    """Return the segment index of every row."""
+    return np.repeat(np.arange(len(starts)), segment_lengths(starts, n_rows))
+
+
+def segment_sum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Sum ``values`` over each segment along the first axis.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Array of shape ``(n_rows,)`` or ``(n_rows, k)`` sorted by segment.
+    starts : numpy.ndarray
+        Segment offsets from :func:`segment_starts`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(n_segments,)`` or ``(n_segments, k)``.
+    """
+    values = np.asarray(values)
+    if len(starts) == 0:
+        return np.zeros((0,) + values.shape[1:], dtype=values.dtype)
+    return np.add.reduceat(values, starts, axis=0)
+
+
+def segment_mean(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Average ``values`` over each segment along the first axis."""
+    values = np.asarray(values)
+    counts = segment_lengths(starts, len(values))
+    sums = segment_sum(values, starts)
+    return sums / counts.reshape((-1,) + (1,) * (sums.ndim - 1))
+
+
+def segment_max(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Take the maximum of ``values`` over each segment along the first axis."""
+    values = np.asarray(values)
+    if len(starts) == 0:
+        return np.zeros((0,) + values.shape[1:], dtype=values.dtype)
+    return np.maximum.reduceat(values, starts, axis=0)
@@ -0,0 +1,123 @@
+"""Index-based train/holdout splits for long-format panels."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.segments import segment_ids, segment_lengths, segment_starts
+
+
+def series_positions(
+    df: pd.DataFrame, id_col: str = "unique_id", time_col: str = "ds"
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sort a panel once and locate every row within its series.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format frame with ``id_col`` and ``time_col`` columns. Rows may be
+        in any order.
+    id_col : str, optional
+        Column identifying each series.
+    time_col : str, optional
+        Column holding the timestamps used for ordering within a series.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        ``order`` (row positions of ``df`` sorted by series then time),
+        ``position`` (0-based offset of each sorted row inside its series) and
+        ``remaining`` (number of rows from the sorted row to the end of its
+        series, so the last observation has ``remaining == 1``).
+    """
+    codes, _ = pd.factorize(df[id_col], sort=True)
+    order = np.lexsort((df[time_col].to_numpy(), codes))
+    sorted_codes = codes[order]
+
+    n = len(order)
+    starts = segment_starts(sorted_codes)
+    sizes = segment_lengths(starts, n)
+    group = segment_ids(starts, n)
+
+    position = np.arange(n) - starts[group]
+    remaining = sizes[group] - position
+    return order, position, remaining
+
+
+def rolling_origin_splits(
+    df: pd.DataFrame,
+    h: int,
+    n_windows: int = 1,
+    step_size: int | None = None,
+    id_col: str = "unique_id",
+    time_col: str = "ds",
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return train/holdout row positions for one or more forecast origins.
+
+    Windows are ordered from the earliest cutoff to the latest, so the final
+    entry always holds out the last ``h`` observations of every series. The
+    positions index ``df`` directly (``df.take(idx)``) and are ordered by series
+    then time.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format frame with ``id_col`` and ``time_col`` columns.
+    h : int
+        Number of observations held out per series and window.
+    n_windows : int, optional
+        Number of forecast origins to generate.
+    step_size : int, optional
+        Distance between consecutive origins. Defaults to ``h``.
+    id_col : str, optional
+        Column identifying each series.
+    time_col : str, optional
+        Column holding the timestamps used for ordering within a series.
+
+    Returns
+    -------
+    list[tuple[numpy.ndarray, numpy.ndarray]]
+        ``(train_idx, holdout_idx)`` pairs, one per window. Series shorter than
+        the holdout contribute all their rows to the holdout and none to the
+        training set, mirroring ``iloc[:-h]`` / ``iloc[-h:]`` semantics.
+    """
+    if h < 1:
+        raise ValueError("Horizon must be a positive integer.")
+    if n_windows < 1:
+        raise ValueError("n_windows must be a positive integer.")
+    step = h if step_size is None else step_size
+
+    order, _, remaining = series_positions(df, id_col, time_col)
+
+    splits = []
+    for window in range(n_windows - 1, -1, -1):
+        offset = window * step
+        train_mask = remaining > offset + h
+        holdout_mask = (remaining > offset) & ~train_mask
+        splits.append((order[train_mask], order[holdout_mask]))
+    return splits
+
+
+def holdout_split(
+    df: pd.DataFrame, h: int, id_col: str = "unique_id", time_col: str = "ds"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return row positions for a single last-``h`` holdout per series.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format frame with ``id_col`` and ``time_col`` columns.
+    h : int
+        Number of trailing observations held out per series.
+    id_col : str, optional
+        Column identifying each series.
+    time_col : str, optional
+        Column holding the timestamps used for ordering within a series.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        ``(train_idx, holdout_idx)`` row positions into ``df``.
+    """
+    return rolling_origin_splits(df, h, n_windows=1, id_col=id_col, time_col=time_col)[0]
@@ -0,0 +1,343 @@
+"""Baseline runs over inputs streamed in series-aligned chunks.
+
+The input is read with :func:`~forecastkernel.utils.io_utils.iter_series_chunks`
+(it must be sorted by ``unique_id``). Each chunk is forecast and scored on its
+own and every per-row or per-series output is appended to a columnar file, so
+peak memory follows ``--chunk_rows`` instead of the dataset size. Pooled
+metrics, the error decomposition and the Diebold-Mariano summary are merged
+from per-chunk accumulators and equal those of an in-memory run.
+
+Rolling-origin backtests, incremental refits, regeneration, cascade anchors,
+forecast caching, serving stores and plots need the whole panel and are not
+available in chunked runs. Drift monitoring needs backtest residuals and is
+skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.accumulators import block_moments, empty_moments, merge_moments, moment_stats
+from forecastkernel.core.decomposition import (
+    breakdown_from_moments, decompose_series_errors, error_moments, merge_error_moments,
+)
+from forecastkernel.core.evaluation import evaluate_forecasts, metrics_from_moments
+from forecastkernel.core.fingerprints import series_fingerprints
+from forecastkernel.core.hash_utils import generate_serve_hash
+from forecastkernel.core.phase_handler import include_dm_test, include_drift_monitor, include_serve_hash
+from forecastkernel.core.splits import holdout_split
+from forecastkernel.utils.ci_utils import validate_file_hashes
+from forecastkernel.utils.forecast_cache import make_cache_key
+from forecastkernel.utils.git_utils import get_git_commit_hash
+from forecastkernel.utils.hash_utils import compute_file_hash
+from forecastkernel.utils.io_utils import (
+    append_frame, artifact_path, close_frame_writers, iter_frame_batches, iter_series_chunks,
+    remove_stale_artifacts,
+)
+from forecastkernel.utils.logging_utils import close_run_logger, setup_run_logger
+from forecastkernel.utils.manifest import build_manifest
+from forecastkernel.utils.profiling import annotate, span
+
+# Options that need the whole panel in memory
+UNSUPPORTED_OPTIONS = ("regenerate", "incremental", "cv_windows", "parent_run", "serve_dir", "float32")
+# Per-chunk outputs appended to Parquet files in the run directory
+CHUNK_OUTPUTS = (
+    "per_series_metrics",
+    "residuals",
+    "forecastability_profile",
+    "series_fingerprints",
+    "dm_tests",
+    "error_decomposition",
+)
+
+
+def check_chunked_config(config: argparse.Namespace) -> None:
+    """Reject options that chunked runs cannot honour.
+
+    Raises
+    ------
+    ValueError
+        If ``chunk_rows`` is not positive or an option from
+        :data:`UNSUPPORTED_OPTIONS` is set.
+    """
+    if config.chunk_rows <= 0:
+        raise ValueError("--chunk_rows must be positive.")
+    unsupported = [name for name in UNSUPPORTED_OPTIONS if getattr(config, name, None)]
+    if unsupported:
+        raise ValueError(f"Options not supported with --chunk_rows: {unsupported}")
+
+
+def _timed_chunks(chunks):
+    """Yield from ``chunks`` timing every read as a ``read`` span."""
+    while True:
+        with span("read") as info:
+            chunk = next(chunks, None)
+            info["rows"] = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def run_chunked_baseline(config: argparse.Namespace) -> dict:
+    """Run the baseline chunk by chunk and write the usual run artifacts.
+
+    Parameters
+    ----------
+    config : argparse.Namespace
+        Run options, see :func:`forecastkernel.scripts.baseline_sf.build_parser`,
+        with ``chunk_rows`` set.
+
+    Returns
+    -------
+    dict
+        The ``baseline_metrics.json`` payload, with a ``chunked`` entry
+        recording the chunk layout.
+
+    Raises
+    ------
+    ValueError
+        If an unsupported option is set, the input is empty or not sorted by
+        ``unique_id``.
+    """
+    from statsforecast import StatsForecast
+    from tabulate import tabulate
+
+    from forecastkernel.core.dm_test import (
+        accumulate_dm_tests, dm_pair_result, finalize_dm_tests, merge_dm_accumulators, panel_dm_test,
+    )
+    from forecastkernel.core.forecastability import (
+        compute_forecastability_metrics, profile_forecastability, summarize_forecastability,
+    )
+    from forecastkernel.schemas.input_schema import forecast_input_schema
+    from forecastkernel.scripts.baseline_sf import build_models, summarize_results
+
+    check_chunked_config(config)
+    active_phase = config.phase
+    run_id = config.tag or "dvc-run"
+    output_path = config.output_dir
+    os.makedirs(output_path, exist_ok=True)
+    log = setup_run_logger(os.path.join(output_path, "forecast_run.log"), logger_name="baseline")
+
+    log.info(f"Loading dataset in chunks of ~{config.chunk_rows} rows from: {config.data}")
+    input_hash = compute_file_hash(config.data)
+    log.info(f"Input file hash: {input_hash}")
+
+    h = config.horizon
+    models = build_models(config.season_length)
+    sf = StatsForecast(models=models, freq='D', n_jobs=config.n_jobs)
+    forecast_file = artifact_path(output_path, "baseline_forecasts", config.output_format)
+    paths = {name: os.path.join(output_path, f"{name}.parquet") for name in CHUNK_OUTPUTS}
+    # Outputs are appended, so stale files of an earlier run must go first
+    remove_stale_artifacts(output_path, "baseline_forecasts", config.output_format)
+    for path in [forecast_file, *paths.values()]:
+        if os.path.exists(path):
+            os.remove(path)
+
+    writers = {}
+    moments = errors = dm_pooled = forecast_cols = first_id = last_chunk = None
+    n_chunks = n_series = n_rows = n_short = 0
+    try:
+        for chunk in _timed_chunks(iter_series_chunks(config.data, config.chunk_rows)):
+            with span("prepare", rows=len(chunk)):
+                if "y" in chunk.columns:
+                    chunk["y"] = chunk["y"].astype("float64")
+                forecast_input_schema.validate(chunk)
+                chunk = chunk.sort_values(["unique_id", "ds"])
+
+                train_idx, holdout_idx = holdout_split(chunk, h)
+            with span("fit", rows=len(chunk)):
+                forecasts = sf.forecast(df=chunk.take(train_idx).reset_index(drop=True), h=h)
+                forecasts["ensemble_naive"] = (forecasts["Naive"] + forecasts["SeasonalNaive"]) / 2
+            forecast_cols = [
+                col for col in forecasts.columns
+                if col not in ["unique_id", "ds", "run_id", "horizon", "n_models", "tag"]
+                and pd.api.types.is_numeric_dtype(forecasts[col])
+            ]
+            with span("evaluate", rows=len(chunk)):
+                _, residuals_df, series_metrics = evaluate_forecasts(
+                    forecasts, chunk.take(holdout_idx).reset_index(drop=True), forecast_cols,
+                    output_path, per_series=True
+                )
+                block = block_moments(residuals_df[forecast_cols].to_numpy())
+                moments = block if moments is None else merge_moments(moments, block)
+
+                append_frame(series_metrics, paths["per_series_metrics"], writers)
+                append_frame(residuals_df, paths["residuals"], writers)
+            with span("profile", rows=len(chunk)):
+                append_frame(profile_forecastability(chunk), paths["forecastability_profile"], writers)
+                append_frame(series_fingerprints(chunk), paths["series_fingerprints"], writers)
+            if include_dm_test(active_phase):
+                with span("dm_test", rows=len(residuals_df)):
+                    dm_table = panel_dm_test(residuals_df, forecast_cols, loss=config.dm_loss, h=h)
+                    append_frame(dm_table, paths["dm_tests"], writers)
+                    pooled = accumulate_dm_tests(dm_table)
+                    dm_pooled = pooled if dm_pooled is None else merge_dm_accumulators(dm_pooled, pooled)
+            if active_phase >= 2:
+                with span("decompose", rows=len(residuals_df)):
+                    chunk_errors = error_moments(residuals_df, forecast_cols, config.seasonal_lag)
+                    errors = chunk_errors if errors is None else merge_error_moments(errors, chunk_errors)
+                    series_errors = decompose_series_errors(residuals_df, forecast_cols, config.seasonal_lag)
+                    n_short += series_errors.loc[series_errors["seasonality_miss"].isna(), "unique_id"].nunique()
+                    append_frame(series_errors, paths["error_decomposition"], writers)
+
+            with span("write_forecasts", rows=len(forecasts)):
+                forecasts["run_id"] = run_id
+                forecasts["horizon"] = h
+                forecasts["n_models"] = len(models)
+                ordered_cols = ["run_id", "horizon", "n_models", "unique_id", "ds"] + forecast_cols
+                append_frame(forecasts[ordered_cols], forecast_file, writers)
+
+            chunk_series = len(series_metrics) // len(forecast_cols)
+            if first_id is None:
+                first_id = chunk["unique_id"].iloc[0]
+            n_chunks += 1
+            n_series += chunk_series
+            n_rows += len(chunk)
+            last_chunk = chunk
+            log.info(f"Chunk {n_chunks}: {chunk_series} series, {len(chunk)} rows")
+    finally:
+        close_frame_writers(writers)
+
+    if moments is None:
+        raise ValueError(f"No rows found in {config.data}")
+    log.info(f"📄 Forecasts saved to: {forecast_file}")
+
+    results = metrics_from_moments(moments, forecast_cols)
+    log.info("\n" + tabulate(results, headers="keys", tablefmt="github"))
+    metrics_dict, selected_model, pass_ci = summarize_results(results)
+
+    if n_series == 1:
+        forecastability = compute_forecastability_metrics(last_chunk)
+    else:
+        profile = pd.read_parquet(
+            paths["forecastability_profile"], columns=["ADI", "CV2", "SpectralEntropy", "classification"]
+        )
+        forecastability = summarize_forecastability(profile)
+        del profile
+    del last_chunk
+    with open(os.path.join(output_path, "forecastability.json"), "w") as f:
+        json.dump(forecastability, f, indent=2)
+
+    baseline_metrics = {
+        "series_id": first_id,
+        "horizon": h,
+        "timestamp": datetime.now().isoformat(),
+        "forecastability": forecastability,
+        "metrics": metrics_dict,
+        "ci_baseline_rule": "min(ensemble_naive, holt_winters)",
+        "selected_model": selected_model,
+        "pass_ci": pass_ci,
+        "metadata": {
+            "input_hash": input_hash,
+            "tag": "v0.1-baseline",
+            "phase": active_phase
+        }
+    }
+    baseline_metrics["metadata"]["aggregation_level"] = config.aggregation_level
+    baseline_metrics["chunked"] = {
+        "chunk_rows": config.chunk_rows,
+        "n_chunks": n_chunks,
+        "n_series": n_series,
+        "n_rows": n_rows,
+    }
+
+    if include_dm_test(active_phase):
+        dm_summary = finalize_dm_tests(dm_pooled)
+        if dm_summary.empty:
+            log.warning(
+                f"⚠️ No series has more than h={h} holdout residuals, too few for a "
+                "Diebold-Mariano test of h-step errors; dm_test is left empty."
+            )
+        baseline_metrics["dm_test"] = dm_pair_result(dm_summary, selected_model, "ensemble_naive")
+    if include_drift_monitor(active_phase):
+        log.info("Drift monitoring needs backtest residuals and is skipped in chunked runs.")
+    if not config.no_plots:
+        log.info("Diagnostic plots are not rendered in chunked runs.")
+
+    if active_phase >= 2:
+        # Noise is the mean distance from the pooled bias, so it takes a
+        # second streamed pass over the residuals
+        with span("noise_pass"):
+            bias = moment_stats(errors["residuals"])["mean"]
+            spread = empty_moments(len(forecast_cols))
+            for batch in iter_frame_batches(paths["residuals"], config.chunk_rows, columns=forecast_cols):
+                spread = merge_moments(spread, block_moments(np.abs(batch.to_numpy(np.float64) - bias)))
+            error_breakdown = breakdown_from_moments(errors, forecast_cols, moment_stats(spread)["mean"])
+        with open(os.path.join(output_path, "error_breakdown.json"), "w") as f:
+            json.dump(error_breakdown, f, indent=2)
+        log.info("🧠 Error decomposition saved to error_breakdown.json")
+        if n_short:
+            # Chunked runs only have the h holdout residuals of each series
+            log.warning(
+                f"⚠️ {n_short} series have no more than --seasonal_lag {config.seasonal_lag} "
+                "residuals and are left out of Seasonality Miss."
+            )
+
+    if include_serve_hash(active_phase):
+        baseline_metrics["metadata"]["serve_hash"] = generate_serve_hash(baseline_metrics)
+    baseline_metrics["metadata"]["commit_hash"] = get_git_commit_hash()
+
+    metrics_path = os.path.join(output_path, "baseline_metrics.json")
+    with open(metrics_path, "w") as f:
+        json.dump(baseline_metrics, f, indent=2)
+    log.info(f"✅ Metrics saved to: {metrics_path}")
+
+    if not config.no_mlflow:
+        with span("mlflow"):
+            from forecastkernel.scripts.baseline_sf import _SERIAL_LOCK
+            from forecastkernel.utils.mlflow_utils import log_mlflow_metrics
+
+            with _SERIAL_LOCK:
+                mlflow_run_id = log_mlflow_metrics(
+                    run_id=run_id,
+                    df=pd.DataFrame({"unique_id": [first_id]}),
+                    h=h,
+                    metrics_dict=metrics_dict,
+                    selected_model=selected_model,
+                    pass_ci=pass_ci,
+                    output_path=output_path,
+                    phase=active_phase
+                )
+            annotate(mlflow_run_id=mlflow_run_id)
+
+    info = {
+        "run_id": run_id,
+        "horizon": h,
+        "n_models": len(models),
+        "input_file": config.data,
+        "model_key": make_cache_key("", models, h, config.season_length, freq='D'),
+        "timestamp": datetime.now().isoformat()
+    }
+    with open(os.path.join(output_path, "run_info.json"), "w") as f:
+        json.dump(info, f, indent=2)
+
+    with span("audit"):
+        audit_log = {
+            "run_id": run_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            **build_manifest(
+                output_path,
+                ["baseline_metrics.json", os.path.basename(forecast_file), "run_info.json", "per_series_metrics.parquet"],
+                algorithm=config.hash_algorithm,
+            ),
+        }
+    audit_log_path = os.path.join(output_path, "audit_log.json")
+    with open(audit_log_path, "w") as f:
+        json.dump(audit_log, f, indent=2)
+    log.info("🔐 Audit log with file hashes saved.")
+
+    hash_mismatches = validate_file_hashes(audit_log_path, output_path)
+    if hash_mismatches:
+        log.warning(f"⚠️ CI Hash Mismatch Detected:\n{json.dumps(hash_mismatches, indent=2)}")
+    else:
+        log.info("✅ CI Hash Validation Passed")
+
+    log.info(f"✅ Chunked run completed: {n_series} series in {n_chunks} chunks. Outputs saved to: {output_path}")
+    close_run_logger(log)
+    return baseline_metrics
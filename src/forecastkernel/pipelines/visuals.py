@@ -1,9 +1,384 @@
-"""Plotting utilities for visual diagnostics and drift checks."""
+"""Plotting utilities for visual diagnostics and drift checks.
 
+Every plot is planned as a job, a module-level render function with plain
+array arguments, and drawn on its own Agg figure through matplotlib's
+object-oriented API. No pyplot state is shared, so jobs can be rendered in
+worker processes (:func:`start_renderer`, :func:`dispatch_jobs`) while the
+caller carries on. Series are grouped once per plan, and per-series plots are
+limited to a sample chosen by :func:`sample_series`.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
 import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from forecastkernel.core.segments import segment_order
+
+SAMPLING_POLICIES = ("first", "random", "worst")
+
+
+def sample_series(
+    unique_ids,
+    max_series: int | None = None,
+    policy: str = "first",
+    scores: pd.Series | None = None,
+    seed: int = 0,
+) -> np.ndarray:
+    """Choose which series get per-series plots.
+
+    Parameters
+    ----------
+    unique_ids : array-like
+        Series ids, possibly repeated.
+    max_series : int, optional
+        Largest number of series returned. ``None`` keeps every series.
+    policy : str, optional
+        ``"first"`` keeps series in order of appearance, ``"random"`` draws a
+        reproducible sample and ``"worst"`` keeps the highest ``scores``.
+    scores : pandas.Series, optional
+        Score indexed by ``unique_id``, required by ``"worst"``.
+    seed : int, optional
+        Seed of the ``"random"`` policy.
+
+    Returns
+    -------
+    numpy.ndarray
+        The selected ids.
+    """
+    if policy not in SAMPLING_POLICIES:
+        raise ValueError(f"Unknown sampling policy: {policy}")
+    ids = pd.unique(np.asarray(unique_ids))
+    if max_series is None or len(ids) <= max_series:
+        return ids
+    if policy == "first":
+        return ids[:max_series]
+    if policy == "random":
+        rng = np.random.default_rng(seed)
+        return ids[np.sort(rng.choice(len(ids), max_series, replace=False))]
+    if scores is None:
+        raise ValueError("The 'worst' sampling policy requires per-series scores.")
+    ranked = pd.Series(scores).reindex(ids).fillna(-np.inf).to_numpy()
+    return ids[np.argsort(-ranked, kind="stable")[:max_series]]
+
+
+def _group_series(frame: pd.DataFrame, columns: list[str], unique_ids) -> dict:
+    """Return ``{unique_id: {"ds": ..., column: ...}}`` sorted by ``ds``.
+
+    Rows of the requested series are selected and grouped in one pass instead
+    of filtering ``frame`` once per series.
+    """
+    frame = frame[frame["unique_id"].isin(unique_ids)]
+    order, starts, labels = segment_order(frame["unique_id"])
+    ends = np.r_[starts[1:], len(order)]
+    ds = frame["ds"].to_numpy()[order]
+    values = {col: frame[col].to_numpy()[order] for col in columns}
+    groups = {}
+    for uid, start, end in zip(labels, starts, ends):
+        rows = start + np.argsort(ds[start:end], kind="stable")
+        groups[uid] = {"ds": ds[rows], **{col: v[rows] for col, v in values.items()}}
+    return groups
+
+
+# ----------------------------------------------------------------------
+# Render functions (run in worker processes, one figure each)
+# ----------------------------------------------------------------------
+
+def _new_axes(figsize: tuple[float, float]):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _save(fig, path: str) -> None:
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def _render_lines(
+    path: str,
+    title: str,
+    lines: list[tuple],
+    figsize: tuple[float, float],
+    hline: dict | None = None,
+    legend: bool = True,
+) -> None:
+    """Draw ``(x, y, style)`` lines with an optional horizontal reference."""
+    fig, ax = _new_axes(figsize)
+    for x, y, style in lines:
+        ax.plot(x, y, **style)
+    if hline is not None:
+        ax.axhline(0, **hline)
+    ax.set_title(title)
+    if legend:
+        ax.legend()
+    _save(fig, path)
+
+
+def _render_histograms(
+    path: str, title: str, samples: list[tuple], figsize: tuple[float, float]
+) -> None:
+    """Overlay ``(values, label, color, alpha)`` histograms with KDEs."""
+    import seaborn as sns
+
+    fig, ax = _new_axes(figsize)
+    for values, label, color, alpha in samples:
+        style = {} if alpha is None else {"alpha": alpha}
+        sns.histplot(values, kde=True, label=label, color=color, ax=ax, **style)
+    ax.set_title(title)
+    ax.legend()
+    _save(fig, path)
+
+
+def _render_scatter(path: str, title: str, x: np.ndarray, y: np.ndarray, labels: tuple[str, str]) -> None:
+    fig, ax = _new_axes((8, 6))
+    ax.scatter(x, y)
+    ax.set_xlabel(labels[0])
+    ax.set_ylabel(labels[1])
+    ax.set_title(title)
+    _save(fig, path)
+
+
+def render_jobs(jobs: list[tuple]) -> int:
+    """Render ``(function, kwargs)`` jobs in this process.
+
+    Returns
+    -------
+    int
+        Number of plots written.
+    """
+    for func, kwargs in jobs:
+        func(**kwargs)
+    return len(jobs)
+
+
+def start_renderer(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """Return a process pool for :func:`dispatch_jobs`.
+
+    Workers are spawned, so they do not inherit the caller's threads or
+    locks, and import matplotlib only once they receive their first job.
+    """
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def dispatch_jobs(
+    jobs: list[tuple], executor: ProcessPoolExecutor | None = None, batch_size: int = 8
+) -> list[Future]:
+    """Render ``jobs`` in ``executor``, or right away when it is ``None``.
+
+    Parameters
+    ----------
+    jobs : list of tuple
+        Jobs from the ``plan_*`` functions.
+    executor : concurrent.futures.ProcessPoolExecutor, optional
+        Pool from :func:`start_renderer`.
+    batch_size : int, optional
+        Jobs sent to a worker per task.
+
+    Returns
+    -------
+    list[concurrent.futures.Future]
+        Futures resolving to the number of plots written. Empty when the jobs
+        were rendered in this process.
+    """
+    if executor is None:
+        render_jobs(jobs)
+        return []
+    return [
+        executor.submit(render_jobs, jobs[i:i + batch_size])
+        for i in range(0, len(jobs), batch_size)
+    ]
+
+
+def wait_for_jobs(futures: list[Future]) -> int:
+    """Block until dispatched jobs finish, re-raising the first failure.
+
+    Returns
+    -------
+    int
+        Number of plots written.
+    """
+    return sum(future.result() for future in futures)
+
+
+# ----------------------------------------------------------------------
+# Plans
+# ----------------------------------------------------------------------
+
+def plan_visual_debug(
+    df: pd.DataFrame,
+    forecasts: pd.DataFrame,
+    forecastability: dict,
+    forecast_cols: list[str],
+    output_path: str,
+    residuals_df: pd.DataFrame | None = None,
+    max_series: int | None = 2,
+    policy: str = "first",
+    scores: pd.Series | None = None,
+) -> list[tuple]:
+    """Plan the diagnostic plots of :func:`visual_debug`.
+
+    Parameters
+    ----------
+    df, forecasts, forecastability, forecast_cols, output_path, residuals_df
+        As in :func:`visual_debug`.
+    max_series, policy, scores
+        Series sampling, see :func:`sample_series`.
+
+    Returns
+    -------
+    list[tuple]
+        Render jobs. Output directories are created here.
+    """
+    plots_dir = os.path.join(output_path, "plots")
+    forecast_dir = os.path.join(plots_dir, "forecasts")
+    forecastability_dir = os.path.join(plots_dir, "forecastability")
+    residuals_dir = os.path.join(plots_dir, "residuals")
+    for directory in (forecast_dir, forecastability_dir, residuals_dir):
+        os.makedirs(directory, exist_ok=True)
+
+    jobs = []
+
+    # Forecasts
+    uid_sample = sample_series(df["unique_id"], max_series, policy, scores)
+    actuals = _group_series(df, ["y"], uid_sample)
+    predicted = _group_series(forecasts, forecast_cols, uid_sample)
+    for uid in uid_sample:
+        lines = [(actuals[uid]["ds"], actuals[uid]["y"], {"label": "Actual", "marker": "o"})]
+        fcast = predicted.get(uid)
+        if fcast is not None:
+            lines += [(fcast["ds"], fcast[m], {"label": m, "linestyle": "--"}) for m in forecast_cols]
+        jobs.append((_render_lines, {
+            "path": os.path.join(forecast_dir, f"{uid}_forecast.png"),
+            "title": f"Forecasts for {uid}",
+            "lines": lines,
+            "figsize": (14, 6),
+        }))
+
+    # Forecastability Scatter
+    jobs.append((_render_scatter, {
+        "path": os.path.join(forecastability_dir, "forecastability_scatter.png"),
+        "title": "Forecastability Scatter: Entropy vs CV²",
+        "x": np.array([forecastability.get("SpectralEntropy")], dtype=float),
+        "y": np.array([forecastability.get("CV2")], dtype=float),
+        "labels": ("SpectralEntropy", "CV2"),
+    }))
+
+    # Residual Visuals
+    if residuals_df is not None:
+        for model in forecast_cols:
+            resids = residuals_df[[model, "ds"]].dropna().sort_values("ds", kind="stable")
+            values = resids[model].to_numpy()
+            jobs.append((_render_lines, {
+                "path": os.path.join(residuals_dir, f"{model}_residuals.png"),
+                "title": f"Residual Time Series - {model}",
+                "lines": [(resids["ds"].to_numpy(), values, {"label": "Residuals"})],
+                "figsize": (12, 4),
+                "hline": {"linestyle": "--", "color": "gray"},
+                "legend": False,
+            }))
+            if len(values) > 28:
+                jobs.append((_render_histograms, {
+                    "path": os.path.join(residuals_dir, f"{model}_resid_hist.png"),
+                    "title": f"Residual Histogram Comparison - {model}",
+                    "samples": [(values[:-14], "Prior", "blue", 0.6), (values[-14:], "Recent", "red", 0.6)],
+                    "figsize": (8, 4),
+                }))
+    return jobs
+
+
+def plan_residual_drift(
+    residuals_df: pd.DataFrame,
+    model: str,
+    output_path: str,
+    max_series: int | None = None,
+    policy: str = "first",
+    scores: pd.Series | None = None,
+) -> list[tuple]:
+    """Plan one residual plot per sampled series, see :func:`plot_residual_drift`."""
+    drift_dir = os.path.join(output_path, "drift")
+    os.makedirs(drift_dir, exist_ok=True)
+    uid_sample = sample_series(residuals_df["unique_id"], max_series, policy, scores)
+    groups = _group_series(residuals_df, [model], uid_sample)
+    return [
+        (_render_lines, {
+            "path": os.path.join(drift_dir, f"{uid}_residuals.png"),
+            "title": f"Residuals Over Time - {uid}",
+            "lines": [(groups[uid]["ds"], groups[uid][model], {"label": "Residuals", "marker": "o"})],
+            "figsize": (14, 6),
+            "hline": {"color": "black", "linestyle": "--", "linewidth": 0.8},
+            "legend": False,
+        })
+        for uid in uid_sample
+    ]
+
+
+def plan_residual_histograms(
+    residuals_df: pd.DataFrame, model: str, output_path: str, window: int = 30
+) -> list[tuple]:
+    """Plan the past versus recent histogram, see :func:`plot_residual_histograms`."""
+    drift_dir = os.path.join(output_path, "drift")
+    os.makedirs(drift_dir, exist_ok=True)
+    values = residuals_df.sort_values("ds", kind="stable")[model].to_numpy()
+    return [(_render_histograms, {
+        "path": os.path.join(drift_dir, f"{model}_residual_histogram.png"),
+        "title": f"Residual Distribution Shift - {model}",
+        "samples": [(values[:-window], "Past", "gray", None), (values[-window:], "Recent", "orange", None)],
+        "figsize": (14, 6),
+    })]
+
+
+def plan_forecast_deltas(
+    true_df: pd.DataFrame,
+    original_forecasts: pd.DataFrame,
+    regenerated_forecasts: pd.DataFrame,
+    drift_scores: dict,
+    forecast_cols: list[str],
+    output_path: str,
+    max_series: int | None = 3,
+) -> list[tuple]:
+    """Plan the comparison plots of :func:`plot_forecast_deltas`."""
+    delta_path = os.path.join(output_path, "plots", "delta_audit")
+    os.makedirs(delta_path, exist_ok=True)
+
+    sample_ids = sample_series(true_df["unique_id"], max_series)
+    actual = _group_series(true_df, ["y"], sample_ids)
+    models = [m for m in forecast_cols if m in original_forecasts.columns and m in regenerated_forecasts.columns]
+    orig = _group_series(original_forecasts, models, sample_ids)
+    regen = _group_series(regenerated_forecasts, models, sample_ids)
+
+    jobs = []
+    for uid in sample_ids:
+        if uid not in orig or uid not in regen:
+            continue
+        for model in models:
+            drift_val = drift_scores.get(model, 0.0)
+            jobs.append((_render_lines, {
+                "path": os.path.join(delta_path, f"{uid}_{model}_delta.png"),
+                "title": f"{uid} | {model} Drift: {drift_val:+.2%}",
+                "lines": [
+                    (actual[uid]["ds"], actual[uid]["y"], {"label": "Actual", "color": "black", "linewidth": 1.5}),
+                    (orig[uid]["ds"], orig[uid][model], {"label": "Original", "linestyle": "--", "color": "blue"}),
+                    (regen[uid]["ds"], regen[uid][model], {"label": "Regenerated", "linestyle": ":", "color": "red"}),
+                ],
+                "figsize": (12, 6),
+            }))
+    return jobs
+
+
+# ----------------------------------------------------------------------
+# Synchronous entry points
+# ----------------------------------------------------------------------
 
 def visual_debug(
     df: pd.DataFrame,
@@ -12,6 +387,9 @@ def visual_debug(
     forecast_cols: list[str],
     output_path: str,
     residuals_df: pd.DataFrame | None = None,
+    max_series: int | None = 2,
+    policy: str = "first",
+    scores: pd.Series | None = None,
 ) -> None:
     """Generate a suite of diagnostic plots for a forecast run.
 
@@ -29,74 +407,31 @@ def visual_debug(
         Directory where plots will be written.
     residuals_df : pandas.DataFrame, optional
         Residuals for each model, used for drift diagnostics.
+    max_series : int, optional
+        Number of series with a forecast plot.
+    policy : str, optional
+        Series sampling policy, see :func:`sample_series`.
+    scores : pandas.Series, optional
+        Per-series scores for the ``"worst"`` policy.
 
     Returns
     -------
     None
     """
-
-    plots_dir = os.path.join(output_path, "plots")
-    os.makedirs(plots_dir, exist_ok=True)
-
-    forecast_dir = os.path.join(plots_dir, "forecasts")
-    forecastability_dir = os.path.join(plots_dir, "forecastability")
-    residuals_dir = os.path.join(plots_dir, "residuals")
-
-    os.makedirs(forecast_dir, exist_ok=True)
-    os.makedirs(forecastability_dir, exist_ok=True)
-    os.makedirs(residuals_dir, exist_ok=True)
-
-    # Forecasts
-    uid_sample = df["unique_id"].unique()[:2]
-    for uid in uid_sample:
-        df_plot = df[df["unique_id"] == uid]
-        plt.figure(figsize=(14, 6))
-        plt.plot(df_plot["ds"], df_plot["y"], label="Actual", marker="o")
-        for model in forecast_cols:
-            fcast = forecasts[forecasts["unique_id"] == uid][["ds", model]]
-            plt.plot(fcast["ds"], fcast[model], label=model, linestyle="--")
-        plt.title(f"Forecasts for {uid}")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(os.path.join(forecast_dir, f"{uid}_forecast.png"))
-        plt.close()
-
-    # Forecastability Scatter
-    fac_df = pd.DataFrame([forecastability])
-    plt.figure(figsize=(8, 6))
-    sns.scatterplot(data=fac_df, x="SpectralEntropy", y="CV2")
-    plt.title("Forecastability Scatter: Entropy vs CV²")
-    plt.tight_layout()
-    plt.savefig(os.path.join(forecastability_dir, "forecastability_scatter.png"))
-    plt.close()
-
-    # Residual Visuals
-    if residuals_df is not None:
-        for model in forecast_cols:
-            resids = residuals_df[[model, "ds"]].dropna().sort_values("ds")
-            plt.figure(figsize=(12, 4))
-            plt.plot(resids["ds"], resids[model], label="Residuals")
-            plt.axhline(0, linestyle="--", color="gray")
-            plt.title(f"Residual Time Series - {model}")
-            plt.tight_layout()
-            plt.savefig(os.path.join(residuals_dir, f"{model}_residuals.png"))
-            plt.close()
-
-            if len(resids) > 28:
-                recent = resids[model].iloc[-14:]
-                prior = resids[model].iloc[:-14]
-                plt.figure(figsize=(8, 4))
-                sns.histplot(prior, kde=True, label="Prior", color="blue", alpha=0.6)
-                sns.histplot(recent, kde=True, label="Recent", color="red", alpha=0.6)
-                plt.title(f"Residual Histogram Comparison - {model}")
-                plt.legend()
-                plt.tight_layout()
-                plt.savefig(os.path.join(residuals_dir, f"{model}_resid_hist.png"))
-                plt.close()
+    render_jobs(plan_visual_debug(
+        df, forecasts, forecastability, forecast_cols, output_path, residuals_df,
+        max_series=max_series, policy=policy, scores=scores,
+    ))
 
 
 def plot_residual_drift(
-    residuals_df: pd.DataFrame, model: str, output_path: str, window: int = 30
+    residuals_df: pd.DataFrame,
+    model: str,
+    output_path: str,
+    window: int = 30,
+    max_series: int | None = None,
+    policy: str = "first",
+    scores: pd.Series | None = None,
 ) -> None:
     """Plot residuals over time for a selected model.
 
@@ -110,25 +445,19 @@ def plot_residual_drift(
         Directory for saving the plot.
     window : int, optional
         Smoothing window for highlight (unused currently).
+    max_series : int, optional
+        Number of series plotted. ``None`` plots every series.
+    policy : str, optional
+        Series sampling policy, see :func:`sample_series`.
+    scores : pandas.Series, optional
+        Per-series scores for the ``"worst"`` policy.
 
     Returns
     -------
     None
     """
-    df_plot = residuals_df[["ds", "unique_id", model]].copy()
-    df_plot = df_plot.sort_values(["unique_id", "ds"])
+    render_jobs(plan_residual_drift(residuals_df, model, output_path, max_series, policy, scores))
 
-    os.makedirs(os.path.join(output_path, "drift"), exist_ok=True)
-
-    for uid in df_plot["unique_id"].unique():
-        series = df_plot[df_plot["unique_id"] == uid]
-        plt.figure(figsize=(14, 6))
-        plt.plot(series["ds"], series[model], label="Residuals", marker="o")
-        plt.axhline(0, color="black", linestyle="--", linewidth=0.8)
-        plt.title(f"Residuals Over Time - {uid}")
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_path, "drift", f"{uid}_residuals.png"))
-        plt.close()
 
 def plot_residual_histograms(
     residuals_df: pd.DataFrame, model: str, output_path: str, window: int = 30
@@ -150,20 +479,7 @@ def plot_residual_histograms(
     -------
     None
     """
-    residuals_df = residuals_df.sort_values("ds")
-    recent = residuals_df[model].iloc[-window:]
-    past = residuals_df[model].iloc[:-window]
-
-    plt.figure(figsize=(14, 6))
-    sns.histplot(past, label="Past", color="gray", kde=True)
-    sns.histplot(recent, label="Recent", color="orange", kde=True)
-    plt.legend()
-    plt.title(f"Residual Distribution Shift - {model}")
-    plt.tight_layout()
-    drift_dir = os.path.join(output_path, "drift")
-    os.makedirs(drift_dir, exist_ok=True)
-    plt.savefig(os.path.join(drift_dir, f"{model}_residual_histogram.png"))
-    plt.close()
+    render_jobs(plan_residual_histograms(residuals_df, model, output_path, window))
 
 
 def plot_forecast_deltas(
@@ -195,29 +511,6 @@ def plot_forecast_deltas(
     -------
     None
     """
-    delta_path = os.path.join(output_path, "plots", "delta_audit")
-    os.makedirs(delta_path, exist_ok=True)
-
-    sample_ids = true_df["unique_id"].unique()[:3]
-
-    for uid in sample_ids:
-        actual = true_df[true_df["unique_id"] == uid].sort_values("ds")
-        orig = original_forecasts[original_forecasts["unique_id"] == uid].sort_values("ds")
-        regen = regenerated_forecasts[regenerated_forecasts["unique_id"] == uid].sort_values("ds")
-
-        for model in forecast_cols:
-            if model not in orig.columns or model not in regen.columns:
-                continue
-
-            plt.figure(figsize=(12, 6))
-            plt.plot(actual["ds"], actual["y"], label="Actual", color="black", linewidth=1.5)
-            plt.plot(orig["ds"], orig[model], label="Original", linestyle="--", color="blue")
-            plt.plot(regen["ds"], regen[model], label="Regenerated", linestyle=":", color="red")
-            drift_val = drift_scores.get(model, 0.0)
-            plt.title(f"{uid} | {model} Drift: {drift_val:+.2%}")
-            plt.legend()
-            plt.tight_layout()
-            fname = f"{uid}_{model}_delta.png"
-            plt.savefig(os.path.join(delta_path, fname))
-            plt.close()
-
+    render_jobs(plan_forecast_deltas(
+        true_df, original_forecasts, regenerated_forecasts, drift_scores, forecast_cols, output_path
+    ))
@@ -7,4 +7,26 @@ forecast_input_schema = DataFrameSchema({
     "ds": Column(pa.DateTime),
     "unique_id": Column(pa.String),
     "y": Column(pa.Float, nullable=False),
-})
\ No newline at end of file
+})
+
+
+def panel_input_schema(categorical_ids: bool = False, y_float32: bool = False) -> DataFrameSchema:
+    """Return the input schema for the dtypes of ``compact_panel``.
+
+    Parameters
+    ----------
+    categorical_ids : bool, optional
+        Expect ``unique_id`` as a categorical instead of strings.
+    y_float32 : bool, optional
+        Expect ``y`` as ``float32`` instead of ``float64``.
+
+    Returns
+    -------
+    pandera.DataFrameSchema
+        Schema with the same columns as ``forecast_input_schema``.
+    """
+    return DataFrameSchema({
+        "ds": Column(pa.DateTime),
+        "unique_id": Column(pa.Category if categorical_ids else pa.String),
+        "y": Column(pa.Float32 if y_float32 else pa.Float64, nullable=False),
+    })
@@ -9,326 +9,804 @@ import shutil
 import io
 import json
 import argparse
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from tabulate import tabulate
-from statsforecast import StatsForecast
-from statsforecast.models import (
-    Naive, SeasonalNaive, RandomWalkWithDrift,
-    CrostonSBA, HoltWinters
-)
-from forecastkernel.utils.mlflow_utils import log_mlflow_metrics
 
-from forecastkernel.core.dm_test import compute_dm_test
+# statsforecast, MLflow, matplotlib, pandera, tabulate and SciPy are imported
+# where they are used so that --help, --regenerate and lightweight callers
+# (see forecastkernel.cli) do not pay for them at import time
 from forecastkernel.core.evaluation import evaluate_forecasts
-from forecastkernel.core.forecastability import compute_forecastability_metrics
-from forecastkernel.pipelines.visuals import visual_debug
+from forecastkernel.core.splits import holdout_split
+from forecastkernel.core.backtest import backtest_residuals, run_backtest_windows, score_backtest
+from forecastkernel.core.fingerprints import changed_series, series_fingerprints
 from forecastkernel.core.phase_handler import include_dm_test, include_drift_monitor, include_serve_hash
 from forecastkernel.core.hash_utils import generate_serve_hash
-from forecastkernel.core.decomposition import decompose_errors
+from forecastkernel.core.decomposition import decompose_errors, decompose_series_errors
 from forecastkernel.core.aggregation import compute_anchor_bias, enforce_cascade_checks
 from forecastkernel.utils.git_utils import get_git_commit_hash
 from forecastkernel.utils.hash_utils import compute_file_hash
 from forecastkernel.utils.ci_utils import validate_file_hashes
-from forecastkernel.core.drift import detect_residual_drift
-from forecastkernel.pipelines.visuals import plot_residual_drift, plot_residual_histograms
-from forecastkernel.schemas.input_schema import forecast_input_schema
-from forecastkernel.utils.logging_utils import setup_logger
-# ------------------------------
-# Ensure UTF-8 output
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-# ------------------------------
-# Argument Parsing
-# ------------------------------
-parser = argparse.ArgumentParser(description="Baseline StatsForecast Runner")
-parser.add_argument("--data", type=str, required=True, help="Path to input CSV file")
-parser.add_argument("--horizon", type=int, default=7, help="Forecast horizon")
-parser.add_argument("--output_dir", type=str, default="data/outputs/baseline", help="Root output directory")
-parser.add_argument("--tag", type=str, default=None, help="Optional run tag")
-parser.add_argument("--window_size", type=int, default=3, help="Window size (currently unused; placeholder for moving average models)")
-parser.add_argument("--season_length", type=int, default=12, help="Season length for seasonal models")
-parser.add_argument("--phase", type=int, default=3, help="Forecast-Kernel phase (default: 3)")
-parser.add_argument("--regenerate", action="store_true", help="Skip training and reload forecasts from file")
-parser.add_argument("--aggregation_level", type=str, default="L1", help="Aggregation label for this run")
-parser.add_argument("--parent_run", type=str, default=None, help="Path to upstream run for cascade")
-
-args = parser.parse_args()
-
-active_phase = args.phase
-# Enforce cascade checks if parent run provided
-if args.parent_run:
-    enforce_cascade_checks(args.parent_run)
-# ------------------------------
-# Setup Run Metadata
-# ------------------------------
-run_id = args.tag or "dvc-run"
-output_path = args.output_dir  # Do NOT embed timestamp for DVC stages
-os.makedirs(output_path, exist_ok=True)
-
-
-log_path = os.path.join(output_path, "forecast_run.log")
-log = setup_logger(log_path, logger_name="baseline")
-
-# ------------------------------
-# Load Dataset
-# ------------------------------
-log.info(f"Loading dataset from: {args.data}")
-input_hash = compute_file_hash(args.data)
-log.info(f"Input file hash: {input_hash}")
-df = pd.read_csv(args.data,  parse_dates=["ds"], dtype={"y": "float64"})
-forecast_input_schema.validate(df)
-df["ds"] = pd.to_datetime(df["ds"])
-df = df.sort_values(["unique_id", "ds"])
-
-h = args.horizon
-cutoff_df = (
-    df.groupby("unique_id", group_keys=False)
-      .apply(lambda g: g.sort_values("ds").iloc[:-h])
-      .reset_index(drop=True)
-)
-true_future = (
-    df.groupby("unique_id", group_keys=False)
-      .apply(lambda g: g.sort_values("ds").iloc[-h:].copy())
-      .reset_index(drop=True)
+from forecastkernel.utils.manifest import build_manifest
+from forecastkernel.utils.logging_utils import close_run_logger, setup_run_logger
+from forecastkernel.utils.forecast_cache import load_cached_forecasts, make_cache_key, store_forecasts
+from forecastkernel.utils.io_utils import (
+    artifact_path, find_artifact, read_frame, remove_stale_artifacts, write_frame
 )
-
-# ------------------------------
-# Model Setup (CI-Compliant)
-# ------------------------------
-models = [
-    Naive(),
-    SeasonalNaive(season_length=args.season_length),
-    RandomWalkWithDrift(),
-    CrostonSBA(),
-    HoltWinters(season_length=args.season_length)
-]
-
-forecast_file = os.path.join(output_path, "baseline_forecasts.csv")
-if args.regenerate and os.path.exists(forecast_file):
-    log.info("🔁 Regeneration mode: loading saved forecasts...")
-    forecasts = pd.read_csv(forecast_file)
-    forecasts["ds"] = pd.to_datetime(forecasts["ds"])
-else:
-    sf = StatsForecast(models=models, freq='D', n_jobs=-1)
-    forecasts = sf.forecast(df=cutoff_df, h=h)
-
-    log.info("Computing EnsembleNaive as average of Naive and SeasonalNaive forecasts...")
-    forecasts["ensemble_naive"] = (forecasts["Naive"] + forecasts["SeasonalNaive"]) / 2
-
-# ------------------------------
-# EnsembleNaive (manual logic)
-# ------------------------------
-log.info("Computing EnsembleNaive as average of Naive and SeasonalNaive forecasts...")
-naive_forecast = forecasts["Naive"]
-seasonal_forecast = forecasts["SeasonalNaive"]
-forecasts["ensemble_naive"] = (naive_forecast + seasonal_forecast) / 2
-
-# ------------------------------
-# Evaluation + Scoring
-# ------------------------------
-forecast_cols = [
-    col for col in forecasts.columns
-    if col not in ["unique_id", "ds", "run_id", "horizon", "n_models", "tag"]
-    and pd.api.types.is_numeric_dtype(forecasts[col])
-]
-
-results, residuals_df = evaluate_forecasts(forecasts, true_future, forecast_cols, output_path)
-log.info("\n" + tabulate(results, headers="keys", tablefmt="github"))
-
-
-# ------------------------------
-# Forecastability Metrics
-# ------------------------------
-forecastability = compute_forecastability_metrics(df)
-forecastability_path = os.path.join(output_path, "forecastability.json")
-with open(forecastability_path, "w") as f:
-    json.dump(forecastability, f, indent=2)
-log.info(f"🔍 Forecastability metadata saved to: {forecastability_path}")
-
-# ------------------------------
-# Compile and Save CI-Valid Metrics
-# ------------------------------
-if isinstance(results, list):
-    results = pd.DataFrame(results)
-
-metrics_dict = {
-    row["model"]: {
-        "MAE": round(row["mae"], 2),
-        "Bias": round(row["bias"], 2),
-        "Score": round(row["score"], 2)
-    } for _, row in results.iterrows()
-}
-
-
-ci_floor = min(metrics_dict["ensemble_naive"]["Score"], metrics_dict["HoltWinters"]["Score"])
-selected_model = min(metrics_dict.items(), key=lambda kv: kv[1]["Score"])[0]
-pass_ci = metrics_dict[selected_model]["Score"] <= ci_floor
-
-# ------------------------------
-# DM-Test (vs. ensemble_naive)
-# ------------------------------
-# dm_test_result = compute_dm_test(forecasts, true_future, selected_model, "ensemble_naive")
-# ------------------------------
-# Save Baseline Metrics 
-baseline_metrics = {
-    "series_id": df["unique_id"].iloc[0],
-    "horizon": h,
-    "timestamp": datetime.now().isoformat(),
-    "forecastability": forecastability,
-    "metrics": metrics_dict,
-    "ci_baseline_rule": "min(ensemble_naive, holt_winters)",
-    "selected_model": selected_model,
-    "pass_ci": pass_ci,
-    "metadata": {
-        "input_hash": input_hash,
-        "tag": "v0.1-baseline",
-        "phase": active_phase
+from forecastkernel.utils.dtypes import ID_DICTIONARY, compact_panel, save_id_dictionary
+from forecastkernel.utils.profiling import TIMINGS_FILE, annotate, profile_run, span
+
+
+# MLflow's active run is process-global, so concurrent runs (see
+# scripts.cascade) take turns logging
+_SERIAL_LOCK = threading.Lock()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser describing a baseline run configuration.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser whose parsed namespace is accepted by :func:`run_baseline`.
+    """
+    parser = argparse.ArgumentParser(description="Baseline StatsForecast Runner")
+    parser.add_argument("--data", type=str, required=True, help="Path to input CSV, Parquet or Feather file")
+    parser.add_argument("--horizon", type=int, default=7, help="Forecast horizon")
+    parser.add_argument("--output_dir", type=str, default="data/outputs/baseline", help="Root output directory")
+    parser.add_argument("--tag", type=str, default=None, help="Optional run tag")
+    parser.add_argument("--window_size", type=int, default=3, help="Window size (currently unused; placeholder for moving average models)")
+    parser.add_argument("--season_length", type=int, default=12, help="Season length for seasonal models")
+    parser.add_argument("--phase", type=int, default=3, help="Forecast-Kernel phase (default: 3)")
+    parser.add_argument("--regenerate", action="store_true", help="Skip training and reload forecasts from file")
+    parser.add_argument("--aggregation_level", type=str, default="L1", help="Aggregation label for this run")
+    parser.add_argument("--parent_run", type=str, default=None, help="Path to upstream run for cascade")
+    parser.add_argument("--parent_map", type=str, default=None, help="File mapping unique_id to the parent run's parent_id when the levels use different ids")
+    parser.add_argument("--n_jobs", type=int, default=-1, help="StatsForecast worker processes (-1 uses all cores)")
+    parser.add_argument("--cache_dir", type=str, default="data/cache/forecasts", help="Directory of the content-addressed forecast cache")
+    parser.add_argument("--cache_max_mb", type=int, default=1024, help="Size bound of the forecast cache in MB")
+    parser.add_argument("--no_cache", action="store_true", help="Always refit and never read or write the forecast cache")
+    parser.add_argument("--incremental", action="store_true", help="Refit only series whose data changed since the previous run")
+    parser.add_argument("--previous_run", type=str, default=None, help="Run directory to splice from in incremental mode (defaults to --output_dir)")
+    parser.add_argument("--cv_windows", type=int, default=0, help="Rolling-origin windows used for model selection (0 uses the single holdout)")
+    parser.add_argument("--cv_step", type=int, default=None, help="Step between backtest origins (defaults to the horizon)")
+    parser.add_argument("--cv_workers", type=int, default=1, help="Backtest windows evaluated concurrently in worker processes (1 runs them in-process, each fitted with --n_jobs)")
+    parser.add_argument("--drift_window", type=int, default=None, help="Recent residuals per series tested for drift (defaults to the horizon)")
+    parser.add_argument("--drift_windows", type=int, default=3, help="Rolling origins whose residuals the drift gate tests; more than --cv_windows adds backtest windows used only for drift")
+    parser.add_argument("--drift_alpha", type=float, default=0.05, help="False discovery rate of the per-series drift tests")
+    parser.add_argument("--drift_max_share", type=float, default=0.1, help="Share of drifted series tolerated by the CI gate")
+    parser.add_argument("--seasonal_lag", type=int, default=7, help="Lag of the residual differences behind the Seasonality Miss error component (7 for weekly patterns in daily data)")
+    parser.add_argument("--dm_loss", type=str, default="squared", choices=["squared", "absolute"], help="Loss used by the Diebold-Mariano tests")
+    parser.add_argument("--no_plots", action="store_true", help="Skip diagnostic plots")
+    parser.add_argument("--plot_workers", type=int, default=None, help="Processes rendering plots alongside the run (0 renders in-process at the end; defaults to the spare cores, at most 4)")
+    parser.add_argument("--plot_max_series", type=int, default=20, help="Largest number of series with per-series plots")
+    parser.add_argument("--plot_sampling", type=str, default="first", choices=["first", "random", "worst"], help="How plotted series are chosen")
+    parser.add_argument("--no_mlflow", action="store_true", help="Skip MLflow logging")
+    parser.add_argument("--hash_algorithm", type=str, default="sha256", choices=["sha256", "blake2b"], help="Digest recorded in audit_log.json")
+    parser.add_argument("--chunk_rows", type=int, default=None, help="Stream the input in chunks of whole series of about this many rows, bounding memory (input must be sorted by unique_id)")
+    parser.add_argument("--serve_dir", type=str, default=None, help="Compile the forecasts into a serving store below this directory (phase >= 2)")
+    parser.add_argument("--serve_activate", action="store_true", help="Make the compiled store the one served by default")
+    parser.add_argument("--no_compact_ids", action="store_true", help="Keep unique_id as Python strings instead of a categorical with a persisted dictionary")
+    parser.add_argument("--float32", action="store_true", help="Hold y as float32, halving its memory at the cost of precision")
+    parser.add_argument("--profile", action="store_true", help="Also write cProfile statistics of the run (timings.pstats, timings.txt)")
+    parser.add_argument("--output_format", type=str, default="csv", choices=["csv", "parquet", "feather"], help="Format of the forecast artifact")
+    return parser
+
+
+def make_config(data: str, **overrides) -> argparse.Namespace:
+    """Build a run configuration with parser defaults and ``overrides``.
+
+    Parameters
+    ----------
+    data : str
+        Path to the input dataset.
+    **overrides
+        Any other option accepted by :func:`build_parser`, e.g. ``horizon``.
+
+    Returns
+    -------
+    argparse.Namespace
+        Configuration suitable for :func:`run_baseline`.
+    """
+    config = build_parser().parse_args(["--data", data])
+    for key, value in overrides.items():
+        if not hasattr(config, key):
+            raise ValueError(f"Unknown baseline option: {key}")
+        setattr(config, key, value)
+    return config
+
+
+def build_models(season_length: int) -> list:
+    """Return the CI-compliant baseline StatsForecast models.
+
+    Parameters
+    ----------
+    season_length : int
+        Season length of the seasonal models.
+
+    Returns
+    -------
+    list
+        Naive, SeasonalNaive, RandomWalkWithDrift, CrostonSBA and HoltWinters
+        instances.
+    """
+    from statsforecast.models import CrostonSBA, HoltWinters, Naive, RandomWalkWithDrift, SeasonalNaive
+
+    return [
+        Naive(),
+        SeasonalNaive(season_length=season_length),
+        RandomWalkWithDrift(),
+        CrostonSBA(),
+        HoltWinters(season_length=season_length)
+    ]
+
+
+def summarize_results(results: pd.DataFrame) -> tuple[dict, str, bool]:
+    """Round model metrics and apply the CI baseline rule.
+
+    Parameters
+    ----------
+    results : pandas.DataFrame
+        Metrics table with ``model``, ``mae``, ``bias`` and ``score`` columns.
+
+    Returns
+    -------
+    tuple[dict, str, bool]
+        Mapping of model to rounded ``MAE``/``Bias``/``Score``, the selected
+        model and whether it beats ``min(ensemble_naive, HoltWinters)``.
+    """
+    if isinstance(results, list):
+        results = pd.DataFrame(results)
+
+    metrics_dict = {
+        row["model"]: {
+            "MAE": round(float(row["mae"]), 2),
+            "Bias": round(float(row["bias"]), 2),
+            "Score": round(float(row["score"]), 2)
+        } for _, row in results.iterrows()
     }
-}
-baseline_metrics["metadata"]["aggregation_level"] = args.aggregation_level
-
-if include_dm_test(active_phase):
-    dm_test_result = compute_dm_test(forecasts, true_future, selected_model, "ensemble_naive")
-    baseline_metrics["dm_test"] = dm_test_result
-
-# ------------------------------
-# Residual Drift Monitoring
-# ------------------------------
-if include_drift_monitor(active_phase):
-    drift_info = detect_residual_drift(residuals_df, selected_model)
-    baseline_metrics["drift_monitor"] = {
-        "last_trained": datetime.now().strftime("%Y-%m-%d"),
-        **drift_info
+
+    ci_floor = min(metrics_dict["ensemble_naive"]["Score"], metrics_dict["HoltWinters"]["Score"])
+    selected_model = min(metrics_dict.items(), key=lambda kv: kv[1]["Score"])[0]
+    pass_ci = bool(metrics_dict[selected_model]["Score"] <= ci_floor)
+    return metrics_dict, selected_model, pass_ci
+
+
+def forecast_changed_series(
+    config: argparse.Namespace,
+    models: list,
+    cutoff_df: pd.DataFrame,
+    h: int,
+    fingerprints: pd.DataFrame,
+    model_key: str,
+    log,
+) -> pd.DataFrame:
+    """Fit StatsForecast, refitting only changed series in incremental mode.
+
+    Without ``--incremental``, or when the previous run is missing or used a
+    different model configuration, every series is fitted. Otherwise series
+    whose ``(ds, y)`` fingerprint is unchanged keep their previous forecasts
+    and only new or modified series are refitted.
+
+    Parameters
+    ----------
+    config : argparse.Namespace
+        Run options.
+    models : list
+        StatsForecast model instances.
+    cutoff_df : pandas.DataFrame
+        Training data for all series.
+    h : int
+        Forecast horizon.
+    fingerprints : pandas.DataFrame
+        Output of :func:`series_fingerprints` for the current input.
+    model_key : str
+        Digest of the model configuration, see :func:`make_cache_key`.
+    log : logging.Logger
+        Run logger.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Forecasts for every series sorted by ``unique_id`` and ``ds``.
+    """
+    from statsforecast import StatsForecast
+
+    sf = StatsForecast(models=models, freq='D', n_jobs=config.n_jobs)
+    if not config.incremental:
+        return sf.forecast(df=cutoff_df, h=h)
+
+    previous_dir = config.previous_run or config.output_dir
+    previous_fingerprints = os.path.join(previous_dir, "series_fingerprints.parquet")
+    previous_info = os.path.join(previous_dir, "run_info.json")
+    previous_forecasts = find_artifact(previous_dir, "baseline_forecasts")
+    if not (os.path.exists(previous_fingerprints) and os.path.exists(previous_info) and previous_forecasts):
+        log.info("Incremental mode: no previous run state found, fitting all series.")
+        return sf.forecast(df=cutoff_df, h=h)
+
+    with open(previous_info) as f:
+        if json.load(f).get("model_key") != model_key:
+            log.info("Incremental mode: model configuration changed, fitting all series.")
+            return sf.forecast(df=cutoff_df, h=h)
+
+    changed, _ = changed_series(pd.read_parquet(previous_fingerprints), fingerprints)
+    log.info(f"♻️ Incremental mode: refitting {len(changed)} of {len(fingerprints)} series")
+
+    reused = read_frame(
+        previous_forecasts,
+        columns=["unique_id", "ds", *[repr(m) for m in models]],
+        unique_ids=np.setdiff1d(fingerprints["unique_id"].to_numpy(), changed),
+    )
+    parts = [reused]
+    if len(changed):
+        parts.append(sf.forecast(df=cutoff_df[cutoff_df["unique_id"].isin(changed)], h=h))
+    forecasts = pd.concat(parts, ignore_index=True)
+    return forecasts.sort_values(["unique_id", "ds"], kind="stable").reset_index(drop=True)
+
+
+def run_baseline(
+    config: argparse.Namespace,
+    data: pd.DataFrame | None = None,
+    anchor_forecasts: pd.DataFrame | None = None,
+) -> tuple[dict, pd.DataFrame]:
+    """Fit the baseline models, score them and write all run artifacts.
+
+    Diagnostic plots are rendered by a process pool while the run continues
+    and are complete when this function returns. Stage timings are written
+    to ``timings.json`` in the output directory, also when the run fails,
+    and logged to MLflow with the run's metrics.
+
+    Parameters
+    ----------
+    config : argparse.Namespace
+        Run options as produced by :func:`build_parser` or :func:`make_config`.
+    data : pandas.DataFrame, optional
+        Already loaded contents of ``config.data``. The frame is not modified.
+    anchor_forecasts : pandas.DataFrame, optional
+        Already loaded forecasts of ``config.parent_run``.
+
+    Returns
+    -------
+    tuple[dict, pandas.DataFrame]
+        The ``baseline_metrics.json`` payload and the saved forecasts. With
+        ``config.chunk_rows`` the forecasts are only written to disk and
+        ``None`` is returned in their place.
+
+    Raises
+    ------
+    ValueError
+        If residual drift trips the CI gate or cascade checks fail.
+    """
+    if config.chunk_rows and (data is not None or anchor_forecasts is not None):
+        raise ValueError("Chunked runs stream config.data and cannot take loaded frames.")
+
+    timings_path = os.path.join(config.output_dir, TIMINGS_FILE)
+    with profile_run("baseline_sf", timings_path, cprofile=config.profile) as profile:
+        if config.chunk_rows:
+            from forecastkernel.pipelines.chunked import run_chunked_baseline
+
+            result = run_chunked_baseline(config), None
+        else:
+            result = _run_in_memory(config, data, anchor_forecasts)
+
+    mlflow_run_id = profile["metadata"].get("mlflow_run_id")
+    if mlflow_run_id is not None:
+        from forecastkernel.utils.mlflow_utils import log_mlflow_timings
+
+        with _SERIAL_LOCK:
+            log_mlflow_timings(mlflow_run_id, profile["result"], timings_path)
+    return result
+
+
+def _run_in_memory(
+    config: argparse.Namespace,
+    data: pd.DataFrame | None,
+    anchor_forecasts: pd.DataFrame | None,
+) -> tuple[dict, pd.DataFrame]:
+    plot_workers = config.plot_workers
+    if plot_workers is None:
+        plot_workers = min(4, (os.cpu_count() or 1) - 1)
+    plot_pool = None
+    if not config.no_plots and plot_workers > 0:
+        from forecastkernel.pipelines.visuals import start_renderer
+
+        with span("start_renderer"):
+            plot_pool = start_renderer(plot_workers)
+    try:
+        return _run_baseline(config, data, anchor_forecasts, plot_pool)
+    finally:
+        if plot_pool is not None:
+            with span("stop_renderer"):
+                plot_pool.shutdown(cancel_futures=True)
+
+
+def _run_baseline(
+    config: argparse.Namespace,
+    data: pd.DataFrame | None,
+    anchor_forecasts: pd.DataFrame | None,
+    plot_pool,
+) -> tuple[dict, pd.DataFrame]:
+    with span("setup"):
+        from tabulate import tabulate
+
+        from forecastkernel.core.forecastability import (
+            compute_forecastability_metrics, profile_forecastability, summarize_forecastability
+        )
+        from forecastkernel.schemas.input_schema import panel_input_schema
+
+        # Enforce cascade checks if parent run provided
+        if config.parent_run:
+            enforce_cascade_checks(config.parent_run)
+    active_phase = config.phase
+    # ------------------------------
+    # Setup Run Metadata
+    # ------------------------------
+    run_id = config.tag or "dvc-run"
+    output_path = config.output_dir  # Do NOT embed timestamp for DVC stages
+    os.makedirs(output_path, exist_ok=True)
+
+
+    log = setup_run_logger(os.path.join(output_path, "forecast_run.log"), logger_name="baseline")
+
+    # ------------------------------
+    # Load Dataset
+    # ------------------------------
+    log.info(f"Loading dataset from: {config.data}")
+    compact = not config.no_compact_ids
+    with span("load") as stage:
+        input_hash = compute_file_hash(config.data)
+        log.info(f"Input file hash: {input_hash}")
+        if data is None:
+            df = read_frame(config.data, categorical_ids=compact)
+        else:
+            df = data.copy(deep=False)
+        stage["rows"] = len(df)
+    with span("validate", rows=len(df)):
+        if compact:
+            df = compact_panel(df, y_float32=config.float32)
+            save_id_dictionary(df["unique_id"].cat.categories, os.path.join(output_path, ID_DICTIONARY))
+        elif "y" in df.columns:
+            df["y"] = df["y"].astype("float32" if config.float32 else "float64")
+        panel_input_schema(compact, config.float32).validate(df)
+    h = config.horizon
+    with span("split", rows=len(df)):
+        df = df.sort_values(["unique_id", "ds"])
+        train_idx, holdout_idx = holdout_split(df, h)
+        cutoff_df = df.take(train_idx).reset_index(drop=True)
+        true_future = df.take(holdout_idx).reset_index(drop=True)
+
+    # ------------------------------
+    # Model Setup (CI-Compliant)
+    # ------------------------------
+    models = build_models(config.season_length)
+
+    with span("fingerprints", rows=len(df)):
+        fingerprints = series_fingerprints(df)
+    # Float32 and float64 fits differ, so neither the cache nor the
+    # incremental splice may mix them
+    y_dtype = str(df["y"].dtype)
+    model_key = make_cache_key("", models, h, config.season_length, freq='D', dtype=y_dtype)
+
+    with span("fit", rows=len(cutoff_df)):
+        forecast_file = find_artifact(output_path, "baseline_forecasts")
+        if config.regenerate and forecast_file is not None:
+            log.info("🔁 Regeneration mode: loading saved forecasts...")
+            forecasts = read_frame(forecast_file)
+        else:
+            cache_key = make_cache_key(input_hash, models, h, config.season_length, freq='D', dtype=y_dtype)
+            forecasts = None
+            if not config.no_cache:
+                forecasts = load_cached_forecasts(config.cache_dir, cache_key)
+            if forecasts is not None:
+                log.info(f"⚡ Forecast cache hit: {cache_key[:12]}")
+            else:
+                forecasts = forecast_changed_series(
+                    config, models, cutoff_df, h, fingerprints, model_key, log
+                )
+                if not config.no_cache:
+                    store_forecasts(
+                        config.cache_dir, cache_key, forecasts,
+                        max_bytes=config.cache_max_mb * 1024 * 1024
+                    )
+                    log.info(f"💾 Forecasts cached under: {cache_key[:12]}")
+
+            log.info("Computing EnsembleNaive as average of Naive and SeasonalNaive forecasts...")
+            forecasts["ensemble_naive"] = (forecasts["Naive"] + forecasts["SeasonalNaive"]) / 2
+
+    # ------------------------------
+    # EnsembleNaive (manual logic)
+    # ------------------------------
+    with span("evaluate", rows=len(forecasts)):
+        log.info("Computing EnsembleNaive as average of Naive and SeasonalNaive forecasts...")
+        naive_forecast = forecasts["Naive"]
+        seasonal_forecast = forecasts["SeasonalNaive"]
+        forecasts["ensemble_naive"] = (naive_forecast + seasonal_forecast) / 2
+
+        # ------------------------------
+        # Evaluation + Scoring
+        # ------------------------------
+        forecast_cols = [
+            col for col in forecasts.columns
+            if col not in ["unique_id", "ds", "run_id", "horizon", "n_models", "tag"]
+            and pd.api.types.is_numeric_dtype(forecasts[col])
+        ]
+
+        results, residuals_df, series_metrics = evaluate_forecasts(
+            forecasts, true_future, forecast_cols, output_path, per_series=True
+        )
+        log.info("\n" + tabulate(results, headers="keys", tablefmt="github"))
+
+        series_metrics_path = os.path.join(output_path, "per_series_metrics.parquet")
+        series_metrics.to_parquet(series_metrics_path, index=False)
+        log.info(f"📊 Per-series metrics saved to: {series_metrics_path}")
+
+
+    # ------------------------------
+    # Forecastability Metrics
+    # ------------------------------
+    with span("forecastability", rows=len(df)):
+        profile = profile_forecastability(df)
+        profile_path = os.path.join(output_path, "forecastability_profile.parquet")
+        profile.to_parquet(profile_path, index=False)
+        log.info(f"🔍 Forecastability profile saved to: {profile_path}")
+
+        if len(profile) == 1:
+            forecastability = compute_forecastability_metrics(df)
+        else:
+            forecastability = summarize_forecastability(profile)
+        forecastability_path = os.path.join(output_path, "forecastability.json")
+        with open(forecastability_path, "w") as f:
+            json.dump(forecastability, f, indent=2)
+        log.info(f"🔍 Forecastability metadata saved to: {forecastability_path}")
+
+    # ------------------------------
+    # Visual Debug (rendered alongside the rest of the run)
+    # ------------------------------
+    plot_jobs = []
+    if not config.no_plots:
+        with span("plot_planning"):
+            from forecastkernel.pipelines.visuals import (
+                dispatch_jobs, plan_residual_drift, plan_residual_histograms, plan_visual_debug,
+                render_jobs, wait_for_jobs,
+            )
+
+            scores = None
+            if config.plot_sampling == "worst":
+                scores = series_metrics.groupby("unique_id")["score"].mean()
+            debug_jobs = plan_visual_debug(
+                df, forecasts, forecastability, forecast_cols, output_path, residuals_df,
+                max_series=config.plot_max_series, policy=config.plot_sampling, scores=scores,
+            )
+            plot_jobs += dispatch_jobs(debug_jobs, plot_pool) if plot_pool else debug_jobs
+
+    # ------------------------------
+    # Rolling-Origin Backtest
+    # ------------------------------
+    backtest_info = None
+    window_residuals = residuals_df
+    drift_residuals = residuals_df
+    # The holdout alone gives every series exactly h residuals, leaving the
+    # drift test no earlier residuals to compare with and the seasonal error
+    # component no lag to span, so phase >= 2 backtests --drift_windows
+    # origins even when selection uses the holdout. Origins beyond
+    # --cv_windows are skipped when the history before them cannot be fitted.
+    n_windows = config.cv_windows
+    if include_drift_monitor(active_phase):
+        n_windows = max(n_windows, config.drift_windows)
+    if n_windows > 0:
+        with span("backtest", rows=len(df)):
+            log.info(f"Backtesting {n_windows} rolling origins...")
+            backtest_dir = os.path.join(output_path, "backtest")
+            window_paths = run_backtest_windows(
+                df, models, h, n_windows, backtest_dir,
+                step_size=config.cv_step, freq='D', max_workers=config.cv_workers,
+                # Concurrent windows each get one core
+                n_jobs=config.n_jobs if config.cv_workers == 1 else 1,
+                required_windows=config.cv_windows,
+            )
+            if len(window_paths) < n_windows:
+                log.warning(
+                    f"⚠️ Skipped {n_windows - len(window_paths)} of {n_windows} backtest origins "
+                    "whose history is too short to fit every model."
+                )
+            if window_paths:
+                window_residuals = backtest_residuals(window_paths, forecast_cols)
+                if include_drift_monitor(active_phase):
+                    drift_residuals = backtest_residuals(window_paths, forecast_cols, center=True)
+    if config.cv_windows > 0:
+        with span("backtest_scoring"):
+            # Windows are ordered by origin; selection uses the latest ones
+            selection_paths = window_paths[-config.cv_windows:]
+            results, window_metrics = score_backtest(
+                selection_paths, forecast_cols,
+                series_metrics_path=os.path.join(backtest_dir, "series_window_metrics.parquet")
+            )
+            window_metrics.to_parquet(os.path.join(backtest_dir, "window_metrics.parquet"), index=False)
+            log.info("\n" + tabulate(results, headers="keys", tablefmt="github"))
+            backtest_info = {
+                "n_windows": config.cv_windows,
+                "step_size": config.cv_step or h,
+                "metrics_source": "pooled rolling-origin windows",
+            }
+
+    # ------------------------------
+    # Compile and Save CI-Valid Metrics
+    # ------------------------------
+    metrics_dict, selected_model, pass_ci = summarize_results(results)
+
+    # ------------------------------
+    # Save Baseline Metrics 
+    baseline_metrics = {
+        "series_id": df["unique_id"].iloc[0],
+        "horizon": h,
+        "timestamp": datetime.now().isoformat(),
+        "forecastability": forecastability,
+        "metrics": metrics_dict,
+        "ci_baseline_rule": "min(ensemble_naive, holt_winters)",
+        "selected_model": selected_model,
+        "pass_ci": pass_ci,
+        "metadata": {
+            "input_hash": input_hash,
+            "tag": "v0.1-baseline",
+            "phase": active_phase
+        }
     }
+    baseline_metrics["metadata"]["aggregation_level"] = config.aggregation_level
+    if backtest_info is not None:
+        baseline_metrics["backtest"] = backtest_info
+
+    # ------------------------------
+    # DM-Tests (all model pairs, per series)
+    # ------------------------------
+    if include_dm_test(active_phase):
+        with span("dm_test", rows=len(window_residuals)):
+            from forecastkernel.core.dm_test import dm_pair_result, panel_dm_test, summarize_dm_tests
 
-    plot_residual_drift(residuals_df, selected_model, output_path, window=30)
-    plot_residual_histograms(residuals_df, selected_model, output_path, window=30)
+            # Residuals are h-step errors; several windows per series leave
+            # enough of them for the horizon-h correction
+            dm_table = panel_dm_test(window_residuals, forecast_cols, loss=config.dm_loss, h=h)
+            dm_table.to_parquet(os.path.join(output_path, "dm_tests.parquet"), index=False)
+            dm_summary = summarize_dm_tests(dm_table)
+            baseline_metrics["dm_test"] = dm_pair_result(dm_summary, selected_model, "ensemble_naive")
 
     # ------------------------------
-    # CI Enforcement (Drift Trigger)
+    # Residual Drift Monitoring
     # ------------------------------
-    if active_phase >= 2 and drift_info.get("drift_detected", False):
-        raise ValueError("❌ Drift detected. CI gate failed. Retraining required.")
-
-# ------------------------------
-bias_value = None
-if args.parent_run:
-    anchor_forecasts = pd.read_csv(os.path.join(args.parent_run, "baseline_forecasts.csv"))
-    anchor_forecasts["ds"] = pd.to_datetime(anchor_forecasts["ds"])
-    bias_series = compute_anchor_bias(forecasts, anchor_forecasts, selected_model)
-    bias_value = round(float(bias_series.mean()), 4)
-    baseline_metrics["anchor_bias"] = bias_value
-
-if active_phase >= 2:
-    log.info("Decomposing residuals for error analysis...")
-    error_breakdown = decompose_errors(residuals_df, forecast_cols)
-    if bias_value is not None:
-        error_breakdown.setdefault(selected_model, {})["Anchor Bias"] = bias_value
-    with open(os.path.join(output_path, "error_breakdown.json"), "w") as f:
-        json.dump(error_breakdown, f, indent=2)
-    log.info("🧠 Error decomposition saved to error_breakdown.json")
-
-if include_serve_hash(active_phase):
-    serve_hash = generate_serve_hash(baseline_metrics)
-    baseline_metrics["metadata"]["serve_hash"] = serve_hash
-
-# ------------------------------
-# Save Baseline Metrics
-# ------------------------------
-
-baseline_metrics["metadata"]["commit_hash"] = get_git_commit_hash()
-
-
-metrics_path = os.path.join(output_path, "baseline_metrics.json")
-with open(metrics_path, "w") as f:
-    json.dump(baseline_metrics, f, indent=2)
-log.info(f"✅ Metrics saved to: {metrics_path}")
-
-log_mlflow_metrics(
-    run_id=run_id,
-    df=df,
-    h=h,
-    metrics_dict=metrics_dict,
-    selected_model=selected_model,
-    pass_ci=pass_ci,
-    output_path=output_path,
-    phase=active_phase
-)
-# ------------------------------
-# Save Forecasts
-# ------------------------------
-forecasts["run_id"] = run_id
-forecasts["horizon"] = h
-forecasts["n_models"] = len(models)
-forecast_file = os.path.join(output_path, "baseline_forecasts.csv")
-ordered_cols = ["run_id", "horizon", "n_models", "unique_id", "ds"] + forecast_cols
-forecasts = forecasts[ordered_cols]
-forecasts.to_csv(forecast_file, index=False)
-log.info(f"📄 Forecasts saved to: {forecast_file}")
-
-# ------------------------------
-# Save Run Info
-# ------------------------------
-info = {
-    "run_id": run_id,
-    "horizon": h,
-    "n_models": len(models),
-    "input_file": args.data,
-    "timestamp": datetime.now().isoformat()
-}
-with open(os.path.join(output_path, "run_info.json"), "w") as f:
-    json.dump(info, f, indent=2)
-log.info(f"🧾 Metadata saved to: {output_path}/run_info.json")
-
-# ------------------------------
-# Visual Debug
-# ------------------------------
-visual_debug(df, forecasts, forecastability, forecast_cols, output_path, residuals_df)
-log.info(f"✅ Run completed successfully. Outputs saved to: {output_path}")
-log.info(f"🔍 Visualizations saved to: {os.path.join(output_path, 'plots')}")
-
-
-
-audit_log = {
-    "run_id": run_id,
-    "timestamp": datetime.utcnow().isoformat(),
-    "files": {
-        "baseline_metrics.json": compute_file_hash(metrics_path),
-        "baseline_forecasts.csv": compute_file_hash(forecast_file),
-        "run_info.json": compute_file_hash(os.path.join(output_path, "run_info.json"))
+    if include_drift_monitor(active_phase):
+        with span("drift", rows=len(drift_residuals)):
+            from forecastkernel.core.drift import detect_panel_drift, summarize_panel_drift
+
+            # Each series' latest window is tested against its own earlier
+            # out-of-sample residuals from the backtest windows. Residuals are
+            # centred per origin, so the test compares error distributions
+            # rather than the level each origin happened to start from.
+            drift_window = config.drift_window or h
+            drift_table = detect_panel_drift(
+                drift_residuals, forecast_cols,
+                window_size=drift_window, alpha=config.drift_alpha
+            )
+            drift_table_path = os.path.join(output_path, "drift_table.parquet")
+            drift_table.to_parquet(drift_table_path, index=False)
+            log.info(f"📈 Per-series drift table saved to: {drift_table_path}")
+            drift_info = summarize_panel_drift(drift_table, selected_model, config.drift_max_share)
+            if drift_info["inconclusive"]:
+                log.warning(
+                    f"⚠️ No series has {drift_window} residuals before its latest {drift_window}; "
+                    "the drift gate is inconclusive. Raise --drift_windows or lower --drift_window."
+                )
+        baseline_metrics["drift_monitor"] = {
+            "last_trained": datetime.now().strftime("%Y-%m-%d"),
+            **drift_info
+        }
+
+        if not config.no_plots:
+            scores = None
+            if config.plot_sampling == "worst":
+                selected = series_metrics[series_metrics["model"] == selected_model]
+                scores = selected.set_index("unique_id")["score"]
+            drift_jobs = plan_residual_drift(
+                residuals_df, selected_model, output_path,
+                max_series=config.plot_max_series, policy=config.plot_sampling, scores=scores,
+            ) + plan_residual_histograms(residuals_df, selected_model, output_path, window=30)
+            plot_jobs += dispatch_jobs(drift_jobs, plot_pool) if plot_pool else drift_jobs
+
+        # ------------------------------
+        # CI Enforcement (Drift Trigger)
+        # ------------------------------
+        if active_phase >= 2 and drift_info.get("drift_detected", False):
+            raise ValueError("❌ Drift detected. CI gate failed. Retraining required.")
+
+    # ------------------------------
+    bias_value = None
+    if config.parent_run:
+        with span("anchor_bias", rows=len(forecasts)):
+            mapping = None
+            anchor_ids = forecasts["unique_id"].unique()
+            if config.parent_map:
+                links = read_frame(config.parent_map, columns=["unique_id", "parent_id"])
+                mapping = pd.Series(links["parent_id"].to_numpy(), index=links["unique_id"].to_numpy())
+                anchor_ids = mapping.reindex(anchor_ids).dropna().unique()
+            if anchor_forecasts is None:
+                anchor_forecasts = read_frame(
+                    find_artifact(config.parent_run, "baseline_forecasts"),
+                    columns=["unique_id", "ds", selected_model],
+                    unique_ids=anchor_ids,
+                )
+            else:
+                anchor_forecasts = anchor_forecasts[anchor_forecasts["unique_id"].isin(anchor_ids)]
+            bias_series = compute_anchor_bias(forecasts, anchor_forecasts, selected_model, mapping)
+        bias_value = round(float(bias_series.mean()), 4)
+        baseline_metrics["anchor_bias"] = bias_value
+
+    if active_phase >= 2:
+        with span("decompose", rows=len(window_residuals)):
+            log.info("Decomposing residuals for error analysis...")
+            error_breakdown = decompose_errors(window_residuals, forecast_cols, config.seasonal_lag)
+            series_errors = decompose_series_errors(window_residuals, forecast_cols, config.seasonal_lag)
+            series_errors.to_parquet(os.path.join(output_path, "error_decomposition.parquet"), index=False)
+            n_short = series_errors.loc[series_errors["seasonality_miss"].isna(), "unique_id"].nunique()
+            if n_short:
+                log.warning(
+                    f"⚠️ {n_short} series have no more than --seasonal_lag {config.seasonal_lag} "
+                    "residuals and are left out of Seasonality Miss."
+                )
+        if bias_value is not None:
+            error_breakdown.setdefault(selected_model, {})["Anchor Bias"] = bias_value
+        with open(os.path.join(output_path, "error_breakdown.json"), "w") as f:
+            json.dump(error_breakdown, f, indent=2)
+        log.info("🧠 Error decomposition saved to error_breakdown.json")
+
+    if include_serve_hash(active_phase):
+        serve_hash = generate_serve_hash(baseline_metrics)
+        baseline_metrics["metadata"]["serve_hash"] = serve_hash
+
+    # ------------------------------
+    # Save Baseline Metrics
+    # ------------------------------
+
+    baseline_metrics["metadata"]["commit_hash"] = get_git_commit_hash()
+
+
+    with span("write_metrics"):
+        metrics_path = os.path.join(output_path, "baseline_metrics.json")
+        with open(metrics_path, "w") as f:
+            json.dump(baseline_metrics, f, indent=2)
+        log.info(f"✅ Metrics saved to: {metrics_path}")
+
+    if not config.no_mlflow:
+        with span("mlflow"):
+            from forecastkernel.utils.mlflow_utils import log_mlflow_metrics
+
+            with _SERIAL_LOCK:
+                mlflow_run_id = log_mlflow_metrics(
+                    run_id=run_id,
+                    df=df,
+                    h=h,
+                    metrics_dict=metrics_dict,
+                    selected_model=selected_model,
+                    pass_ci=pass_ci,
+                    output_path=output_path,
+                    phase=active_phase
+                )
+            annotate(mlflow_run_id=mlflow_run_id)
+    # ------------------------------
+    # Save Forecasts
+    # ------------------------------
+    with span("write_forecasts", rows=len(forecasts)):
+        forecasts["run_id"] = run_id
+        forecasts["horizon"] = h
+        forecasts["n_models"] = len(models)
+        forecast_file = artifact_path(output_path, "baseline_forecasts", config.output_format)
+        ordered_cols = ["run_id", "horizon", "n_models", "unique_id", "ds"] + forecast_cols
+        forecasts = forecasts[ordered_cols]
+        remove_stale_artifacts(output_path, "baseline_forecasts", config.output_format)
+        write_frame(forecasts, forecast_file)
+        log.info(f"📄 Forecasts saved to: {forecast_file}")
+
+    serve_hash = baseline_metrics["metadata"].get("serve_hash")
+    if config.serve_dir and serve_hash:
+        from forecastkernel.utils.forecast_store import activate_store, compile_forecast_store
+
+        with span("serve_store", rows=len(forecasts)):
+            store_path = compile_forecast_store(
+                forecasts, config.serve_dir, serve_hash, forecast_cols,
+                metadata={"run_id": run_id, "selected_model": selected_model, "horizon": h},
+            )
+            if config.serve_activate:
+                activate_store(config.serve_dir, serve_hash)
+        log.info(f"📡 Forecast store saved to: {store_path}")
+
+    # ------------------------------
+    # Save Run Info
+    # ------------------------------
+    info = {
+        "run_id": run_id,
+        "horizon": h,
+        "n_models": len(models),
+        "input_file": config.data,
+        "model_key": model_key,
+        "timestamp": datetime.now().isoformat()
     }
-}
+    with open(os.path.join(output_path, "run_info.json"), "w") as f:
+        json.dump(info, f, indent=2)
+    fingerprints.to_parquet(os.path.join(output_path, "series_fingerprints.parquet"), index=False)
+    log.info(f"🧾 Metadata saved to: {output_path}/run_info.json")
+
+    log.info(f"✅ Run completed successfully. Outputs saved to: {output_path}")
+
+
+
+    with span("audit"):
+        audit_log = {
+            "run_id": run_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            **build_manifest(
+                output_path,
+                ["baseline_metrics.json", os.path.basename(forecast_file), "run_info.json", "per_series_metrics.parquet"],
+                algorithm=config.hash_algorithm,
+            ),
+        }
+
+        with open(os.path.join(output_path, "audit_log.json"), "w") as f:
+            json.dump(audit_log, f, indent=2)
+
+
+
+    log.info("🔐 Audit log with file hashes saved.")
+    log.info("Baseline StatsForecast run completed successfully.")
+    # ------------------------------
+
+    # ------------------------------
+    # CI Hash Validation (Phase 3 Final Check)
+    # ------------------------------
+
+
+    with span("validate_hashes"):
+        audit_log_path = os.path.join(output_path, "audit_log.json")
+        hash_mismatches = validate_file_hashes(audit_log_path, output_path)
+
+    if hash_mismatches:
+        log.warning(f"⚠️ CI Hash Mismatch Detected:\n{json.dumps(hash_mismatches, indent=2)}")
+    else:
+        log.info("✅ CI Hash Validation Passed")
 
-with open(os.path.join(output_path, "audit_log.json"), "w") as f:
-    json.dump(audit_log, f, indent=2)
+    # # 🔁 Sync final outputs to static DVC-tracked location
+    # static_output_dir = "data/outputs/baseline"
+    # os.makedirs(static_output_dir, exist_ok=True)
 
+    # for name in ["baseline_metrics.json", "baseline_forecasts.csv", "run_info.json", "audit_log.json"]:
+    #     src = os.path.join(output_path, name)
+    #     dst = os.path.join(static_output_dir, name)
+    #     if os.path.exists(src):
+    #         shutil.copy2(src, dst)
+    # log.info("📁 Final outputs synced to DVC-tracked static location.")
 
+    if not config.no_plots:
+        with span("plots"):
+            n_plots = wait_for_jobs(plot_jobs) if plot_pool else render_jobs(plot_jobs)
+        log.info(f"🔍 {n_plots} visualizations saved to: {os.path.join(output_path, 'plots')}")
 
-log.info("🔐 Audit log with file hashes saved.")
-log.info("Baseline StatsForecast run completed successfully.")
-# ------------------------------
+    close_run_logger(log)
+    return baseline_metrics, forecasts
 
-# ------------------------------
-# CI Hash Validation (Phase 3 Final Check)
-# ------------------------------
 
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for the ``baseline_sf`` command.
 
-audit_log_path = os.path.join(output_path, "audit_log.json")
-hash_mismatches = validate_file_hashes(audit_log_path, output_path)
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments. Defaults to ``sys.argv[1:]``.
 
-if hash_mismatches:
-    log.warning(f"⚠️ CI Hash Mismatch Detected:\n{json.dumps(hash_mismatches, indent=2)}")
-else:
-    log.info("✅ CI Hash Validation Passed")
+    Returns
+    -------
+    None
+    """
+    # Ensure UTF-8 output
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    run_baseline(build_parser().parse_args(argv))
 
-# # 🔁 Sync final outputs to static DVC-tracked location
-# static_output_dir = "data/outputs/baseline"
-# os.makedirs(static_output_dir, exist_ok=True)
 
-# for name in ["baseline_metrics.json", "baseline_forecasts.csv", "run_info.json", "audit_log.json"]:
-#     src = os.path.join(output_path, name)
-#     dst = os.path.join(static_output_dir, name)
-#     if os.path.exists(src):
-#         shutil.copy2(src, dst)
-# log.info("📁 Final outputs synced to DVC-tracked static location.")
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,194 @@
+"""Run baseline levels of a forecast cascade in one process."""
+
 import argparse
-import subprocess
-import sys
+import contextvars
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import yaml
 
 from forecastkernel.core.aggregation import enforce_cascade_checks
+from forecastkernel.utils.io_utils import read_frame
+from forecastkernel.utils.logging_utils import setup_logger
+from forecastkernel.utils.profiling import profile_run, span
+
+
+def load_cascade_spec(path: str) -> tuple[list[dict], dict]:
+    """Read and validate a cascade spec.
+
+    The YAML file holds optional ``defaults`` (``baseline_sf`` options shared
+    by every level) and a ``levels`` list. Each level has a unique ``name``,
+    ``data`` and ``output_dir``, an optional ``parent`` naming another level
+    and optional ``options`` overriding the defaults::
+
+        defaults: {horizon: 7, phase: 3}
+        levels:
+          - {name: L1, data: data/l1.csv, output_dir: out/L1}
+          - {name: L2, parent: L1, data: data/l2.csv, output_dir: out/L2,
+             options: {parent_map: data/l2_parents.csv}}
+
+    Parameters
+    ----------
+    path : str
+        Spec file.
+
+    Returns
+    -------
+    tuple[list[dict], dict]
+        Levels and defaults.
+    """
+    with open(path, "r") as f:
+        spec = yaml.safe_load(f) or {}
+    levels = spec.get("levels") or []
+    defaults = spec.get("defaults") or {}
+
+    names = [level.get("name") for level in levels]
+    if len(set(names)) != len(names) or None in names:
+        raise ValueError("Cascade levels need unique names.")
+    for level in levels:
+        missing = {"data", "output_dir"} - set(level)
+        if missing:
+            raise ValueError(f"Cascade level {level['name']} is missing {sorted(missing)}.")
+        if level.get("parent") is not None and level["parent"] not in names:
+            raise ValueError(f"Unknown parent {level['parent']} for level {level['name']}.")
+
+    # Every chain must reach a root
+    parents = {level["name"]: level.get("parent") for level in levels}
+    for name in names:
+        seen = set()
+        while name is not None:
+            if name in seen:
+                raise ValueError("Cascade spec contains a cycle.")
+            seen.add(name)
+            name = parents[name]
+    return levels, defaults
+
+
+def run_cascade(
+    levels: list[dict],
+    defaults: dict | None = None,
+    max_workers: int | None = None,
+    timings_path: str | None = None,
+) -> dict:
+    """Run every level after its parent, siblings concurrently.
+
+    Input files are parsed once and shared between levels reading the same
+    path, and each parent's forecasts are handed to its children in memory.
+    Every level still writes its usual artifacts and passes
+    :func:`~forecastkernel.core.aggregation.enforce_cascade_checks` against
+    its parent's run directory.
+
+    Parameters
+    ----------
+    levels : list of dict
+        Levels as returned by :func:`load_cascade_spec`.
+    defaults : dict, optional
+        ``baseline_sf`` options applied to every level.
+    max_workers : int, optional
+        Levels run at the same time. Defaults to the widest sibling group.
+    timings_path : str, optional
+        Write the cascade's stage timings (input loads and every level's
+        wall time) to this file. Each level also writes its own
+        ``timings.json``.
+
+    Returns
+    -------
+    dict
+        ``baseline_metrics`` payload of every level by name.
+
+    Raises
+    ------
+    ValueError
+        If any level fails; its descendants are skipped.
+    """
+    with profile_run("cascade", timings_path):
+        return _run_levels(levels, defaults, max_workers)
+
+
+def _run_levels(levels: list[dict], defaults: dict | None, max_workers: int | None) -> dict:
+    from forecastkernel.scripts.baseline_sf import make_config, run_baseline
+
+    log = setup_logger(None, "cascade")
+    by_name = {level["name"]: level for level in levels}
+    children = {name: [] for name in by_name}
+    for level in levels:
+        if level.get("parent") is not None:
+            children[level["parent"]].append(level["name"])
+    if max_workers is None:
+        max_workers = max([len(c) for c in children.values()] + [1])
+
+    frames, frames_lock = {}, threading.Lock()
+
+    def load(path):
+        with frames_lock:
+            if path not in frames:
+                with span("load") as stage:
+                    frames[path] = read_frame(path)
+                    stage["rows"] = len(frames[path])
+            return frames[path]
+
+    def run_level(name, anchor):
+        level = by_name[name]
+        options = {**(defaults or {}), **(level.get("options") or {})}
+        if level.get("parent") is not None:
+            options["parent_run"] = by_name[level["parent"]]["output_dir"]
+        config = make_config(level["data"], output_dir=level["output_dir"], **options)
+        data = load(level["data"])
+        with span(f"level[{name}]", rows=len(data)):
+            return run_baseline(config, data=data, anchor_forecasts=anchor)
+
+    def submit(pool, name, anchor):
+        # Worker threads start with an empty context; copy this one so the
+        # level spans land in the cascade's timings
+        return pool.submit(contextvars.copy_context().run, run_level, name, anchor)
+
+    results, failed = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {
+            submit(pool, name, None): name
+            for name, level in by_name.items() if level.get("parent") is None
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    results[name], level_forecasts = future.result()
+                except Exception as exc:
+                    failed[name] = exc
+                    log.error(f"❌ Cascade level {name} failed: {exc}")
+                    continue
+                log.info(f"✅ Cascade level {name} completed")
+                for child in children[name]:
+                    pending[submit(pool, child, level_forecasts)] = child
+
+    if failed:
+        skipped = sorted(set(by_name) - set(results) - set(failed))
+        raise ValueError(
+            f"Cascade failed at {sorted(failed)}"
+            + (f"; skipped descendants {skipped}" if skipped else "")
+        ) from next(iter(failed.values()))
+    return results
 
 
 def main() -> None:
-    """Cascade a baseline run using a parent run's outputs.
+    """Run a cascade spec, or a single level against a parent run.
 
-    This helper validates the upstream run and then launches the
-    :mod:`forecastkernel.scripts.baseline_sf` module with the
-    ``--parent_run`` argument.
+    With ``--spec`` every level of the spec runs in this process. The legacy
+    form validates ``--parent_run`` and runs
+    :mod:`forecastkernel.scripts.baseline_sf` in-process with the remaining
+    arguments.
 
     Returns
     -------
     None
-        Executed for its side effects of spawning a subprocess.
     """
     parser = argparse.ArgumentParser(description="Cascade baseline run from parent outputs")
-    parser.add_argument("--parent_run", type=str, required=True, help="Path to parent run directory")
+    parser.add_argument("--spec", type=str, default=None, help="YAML cascade spec describing every level")
+    parser.add_argument("--max_workers", type=int, default=None, help="Sibling levels run concurrently")
+    parser.add_argument("--timings", type=str, default=None, help="Write the cascade's stage timings to this JSON file")
+    parser.add_argument("--profile", action="store_true", help="Write cProfile statistics of every level next to its timings.json")
+    parser.add_argument("--parent_run", type=str, default=None, help="Path to parent run directory")
     parser.add_argument(
         "baseline_args",
         nargs=argparse.REMAINDER,
@@ -26,21 +196,24 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    if args.spec:
+        levels, defaults = load_cascade_spec(args.spec)
+        if args.profile:
+            defaults["profile"] = True
+        run_cascade(levels, defaults, max_workers=args.max_workers, timings_path=args.timings)
+        return
+    if not args.parent_run:
+        parser.error("either --spec or --parent_run is required")
+
     enforce_cascade_checks(args.parent_run)
 
     extra_args = args.baseline_args
     if extra_args and extra_args[0] == "--":
         extra_args = extra_args[1:]
 
-    cmd = [
-        sys.executable,
-        "-m",
-        "forecastkernel.scripts.baseline_sf",
-        "--parent_run",
-        args.parent_run,
-    ] + extra_args
+    from forecastkernel.scripts.baseline_sf import main as baseline_main
 
-    subprocess.run(cmd, check=True)
+    baseline_main(["--parent_run", args.parent_run] + extra_args)
 
 
 if __name__ == "__main__":
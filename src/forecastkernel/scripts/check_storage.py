@@ -1,8 +1,59 @@
+"""Check disk usage of the data directories against storage budgets."""
+
+import argparse
+import json
 import os
 import sys
-sys.stdout.reconfigure(encoding='utf-8')
+
+import yaml
+
+from forecastkernel.utils.storage import (
+    check_budgets, load_snapshot, save_snapshot, scan_storage, summarize_storage,
+)
+
 MAX_BYTES = 500 * 1024 * 1024  # 500 MB
-LOG_PATH = "data/logs/storage_check.log"
+# Kept outside the default root "data", so the check neither counts its own
+# files nor re-lists their directory every time it writes them
+LOG_PATH = "logs/storage_check.log"
+SNAPSHOT_PATH = "logs/storage_snapshot.json"
+
+
+def load_budgets(path: str | None, max_mb: float) -> tuple[dict, dict]:
+    """Read artifact types and their budgets.
+
+    The YAML file has an optional ``total_mb`` and a ``types`` mapping; each
+    type lists glob ``patterns`` and may set ``max_mb``::
+
+        total_mb: 500
+        types:
+          plots: {patterns: ["*.png", "*.svg"], max_mb: 50}
+          tables: {patterns: ["*.parquet", "*.csv", "*.feather"]}
+          dvc_cache: {patterns: ["*/.dvc/cache/*"], max_mb: 300}
+
+    Parameters
+    ----------
+    path : str, optional
+        Budget file. Without it only the total budget applies.
+    max_mb : float
+        Total budget used when the file does not set ``total_mb``.
+
+    Returns
+    -------
+    tuple[dict, dict]
+        ``{type: patterns}`` and byte budgets keyed by type or ``"total"``.
+    """
+    spec = {}
+    if path:
+        with open(path, "r") as f:
+            spec = yaml.safe_load(f) or {}
+    types = spec.get("types") or {}
+    artifact_types = {name: list(t.get("patterns") or []) for name, t in types.items()}
+    budgets = {"total": int(float(spec.get("total_mb", max_mb)) * 1024 * 1024)}
+    for name, t in types.items():
+        if t.get("max_mb") is not None:
+            budgets[name] = int(float(t["max_mb"]) * 1024 * 1024)
+    return artifact_types, budgets
+
 
 def get_total_size(directory):
     """Recursively compute the total size of files within ``directory``.
@@ -15,15 +66,58 @@ def get_total_size(directory):
     Returns
     -------
     int
-        Total size in bytes of all files under ``directory``.
+        Total size in bytes of all files under ``directory``, counting
+        hard-linked files once.
+    """
+    directories, _ = scan_storage([directory])
+    return summarize_storage(directories, [directory])["total_bytes"]
+
+
+def check_storage(
+    roots: list[str],
+    budget_path: str | None = None,
+    max_mb: float = MAX_BYTES / (1024 * 1024),
+    snapshot_path: str | None = SNAPSHOT_PATH,
+    full: bool = False,
+    depth: int = 1,
+) -> dict:
+    """Scan ``roots`` and compare their usage with the budgets.
+
+    Parameters
+    ----------
+    roots : list of str
+        Directories to account for.
+    budget_path : str, optional
+        YAML budget file, see :func:`load_budgets`.
+    max_mb : float, optional
+        Total budget in MB when the budget file does not set one.
+    snapshot_path : str, optional
+        Listing snapshot read before and written after the scan. ``None``
+        always scans every directory.
+    full : bool, optional
+        Re-list every directory even if a snapshot exists.
+    depth : int, optional
+        Depth of the per-directory breakdown.
+
+    Returns
+    -------
+    dict
+        :func:`~forecastkernel.utils.storage.summarize_storage` output plus
+        ``budgets``, ``exceeded`` and the scan counters.
     """
-    total = 0
-    for dirpath, _, filenames in os.walk(directory):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            if os.path.isfile(fp):
-                total += os.path.getsize(fp)
-    return total
+    artifact_types, budgets = load_budgets(budget_path, max_mb)
+    previous = load_snapshot(snapshot_path) if snapshot_path else None
+    directories, counters = scan_storage(roots, previous, full=full)
+    if snapshot_path and directories != previous:
+        save_snapshot(directories, snapshot_path)
+    summary = summarize_storage(directories, roots, artifact_types, depth=depth)
+    return {
+        **summary,
+        "budgets": budgets,
+        "exceeded": check_budgets(summary, budgets),
+        **counters,
+    }
+
 
 def main():
     """Entry point for the storage usage check script.
@@ -31,17 +125,47 @@ def main():
     Returns
     -------
     None
+
+    Raises
+    ------
+    RuntimeError
+        If any storage budget is exceeded.
     """
-    monitored_dirs = ["data", "data/outputs"]
-    total = sum(get_total_size(d) for d in monitored_dirs if os.path.exists(d))
+    sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description="Storage usage check")
+    parser.add_argument("--roots", type=str, nargs="+", default=["data"], help="Directories to account for")
+    parser.add_argument("--budgets", type=str, default=None, help="YAML file with artifact types and budgets")
+    parser.add_argument("--max_mb", type=float, default=MAX_BYTES / (1024 * 1024), help="Total budget in MB")
+    parser.add_argument("--depth", type=int, default=1, help="Depth of the per-directory breakdown")
+    parser.add_argument("--snapshot", type=str, default=SNAPSHOT_PATH, help="Directory listings reused by later checks; directories are only re-listed when their mtime changes, but every listed file is still stat-ed for its current size. Keep it outside --roots")
+    parser.add_argument("--full", action="store_true", help="Re-list every directory, ignoring the snapshot")
+    parser.add_argument("--log_path", type=str, default=LOG_PATH, help="Text report destination, best kept outside --roots")
+    parser.add_argument("--report", type=str, default=None, help="Optional JSON report destination")
+    args = parser.parse_args()
+
+    result = check_storage(
+        args.roots, args.budgets, args.max_mb, args.snapshot, full=args.full, depth=args.depth
+    )
+    mb = 1024 * 1024
+    lines = [f"Total storage used: {result['total_bytes'] / mb:.2f} MB"]
+    lines += [f"  {path}: {size / mb:.2f} MB" for path, size in result["directories"].items()]
+    lines += [f"  [{kind}] {size / mb:.2f} MB" for kind, size in result["artifact_types"].items()]
+    lines.append(f"Directories listed: {result['dirs_listed']}, reused from snapshot: {result['dirs_reused']}")
+    for name, info in result["exceeded"].items():
+        lines.append(f"Storage exceeds {info['limit'] / mb:.0f}MB {name} limit ({info['used'] / mb:.2f} MB).")
+    if not result["exceeded"]:
+        lines.append("Storage within safe bounds.")
+
+    os.makedirs(os.path.dirname(args.log_path) or ".", exist_ok=True)
+    with open(args.log_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(result, f, indent=2)
 
-    with open(LOG_PATH, "w") as f:
-        f.write(f"Total storage used: {total / (1024 * 1024):.2f} MB\n")
-        if total > MAX_BYTES:
-            f.write("Storage exceeds 500MB limit.\n")
-            raise RuntimeError("Exceeded 500MB limit.")
-        else:
-            f.write("Storage within safe bounds.\n")
+    if result["exceeded"]:
+        raise RuntimeError(f"Exceeded storage budgets: {sorted(result['exceeded'])}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
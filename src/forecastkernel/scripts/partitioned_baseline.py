@@ -0,0 +1,353 @@
+"""Run the baseline pipeline over hash partitions of a large dataset."""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.utils.hash_utils import compute_file_hash
+from forecastkernel.utils.manifest import DEFAULT_ALGORITHM, build_manifest
+from forecastkernel.utils.io_utils import (
+    artifact_path, find_artifact, iter_frame_batches, read_frame, remove_stale_artifacts,
+    write_frame,
+)
+from forecastkernel.utils.logging_utils import setup_logger
+
+PARTITION_DIR = "partitions"
+
+
+def assign_partitions(unique_ids: pd.Series | np.ndarray, n_partitions: int) -> np.ndarray:
+    """Map every ``unique_id`` to a partition using a stable hash.
+
+    Parameters
+    ----------
+    unique_ids : array-like
+        Series identifiers.
+    n_partitions : int
+        Number of partitions.
+
+    Returns
+    -------
+    numpy.ndarray
+        Partition number in ``[0, n_partitions)`` for each identifier. The
+        mapping only depends on the identifier, so it is identical across
+        processes, machines and input chunks.
+    """
+    hashed = pd.util.hash_array(np.asarray(unique_ids, dtype=object))
+    return (hashed % np.uint64(n_partitions)).astype(np.int64)
+
+
+def partition_name(index: int) -> str:
+    """Return the directory/file stem used for partition ``index``."""
+    return f"part-{index:05d}"
+
+
+def write_partitions(
+    data_path: str, output_dir: str, n_partitions: int, chunksize: int = 1_000_000
+) -> list[str]:
+    """Split an input dataset into per-partition Parquet files.
+
+    The input (CSV, Parquet or Feather) is streamed in ``chunksize`` row
+    blocks so the full dataset is never resident in memory, and each shard is
+    appended to its own Parquet file with a typed ``ds`` column.
+
+    Parameters
+    ----------
+    data_path : str
+        Input file with ``unique_id``, ``ds`` and ``y`` columns.
+    output_dir : str
+        Directory receiving ``part-XXXXX.parquet`` files.
+    n_partitions : int
+        Number of partitions.
+    chunksize : int, optional
+        Rows read per block.
+
+    Returns
+    -------
+    list[str]
+        Paths of the non-empty partition files in partition order.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, f"{partition_name(i)}.parquet") for i in range(n_partitions)]
+    writers = {}
+    try:
+        for chunk in iter_frame_batches(data_path, chunksize):
+            parts = assign_partitions(chunk["unique_id"], n_partitions)
+            for index, part in chunk.groupby(parts, sort=True):
+                writer = writers.get(index)
+                if writer is None:
+                    table = pa.Table.from_pandas(part, preserve_index=False)
+                    writer = writers[index] = pq.ParquetWriter(paths[index], table.schema)
+                else:
+                    table = pa.Table.from_pandas(part, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return [paths[i] for i in sorted(writers)]
+
+
+def _limit_worker_memory(max_bytes: int | None) -> None:
+    """Cap the address space of a worker process where the OS allows it."""
+    if not max_bytes:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows: no rlimit support
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def _run_partition(data_path: str, output_dir: str, options: dict) -> str:
+    """Worker entry point running :func:`run_baseline` on one partition."""
+    from forecastkernel.scripts.baseline_sf import make_config, run_baseline
+
+    config = make_config(data_path, output_dir=output_dir, **options)
+    run_baseline(config)
+    return output_dir
+
+
+def merge_partition_outputs(
+    output_dir: str,
+    partition_dirs: list[str],
+    input_hash: str,
+    run_id: str,
+    output_format: str = "csv",
+) -> dict:
+    """Combine per-partition artifacts into a single run directory.
+
+    Forecasts and per-series metrics are concatenated in ``unique_id``/``ds``
+    order. Global metrics are recomputed from the per-series table weighted by
+    ``n_obs``, so they equal a single-process run over the full dataset.
+
+    Parameters
+    ----------
+    output_dir : str
+        Root run directory receiving the merged artifacts.
+    partition_dirs : list of str
+        Output directories of the partition runs.
+    input_hash : str
+        Hash of the original (unpartitioned) input file.
+    run_id : str
+        Identifier recorded in the merged metadata.
+    output_format : str, optional
+        Format of the merged forecast artifact.
+
+    Returns
+    -------
+    dict
+        Merged ``baseline_metrics.json`` payload.
+    """
+    from forecastkernel.scripts.baseline_sf import summarize_results
+
+    partition_dirs = sorted(partition_dirs)
+    forecasts = pd.concat(
+        [read_frame(find_artifact(d, "baseline_forecasts")) for d in partition_dirs],
+        ignore_index=True,
+    ).sort_values(["unique_id", "ds"], kind="stable")
+    remove_stale_artifacts(output_dir, "baseline_forecasts", output_format)
+    forecast_file = write_frame(
+        forecasts, artifact_path(output_dir, "baseline_forecasts", output_format)
+    )
+
+    series_metrics = pd.concat(
+        [pd.read_parquet(os.path.join(d, "per_series_metrics.parquet")) for d in partition_dirs],
+        ignore_index=True,
+    ).sort_values(["unique_id", "model"], kind="stable")
+    series_metrics_path = os.path.join(output_dir, "per_series_metrics.parquet")
+    series_metrics.to_parquet(series_metrics_path, index=False)
+
+    weighted = series_metrics.assign(
+        abs_sum=series_metrics["mae"] * series_metrics["n_obs"],
+        err_sum=series_metrics["bias"] * series_metrics["n_obs"],
+    ).groupby("model", sort=False)[["abs_sum", "err_sum", "n_obs"]].sum()
+    results = pd.DataFrame({
+        "model": weighted.index,
+        "mae": weighted["abs_sum"] / weighted["n_obs"],
+        "bias": weighted["err_sum"] / weighted["n_obs"],
+    })
+    results["score"] = results["mae"] + results["bias"].abs()
+    metrics_dict, selected_model, pass_ci = summarize_results(results)
+
+    partition_metrics = []
+    for d in partition_dirs:
+        with open(os.path.join(d, "baseline_metrics.json")) as f:
+            partition_metrics.append(json.load(f))
+    drift_detected = any(
+        m.get("drift_monitor", {}).get("drift_detected", False) for m in partition_metrics
+    )
+
+    baseline_metrics = {
+        "series_id": str(forecasts["unique_id"].iloc[0]),
+        "horizon": partition_metrics[0]["horizon"],
+        "timestamp": datetime.now().isoformat(),
+        "metrics": metrics_dict,
+        "ci_baseline_rule": "min(ensemble_naive, holt_winters)",
+        "selected_model": selected_model,
+        "pass_ci": pass_ci,
+        "drift_monitor": {"drift_detected": drift_detected},
+        "partitions": [os.path.relpath(d, output_dir) for d in partition_dirs],
+        "metadata": {
+            "input_hash": input_hash,
+            "tag": "v0.1-baseline",
+            "phase": partition_metrics[0]["metadata"]["phase"],
+            "aggregation_level": partition_metrics[0]["metadata"].get("aggregation_level"),
+        },
+    }
+    metrics_path = os.path.join(output_dir, "baseline_metrics.json")
+    with open(metrics_path, "w") as f:
+        json.dump(baseline_metrics, f, indent=2)
+
+    files, algorithms = {}, set()
+    for d in partition_dirs:
+        with open(os.path.join(d, "audit_log.json")) as f:
+            part_log = json.load(f)
+        algorithms.add(part_log.get("algorithm", DEFAULT_ALGORITHM))
+        prefix = os.path.relpath(d, output_dir).replace(os.sep, "/")
+        for name, digest in sorted(part_log["files"].items()):
+            files[f"{prefix}/{name}"] = digest
+    if len(algorithms) > 1:
+        raise ValueError(f"Partition audit logs use different hash algorithms: {sorted(algorithms)}")
+    algorithm = algorithms.pop() if algorithms else DEFAULT_ALGORITHM
+    merged = build_manifest(
+        output_dir,
+        ["baseline_metrics.json", os.path.basename(forecast_file), "per_series_metrics.parquet"],
+        algorithm=algorithm,
+    )
+    files.update(merged["files"])
+
+    audit_log = {
+        "run_id": run_id,
+        "timestamp": datetime.utcnow().isoformat(),
+        "algorithm": algorithm,
+        "files": dict(sorted(files.items())),
+    }
+    with open(os.path.join(output_dir, "audit_log.json"), "w") as f:
+        json.dump(audit_log, f, indent=2)
+
+    return baseline_metrics
+
+
+def run_partitioned(
+    data_path: str,
+    output_dir: str,
+    n_partitions: int,
+    max_workers: int | None = None,
+    max_worker_memory_mb: int | None = None,
+    **options,
+) -> dict:
+    """Run :func:`run_baseline` on hash partitions in a process pool.
+
+    Parameters
+    ----------
+    data_path : str
+        Input file with ``unique_id``, ``ds`` and ``y`` columns.
+    output_dir : str
+        Root output directory. Partition runs are written below
+        ``output_dir/partitions``.
+    n_partitions : int
+        Number of hash partitions.
+    max_workers : int, optional
+        Number of concurrent partition runs. Defaults to the CPU count.
+    max_worker_memory_mb : int, optional
+        Address-space limit per worker process (POSIX only).
+    **options
+        Extra :func:`run_baseline` options such as ``horizon``. ``n_jobs``
+        defaults to ``1`` so partitions do not oversubscribe the CPUs.
+
+    Returns
+    -------
+    dict
+        Merged metrics payload, also written to ``baseline_metrics.json``.
+    """
+    log = setup_logger(None, "partitioned")
+    os.makedirs(output_dir, exist_ok=True)
+    input_hash = compute_file_hash(data_path)
+
+    partition_root = os.path.join(output_dir, PARTITION_DIR)
+    log.info(f"Partitioning {data_path} into {n_partitions} shards ...")
+    inputs = write_partitions(data_path, os.path.join(partition_root, "inputs"), n_partitions)
+
+    options.setdefault("n_jobs", 1)
+    run_id = options.get("tag") or "dvc-run"
+    memory_limit = max_worker_memory_mb * 1024 * 1024 if max_worker_memory_mb else None
+
+    pool_kwargs = {}
+    if sys.version_info >= (3, 11):
+        # Recycle workers so memory from one partition never leaks into the next
+        pool_kwargs["max_tasks_per_child"] = 1
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_limit_worker_memory,
+        initargs=(memory_limit,),
+        **pool_kwargs,
+    ) as pool:
+        futures = [
+            pool.submit(
+                _run_partition,
+                path,
+                os.path.join(partition_root, os.path.splitext(os.path.basename(path))[0]),
+                options,
+            )
+            for path in inputs
+        ]
+        partition_dirs = [future.result() for future in futures]
+
+    log.info("Merging partition outputs ...")
+    merged = merge_partition_outputs(
+        output_dir, partition_dirs, input_hash, run_id, options.get("output_format", "csv")
+    )
+    log.info(f"✅ Partitioned run completed. Outputs saved to: {output_dir}")
+    return merged
+
+
+def main() -> None:
+    """Entry point for the ``partitioned_baseline`` command.
+
+    Returns
+    -------
+    None
+    """
+    parser = argparse.ArgumentParser(description="Partitioned baseline runner")
+    parser.add_argument("--data", type=str, required=True, help="Path to input CSV, Parquet or Feather file")
+    parser.add_argument("--output_dir", type=str, default="data/outputs/baseline", help="Root output directory")
+    parser.add_argument("--partitions", type=int, default=8, help="Number of hash partitions")
+    parser.add_argument("--max_workers", type=int, default=None, help="Concurrent partition runs")
+    parser.add_argument("--max_worker_memory_mb", type=int, default=None, help="Memory cap per worker (POSIX)")
+    parser.add_argument("--horizon", type=int, default=7, help="Forecast horizon")
+    parser.add_argument("--season_length", type=int, default=12, help="Season length for seasonal models")
+    parser.add_argument("--phase", type=int, default=3, help="Forecast-Kernel phase (default: 3)")
+    parser.add_argument("--tag", type=str, default=None, help="Optional run tag")
+    parser.add_argument("--output_format", type=str, default="csv", choices=["csv", "parquet", "feather"], help="Format of the forecast artifacts")
+    parser.add_argument("--hash_algorithm", type=str, default="sha256", choices=["sha256", "blake2b"], help="Digest recorded in the audit logs")
+    args = parser.parse_args()
+
+    run_partitioned(
+        args.data,
+        args.output_dir,
+        args.partitions,
+        max_workers=args.max_workers,
+        max_worker_memory_mb=args.max_worker_memory_mb,
+        horizon=args.horizon,
+        season_length=args.season_length,
+        phase=args.phase,
+        tag=args.tag,
+        output_format=args.output_format,
+        hash_algorithm=args.hash_algorithm,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compile a run's forecasts into a memory-mapped serving store."""
+
+import argparse
+import json
+import os
+
+from forecastkernel.utils.forecast_store import activate_store, compile_forecast_store
+from forecastkernel.utils.io_utils import find_artifact, read_frame
+
+
+def publish_run(
+    run_dir: str, root: str, serve_hash: str | None = None, activate: bool = False
+) -> str:
+    """Compile the forecasts of ``run_dir`` into the store below ``root``.
+
+    Parameters
+    ----------
+    run_dir : str
+        Baseline run directory with ``baseline_forecasts`` and
+        ``baseline_metrics.json``.
+    root : str
+        Directory holding the forecast stores.
+    serve_hash : str, optional
+        Store name. Defaults to the serve hash recorded in the run's metrics.
+    activate : bool, optional
+        Point ``<root>/CURRENT`` at the new store.
+
+    Returns
+    -------
+    str
+        Path of the compiled store.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the run has no forecasts.
+    ValueError
+        If no serve hash is given and the run did not record one.
+    """
+    forecast_file = find_artifact(run_dir, "baseline_forecasts")
+    if forecast_file is None:
+        raise FileNotFoundError(f"No baseline forecasts in {run_dir}")
+    metrics = {}
+    metrics_path = os.path.join(run_dir, "baseline_metrics.json")
+    if os.path.exists(metrics_path):
+        with open(metrics_path, "r") as f:
+            metrics = json.load(f)
+    serve_hash = serve_hash or metrics.get("metadata", {}).get("serve_hash")
+    if not serve_hash:
+        raise ValueError(f"Run {run_dir} has no serve hash; pass one explicitly.")
+
+    forecasts = read_frame(forecast_file)
+    metadata = {
+        "run_id": str(forecasts["run_id"].iloc[0]) if "run_id" in forecasts and len(forecasts) else None,
+        "selected_model": metrics.get("selected_model"),
+        "horizon": metrics.get("horizon"),
+    }
+    path = compile_forecast_store(forecasts, root, serve_hash, metadata=metadata)
+    if activate:
+        activate_store(root, serve_hash)
+    return path
+
+
+def main() -> None:
+    """Entry point for the ``publish_forecasts`` command.
+
+    Returns
+    -------
+    None
+    """
+    parser = argparse.ArgumentParser(description="Compile run forecasts into a serving store")
+    parser.add_argument("--run_dir", type=str, required=True, help="Baseline run directory")
+    parser.add_argument("--root", type=str, default="data/serving", help="Directory holding the forecast stores")
+    parser.add_argument("--serve_hash", type=str, default=None, help="Store name (defaults to the run's serve hash)")
+    parser.add_argument("--activate", action="store_true", help="Make the store the one served by default")
+    args = parser.parse_args()
+
+    path = publish_run(args.run_dir, args.root, args.serve_hash, activate=args.activate)
+    print(f"Forecast store written to {path}" + (" and activated" if args.activate else ""))
+
+
+if __name__ == "__main__":
+    main()
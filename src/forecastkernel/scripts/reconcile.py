@@ -0,0 +1,155 @@
+"""Aggregate a bottom-level panel to all hierarchy levels and reconcile forecasts."""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.hierarchy import (
+    RECONCILIATION_METHODS, aggregate_hierarchy, from_matrix, reconcile, summing_matrix,
+    to_matrix, top_down_proportions,
+)
+from forecastkernel.utils.io_utils import read_frame, write_frame
+from forecastkernel.utils.logging_utils import setup_logger
+
+
+def parse_levels(values: list[str]) -> list[list[str]]:
+    """Turn ``["total", "region", "region,store"]`` into level column lists."""
+    return [[] if v == "total" else [c.strip() for c in v.split(",") if c.strip()] for v in values]
+
+
+def aggregate_data(data_path: str, spec_path: str, levels: list[list[str]], output_path: str) -> pd.DataFrame:
+    """Write the bottom-level actuals summed to every hierarchy node.
+
+    Parameters
+    ----------
+    data_path : str
+        Bottom-level input with ``unique_id``, ``ds`` and ``y``.
+    spec_path : str
+        Hierarchy spec with ``unique_id`` and the level attribute columns.
+    levels : list of list of str
+        Aggregation levels, see :func:`forecastkernel.core.hierarchy.summing_matrix`.
+    output_path : str
+        Destination of the all-level panel (CSV, Parquet or Feather).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The aggregated panel, suitable as ``baseline_sf`` input.
+    """
+    S, nodes = summing_matrix(read_frame(spec_path), levels)
+    panel = aggregate_hierarchy(read_frame(data_path, columns=["unique_id", "ds", "y"]), S, nodes, ["y"])
+    write_frame(panel, output_path)
+    return panel
+
+
+def reconcile_forecasts(
+    forecasts_path: str,
+    spec_path: str,
+    levels: list[list[str]],
+    output_path: str,
+    method: str = "ols",
+    models: list[str] | None = None,
+    data_path: str | None = None,
+    residuals_path: str | None = None,
+) -> pd.DataFrame:
+    """Reconcile base forecasts of every node and write the coherent forecasts.
+
+    Parameters
+    ----------
+    forecasts_path : str
+        Long-format base forecasts covering every node of the hierarchy, e.g.
+        ``baseline_forecasts`` of a run over the :func:`aggregate_data` panel.
+    spec_path : str
+        Hierarchy spec with ``unique_id`` and the level attribute columns.
+    levels : list of list of str
+        Aggregation levels.
+    output_path : str
+        Destination of the reconciled forecasts.
+    method : str, optional
+        One of :data:`forecastkernel.core.hierarchy.RECONCILIATION_METHODS`.
+    models : list of str, optional
+        Forecast columns to reconcile. Defaults to every numeric column other
+        than ``y``.
+    data_path : str, optional
+        Bottom-level actuals used for ``top_down`` proportions.
+    residuals_path : str, optional
+        Long-format in-sample residuals of every node for ``mint_shrink``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Reconciled forecasts with ``unique_id``, ``ds`` and ``models``.
+    """
+    S, nodes = summing_matrix(read_frame(spec_path), levels)
+    node_ids = nodes["unique_id"].to_numpy()
+    forecasts = read_frame(forecasts_path)
+    if models is None:
+        skip = {"unique_id", "ds", "y", "run_id", "horizon", "n_models"}
+        models = [c for c in forecasts.select_dtypes("number").columns if c not in skip]
+
+    missing = pd.Index(node_ids).difference(forecasts["unique_id"].unique())
+    if len(missing):
+        raise ValueError(f"Base forecasts missing for {len(missing)} hierarchy nodes, e.g. {missing[0]}.")
+
+    proportions = None
+    if method == "top_down":
+        if data_path is None:
+            raise ValueError("top_down reconciliation requires --data for historical proportions.")
+        history, _, _ = to_matrix(read_frame(data_path), node_ids[-S.shape[1]:], "y")
+        proportions = top_down_proportions(history)
+
+    residual_frame = read_frame(residuals_path) if residuals_path else None
+    out = None
+    for model in models:
+        base, observed, times = to_matrix(forecasts, node_ids, model)
+        if not observed.all():
+            raise ValueError("Base forecasts must cover the same ds values for every node.")
+        residuals = None
+        if residual_frame is not None:
+            resid, _, _ = to_matrix(residual_frame, node_ids, model)
+            residuals = resid[:, ~np.isnan(resid).any(axis=0)].T
+        coherent = reconcile(base, S, method, proportions=proportions, residuals=residuals)
+        frame = from_matrix(coherent, node_ids, times, model)
+        out = frame if out is None else out.assign(**{model: frame[model].to_numpy()})
+
+    write_frame(out, output_path)
+    return out
+
+
+def main() -> None:
+    """Entry point for the ``reconcile`` command.
+
+    Returns
+    -------
+    None
+    """
+    parser = argparse.ArgumentParser(description="Hierarchical aggregation and reconciliation")
+    parser.add_argument("--spec", type=str, required=True, help="Hierarchy spec with unique_id and level attribute columns")
+    parser.add_argument("--level", action="append", default=None, help="Aggregation level as comma-separated spec columns or 'total' (repeatable, top-down order)")
+    parser.add_argument("--data", type=str, default=None, help="Bottom-level actuals (unique_id, ds, y)")
+    parser.add_argument("--aggregate_output", type=str, default=None, help="Write --data summed to every node to this path")
+    parser.add_argument("--forecasts", type=str, default=None, help="Base forecasts of every node to reconcile")
+    parser.add_argument("--method", type=str, default="ols", choices=RECONCILIATION_METHODS, help="Reconciliation method")
+    parser.add_argument("--models", type=str, nargs="+", default=None, help="Forecast columns to reconcile")
+    parser.add_argument("--residuals", type=str, default=None, help="In-sample residuals of every node (mint_shrink)")
+    parser.add_argument("--output", type=str, default="reconciled_forecasts.parquet", help="Destination of the reconciled forecasts")
+    args = parser.parse_args()
+
+    log = setup_logger(None, "reconcile")
+    levels = parse_levels(args.level or ["total"])
+    if args.aggregate_output:
+        if not args.data:
+            parser.error("--aggregate_output requires --data")
+        aggregate_data(args.data, args.spec, levels, args.aggregate_output)
+        log.info(f"✅ Aggregated panel saved to: {args.aggregate_output}")
+    if args.forecasts:
+        reconcile_forecasts(
+            args.forecasts, args.spec, levels, args.output, args.method,
+            models=args.models, data_path=args.data, residuals_path=args.residuals,
+        )
+        log.info(f"✅ Reconciled forecasts ({args.method}) saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
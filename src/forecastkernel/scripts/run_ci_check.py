@@ -1,13 +1,11 @@
 """Command line helper to validate CI audit log hashes."""
 
 import argparse
-import json
-import os
 import sys
-from forecastkernel.utils.hash_utils import compute_file_hash
+from forecastkernel.utils.ci_utils import check_audit_log
 
 def validate_audit_hashes(
-    audit_log_path: str, base_dir: str, force: bool = False
+    audit_log_path: str, base_dir: str, force: bool = False, cache_path: str | None = None
 ) -> bool:
     """Check recorded file hashes against the actual files.
 
@@ -19,37 +17,15 @@ def validate_audit_hashes(
         Directory containing the files to validate.
     force : bool, optional
         If ``True`` return success even when mismatches are found.
+    cache_path : str, optional
+        Stat cache file outside ``base_dir``; by default every file is read.
 
     Returns
     -------
     bool
         ``True`` if all hashes match or ``force`` is ``True``.
     """
-    with open(audit_log_path, "r") as f:
-        audit_log = json.load(f)
-
-    mismatches = []
-    for file_name, recorded_hash in audit_log["files"].items():
-        full_path = os.path.join(base_dir, file_name)
-        if not os.path.exists(full_path):
-            print(f"[❌] Missing file: {file_name}")
-            mismatches.append((file_name, recorded_hash, "MISSING"))
-            continue
-        current_hash = compute_file_hash(full_path)
-        if current_hash != recorded_hash:
-            mismatches.append((file_name, recorded_hash, current_hash))
-
-    if mismatches:
-        print("⚠️ Hash Mismatches Found:")
-        for fname, old, new in mismatches:
-            print(f"- {fname}:\n  Expected: {old}\n  Found:    {new}")
-        if force:
-            print("[⚠] Mismatch overridden by --force.")
-            return True
-        return False
-
-    print("✅ All hashes match audit log.")
-    return True
+    return check_audit_log(audit_log_path, base_dir, force=force, cache_path=cache_path)
 
 def main() -> None:
     """Entry point for the ``run_ci_check`` command.
@@ -63,9 +39,10 @@ def main() -> None:
     parser.add_argument("--audit_log", type=str, required=True, help="Path to audit_log.json")
     parser.add_argument("--base_dir", type=str, required=True, help="Base directory containing the files")
     parser.add_argument("--force", action="store_true", help="Override hash mismatch failure")
+    parser.add_argument("--hash_cache", type=str, default=None, help="Opt-in stat cache file outside --base_dir; unchanged files are not reread")
     args = parser.parse_args()
 
-    success = validate_audit_hashes(args.audit_log, args.base_dir, args.force)
+    success = validate_audit_hashes(args.audit_log, args.base_dir, args.force, cache_path=args.hash_cache)
 
     if not success:
         sys.exit(1)
@@ -0,0 +1,262 @@
+"""Serve compiled forecast stores over HTTP.
+
+Endpoints (all responses are JSON):
+
+``GET /forecast/<unique_id>[?model=A,B][&serve_hash=H]``
+    Forecasts of one series from the active store, or from store ``H``.
+``GET /health``
+    Active serve hash and loaded stores.
+``POST /activate/<serve_hash>``
+    Load a store and make it the active one.
+
+Stores are memory-mapped and swapped by replacing a single reference once
+the new store is open, so requests never wait on a swap. The server also
+follows ``<root>/CURRENT``, so publishing a run with ``--activate`` switches
+running servers over without a restart.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from forecastkernel.utils.forecast_store import (
+    activate_store, current_serve_hash, lookup_forecast, open_forecast_store,
+)
+from forecastkernel.utils.logging_utils import setup_logger
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def make_state(root: str, serve_hash: str | None = None, max_loaded: int = 4) -> dict:
+    """Open the initial store of a server.
+
+    Parameters
+    ----------
+    root : str
+        Directory holding the stores.
+    serve_hash : str, optional
+        Store to serve. Defaults to the one named by ``<root>/CURRENT``.
+    max_loaded : int, optional
+        Stores kept open for requests pinned to a serve hash.
+
+    Returns
+    -------
+    dict
+        Server state used by :func:`route`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no store is given and ``<root>/CURRENT`` does not exist.
+    """
+    serve_hash = serve_hash or current_serve_hash(root)
+    if serve_hash is None:
+        raise FileNotFoundError(f"No serve hash given and no active store in {root}")
+    state = {
+        "root": root,
+        "stores": OrderedDict(),
+        "max_loaded": max_loaded,
+        "active": None,
+        "current": current_serve_hash(root),
+    }
+    swap_store(state, serve_hash)
+    return state
+
+
+def _remember(state: dict, serve_hash: str, store: dict) -> dict:
+    """Keep ``store`` open, closing the least recently used other stores."""
+    stores = state["stores"]
+    stores[serve_hash] = store
+    stores.move_to_end(serve_hash)
+    keep = (state["active"], serve_hash)
+    evictable = [name for name in stores if name not in keep]
+    for name in evictable[:max(0, len(stores) - state["max_loaded"])]:
+        del stores[name]
+    return store
+
+
+def _get_store(state: dict, serve_hash: str) -> dict:
+    if "/" in serve_hash or os.sep in serve_hash or serve_hash in ("", ".", ".."):
+        raise FileNotFoundError(f"No forecast store {serve_hash!r}")
+    if serve_hash in state["stores"]:
+        state["stores"].move_to_end(serve_hash)
+        return state["stores"][serve_hash]
+    return _remember(state, serve_hash, open_forecast_store(os.path.join(state["root"], serve_hash)))
+
+
+def swap_store(state: dict, serve_hash: str) -> None:
+    """Make ``serve_hash`` the active store once it is open."""
+    _get_store(state, serve_hash)
+    state["active"] = serve_hash
+
+
+def route(state: dict, method: str, target: str) -> tuple[int, dict]:
+    """Answer one request.
+
+    Parameters
+    ----------
+    state : dict
+        Server state from :func:`make_state`.
+    method : str
+        HTTP method.
+    target : str
+        Request target, i.e. path and query string.
+
+    Returns
+    -------
+    tuple[int, dict]
+        HTTP status and JSON payload.
+    """
+    url = urlsplit(target)
+    parts = [unquote(p) for p in url.path.strip("/").split("/")]
+    query = parse_qs(url.query)
+    if parts == ["health"]:
+        return 200, {"status": "ok", "serve_hash": state["active"], "loaded": list(state["stores"])}
+    if len(parts) != 2 or parts[0] not in ("forecast", "activate"):
+        return 404, {"error": f"Unknown path {url.path}"}
+
+    if parts[0] == "activate":
+        if method != "POST":
+            return 405, {"error": "Use POST to activate a store"}
+        try:
+            swap_store(state, parts[1])
+        except (FileNotFoundError, ValueError) as e:
+            return 404, {"error": str(e)}
+        return 200, {"serve_hash": state["active"]}
+
+    if method != "GET":
+        return 405, {"error": "Use GET to read forecasts"}
+    serve_hash = query.get("serve_hash", [state["active"]])[0]
+    try:
+        store = _get_store(state, serve_hash)
+    except (FileNotFoundError, ValueError) as e:
+        return 404, {"error": str(e)}
+    models = query["model"][0].split(",") if "model" in query else None
+    try:
+        result = lookup_forecast(store, parts[1], models)
+    except KeyError as e:
+        return 400, {"error": f"Unknown model {e.args[0]}"}
+    if result is None:
+        return 404, {"error": f"Unknown series {parts[1]}", "serve_hash": serve_hash}
+    return 200, result
+
+
+async def _handle_connection(state: dict, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                break
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+            if int(headers.get("content-length", 0)):
+                await reader.readexactly(int(headers["content-length"]))
+
+            status, payload = route(state, method, target)
+            body = json.dumps(payload).encode("utf-8")
+            keep_alive = (
+                headers.get("connection", "").lower() != "close"
+                if version == "HTTP/1.1"
+                else headers.get("connection", "").lower() == "keep-alive"
+            )
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _follow_current(state: dict, interval: float, log) -> None:
+    """Swap to the store named by ``<root>/CURRENT`` whenever it changes."""
+    while True:
+        await asyncio.sleep(interval)
+        serve_hash = current_serve_hash(state["root"])
+        if serve_hash and serve_hash != state["current"]:
+            state["current"] = serve_hash
+            path = os.path.join(state["root"], serve_hash)
+            try:
+                # Opening is quick, but keep file I/O off the event loop
+                store = await asyncio.to_thread(open_forecast_store, path)
+            except (FileNotFoundError, ValueError) as e:
+                log.warning(f"Cannot activate {serve_hash}: {e}")
+                continue
+            _remember(state, serve_hash, store)
+            state["active"] = serve_hash
+            log.info(f"Serving forecasts from {serve_hash}")
+
+
+async def serve(
+    state: dict, host: str = "127.0.0.1", port: int = 8080, poll_interval: float = 1.0, log=None
+) -> None:
+    """Serve ``state`` until cancelled.
+
+    Parameters
+    ----------
+    state : dict
+        Server state from :func:`make_state`.
+    host, port : str, int
+        Listening address. Port ``0`` picks a free port.
+    poll_interval : float, optional
+        Seconds between checks of ``<root>/CURRENT``; ``0`` disables them.
+    log : logging.Logger, optional
+        Logger for swaps and startup.
+    """
+    log = log or setup_logger(logger_name="serve_forecasts")
+    server = await asyncio.start_server(lambda r, w: _handle_connection(state, r, w), host, port)
+    state["address"] = server.sockets[0].getsockname()[:2]
+    log.info(f"Serving {state['active']} on http://{state['address'][0]}:{state['address'][1]}")
+    watcher = asyncio.create_task(_follow_current(state, poll_interval, log)) if poll_interval > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+def main() -> None:
+    """Entry point for the ``serve_forecasts`` command.
+
+    Returns
+    -------
+    None
+    """
+    parser = argparse.ArgumentParser(description="Serve compiled forecast stores over HTTP")
+    parser.add_argument("--root", type=str, default="data/serving", help="Directory holding the forecast stores")
+    parser.add_argument("--serve_hash", type=str, default=None, help="Store to serve first (defaults to <root>/CURRENT)")
+    parser.add_argument("--activate", action="store_true", help="Also point <root>/CURRENT at --serve_hash")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Listening address")
+    parser.add_argument("--port", type=int, default=8080, help="Listening port")
+    parser.add_argument("--poll_interval", type=float, default=1.0, help="Seconds between checks of <root>/CURRENT (0 disables hot swapping from the file)")
+    parser.add_argument("--max_loaded", type=int, default=4, help="Stores kept open for requests pinned to a serve hash")
+    args = parser.parse_args()
+
+    if args.activate and args.serve_hash:
+        activate_store(args.root, args.serve_hash)
+    state = make_state(args.root, args.serve_hash, max_loaded=args.max_loaded)
+    try:
+        asyncio.run(serve(state, args.host, args.port, args.poll_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
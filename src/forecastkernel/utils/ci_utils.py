@@ -3,9 +3,11 @@
 import json
 import os
 from datetime import datetime
-from forecastkernel.utils.hash_utils import compute_file_hash
+from forecastkernel.utils.manifest import verify_manifest
 
-def validate_file_hashes(audit_log_path: str, output_dir: str) -> dict:
+def validate_file_hashes(
+    audit_log_path: str, output_dir: str, max_workers: int | None = None, cache_path: str | None = None
+) -> dict:
     """Validate a set of files against hashes stored in an audit log.
 
     Parameters
@@ -14,6 +16,10 @@ def validate_file_hashes(audit_log_path: str, output_dir: str) -> dict:
         Path to ``audit_log.json`` produced during the run.
     output_dir : str
         Directory containing the files to check.
+    max_workers : int, optional
+        Hashing threads, see :func:`forecastkernel.utils.manifest.hash_files`.
+    cache_path : str, optional
+        Stat cache file outside ``output_dir``; by default every file is read.
 
     Returns
     -------
@@ -23,24 +29,45 @@ def validate_file_hashes(audit_log_path: str, output_dir: str) -> dict:
 
     with open(audit_log_path, "r") as f:
         audit_data = json.load(f)
+    return verify_manifest(audit_data, output_dir, max_workers=max_workers, cache_path=cache_path)
 
-    stored_hashes = audit_data.get("files", {})
-    mismatches = {}
 
-    for filename, expected_hash in stored_hashes.items():
-        current_path = os.path.join(output_dir, filename)
-        if not os.path.exists(current_path):
-            mismatches[filename] = "Missing file"
-            continue
+def check_audit_log(
+    audit_log_path: str, base_dir: str, force: bool = False, cache_path: str | None = None
+) -> bool:
+    """Validate an audit log and print any mismatches.
 
-        current_hash = compute_file_hash(current_path)
-        if current_hash != expected_hash:
-            mismatches[filename] = {
-                "expected": expected_hash,
-                "actual": current_hash
-            }
+    Parameters
+    ----------
+    audit_log_path : str
+        Path to ``audit_log.json``.
+    base_dir : str
+        Directory containing the files to validate.
+    force : bool, optional
+        If ``True`` return success even when mismatches are found.
+    cache_path : str, optional
+        Stat cache file outside ``base_dir``; by default every file is read.
 
-    return mismatches
+    Returns
+    -------
+    bool
+        ``True`` if all hashes match or ``force`` is ``True``.
+    """
+    mismatches = validate_file_hashes(audit_log_path, base_dir, cache_path=cache_path)
+    if not mismatches:
+        print("✅ All hashes match audit log.")
+        return True
+
+    print("⚠️ Hash Mismatches Found:")
+    for fname, detail in mismatches.items():
+        if isinstance(detail, str):
+            print(f"- {fname}: {detail}")
+        else:
+            print(f"- {fname}:\n  Expected: {detail['expected']}\n  Found:    {detail['actual']}")
+    if force:
+        print("[⚠] Mismatch overridden by --force.")
+        return True
+    return False
 
 if __name__ == "__main__":
     import argparse
@@ -52,6 +79,7 @@ if __name__ == "__main__":
     parser.add_argument("--output_dir", type=str, help="Path to directory with files to validate")
     parser.add_argument("--run_dir", type=str, help="Base path to infer both audit_log and output_dir")
     parser.add_argument("--log_ci_results", action="store_true", help="Log validation result to ci_hash_results.json")
+    parser.add_argument("--hash_cache", type=str, default=None, help="Opt-in stat cache file outside the run directory; unchanged files are not reread")
 
     args = parser.parse_args()
 
@@ -63,7 +91,7 @@ if __name__ == "__main__":
     if not args.audit_log or not args.output_dir:
         parser.error("Either --run_dir or both --audit_log and --output_dir must be provided.")
 
-    mismatches = validate_file_hashes(args.audit_log, args.output_dir)
+    mismatches = validate_file_hashes(args.audit_log, args.output_dir, cache_path=args.hash_cache)
 
     if mismatches:
         print("❌ Hash mismatches detected:")
@@ -0,0 +1,108 @@
+"""Compact in-memory dtypes for long-format panels.
+
+Series identifiers are held as a pandas ``Categorical`` whose categories are
+the sorted distinct ids: each row stores a small integer code instead of a
+Python string, sorting and grouping follow the same order as the strings, and
+joins can use the codes directly (see
+:func:`forecastkernel.core.keys.panel_join_keys`). ``ds`` stays
+``datetime64[ns]``, which StatsForecast needs. ``y`` can optionally be held as
+``float32``, halving its size at the cost of precision.
+
+The id dictionary of a run can be persisted with :func:`save_id_dictionary`
+so that the codes written by one run can be decoded or reused by another.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+ID_DICTIONARY = "series_dictionary.parquet"
+
+
+def compact_ids(ids: pd.Series, categories: pd.Index | None = None) -> pd.Series:
+    """Return ``ids`` as a categorical with sorted categories.
+
+    Parameters
+    ----------
+    ids : pandas.Series
+        Series identifiers, as strings or already categorical.
+    categories : pandas.Index, optional
+        Dictionary to encode against, e.g. from :func:`load_id_dictionary`.
+        Defaults to the sorted distinct ids.
+
+    Returns
+    -------
+    pandas.Series
+        Categorical ids; existing categoricals are only reordered.
+
+    Raises
+    ------
+    ValueError
+        If ``categories`` is given and does not contain every id.
+    """
+    if isinstance(ids.dtype, pd.CategoricalDtype):
+        observed = ids.cat.remove_unused_categories()
+        if categories is None:
+            categories = observed.cat.categories.sort_values()
+        compact = observed.cat.set_categories(categories)
+    else:
+        if categories is None:
+            categories = pd.Index(pd.unique(ids.to_numpy())).sort_values()
+        compact = pd.Series(pd.Categorical(ids, categories=categories), index=ids.index, name=ids.name)
+    if ((compact.cat.codes.to_numpy() < 0) & ids.notna().to_numpy()).any():
+        raise ValueError("Series ids missing from the id dictionary.")
+    return compact
+
+
+def compact_panel(
+    df: pd.DataFrame, y_float32: bool = False, categories: pd.Index | None = None
+) -> pd.DataFrame:
+    """Return ``df`` with compact ``unique_id``, ``ds`` and ``y`` dtypes.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-format panel. The frame is not modified.
+    y_float32 : bool, optional
+        Store ``y`` as ``float32``.
+    categories : pandas.Index, optional
+        Id dictionary, see :func:`compact_ids`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Shallow copy with categorical ``unique_id``, ``datetime64[ns]``
+        ``ds`` and ``float64`` (or ``float32``) ``y``.
+    """
+    out = df.copy(deep=False)
+    if "unique_id" in out.columns:
+        out["unique_id"] = compact_ids(out["unique_id"], categories)
+    if "ds" in out.columns and out["ds"].dtype != "datetime64[ns]":
+        out["ds"] = pd.to_datetime(out["ds"]).astype("datetime64[ns]")
+    if "y" in out.columns:
+        out["y"] = out["y"].astype(np.float32 if y_float32 else np.float64)
+    return out
+
+
+def save_id_dictionary(categories: pd.Index, path: str) -> str:
+    """Write the ``code -> unique_id`` dictionary to ``path`` (Parquet)."""
+    pd.DataFrame({
+        "code": np.arange(len(categories), dtype=np.int32),
+        "unique_id": np.asarray(categories, dtype=object),
+    }).to_parquet(path, index=False)
+    return path
+
+
+def load_id_dictionary(path: str) -> pd.Index:
+    """Read a dictionary written by :func:`save_id_dictionary`."""
+    table = pd.read_parquet(path).sort_values("code")
+    return pd.Index(table["unique_id"].to_numpy())
+
+
+def frame_memory(df: pd.DataFrame) -> dict:
+    """Return the deep memory use of every column and the total, in bytes."""
+    usage = df.memory_usage(deep=True, index=True)
+    out = {str(col): int(size) for col, size in usage.items()}
+    out["total"] = int(usage.sum())
+    return out
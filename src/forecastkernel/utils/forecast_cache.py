@@ -0,0 +1,204 @@
+"""Content-addressed cache of fitted forecast frames."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from importlib import metadata
+
+import pandas as pd
+
+from forecastkernel.utils.profiling import profiled
+
+CACHE_SUFFIX = ".parquet"
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _jsonable(value) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(_jsonable(v) for v in value)
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def model_signature(models: list) -> list[dict]:
+    """Describe model objects by class name and primitive parameters.
+
+    Parameters
+    ----------
+    models : list
+        StatsForecast model instances.
+
+    Returns
+    -------
+    list[dict]
+        One ``{"model": name, "params": {...}}`` entry per model. Attributes
+        that are not plain JSON values (e.g. fitted state) are ignored.
+    """
+    return [
+        {
+            "model": type(model).__name__,
+            "params": {k: v for k, v in sorted(vars(model).items()) if _jsonable(v)},
+        }
+        for model in models
+    ]
+
+
+def make_cache_key(
+    input_hash: str,
+    models: list,
+    h: int,
+    season_length: int,
+    freq: str = "D",
+    dtype: str = "float64",
+) -> str:
+    """Return the cache key for a forecast configuration.
+
+    Parameters
+    ----------
+    input_hash : str
+        Digest of the input dataset.
+    models : list
+        StatsForecast model instances.
+    h : int
+        Forecast horizon.
+    season_length : int
+        Season length used by seasonal models.
+    freq : str, optional
+        Pandas frequency passed to StatsForecast.
+    dtype : str, optional
+        Dtype of ``y`` the models are fitted on. Float32 fits differ from
+        float64 fits of the same data, so they never share an entry.
+
+    Returns
+    -------
+    str
+        SHA256 hex digest over the inputs plus the installed ``statsforecast``
+        and ``forecastkernel`` versions, so upgrades never reuse stale fits.
+    """
+    payload = {
+        "input_hash": input_hash,
+        "models": model_signature(models),
+        "horizon": h,
+        "season_length": season_length,
+        "freq": freq,
+        "dtype": dtype,
+        "statsforecast": _package_version("statsforecast"),
+        "forecastkernel": _package_version("forecastkernel"),
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cache_path(cache_dir: str, key: str) -> str:
+    """Return the file holding ``key`` (sharded by the first two hex digits)."""
+    return os.path.join(cache_dir, key[:2], key + CACHE_SUFFIX)
+
+
+@profiled()
+def load_cached_forecasts(cache_dir: str, key: str) -> pd.DataFrame | None:
+    """Return cached forecasts for ``key`` or ``None`` on a miss.
+
+    A hit refreshes the entry's modification time, which is the recency
+    signal used by :func:`evict_cache`.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Cache root directory.
+    key : str
+        Key from :func:`make_cache_key`.
+
+    Returns
+    -------
+    pandas.DataFrame or None
+        The cached frame, or ``None`` if absent or unreadable.
+    """
+    path = cache_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception:  # corrupt entry -> treat as miss
+        os.remove(path)
+        return None
+    os.utime(path, None)
+    return df
+
+
+@profiled()
+def store_forecasts(
+    cache_dir: str, key: str, forecasts: pd.DataFrame, max_bytes: int | None = None
+) -> str:
+    """Write ``forecasts`` to the cache and enforce the size bound.
+
+    The frame is written to a temporary file and atomically renamed so
+    concurrent readers never observe a partial entry.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Cache root directory.
+    key : str
+        Key from :func:`make_cache_key`.
+    forecasts : pandas.DataFrame
+        Frame to store.
+    max_bytes : int, optional
+        Total cache size limit applied after the write.
+
+    Returns
+    -------
+    str
+        Path of the stored entry.
+    """
+    path = cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    forecasts.to_parquet(tmp_path, index=False, compression="zstd")
+    os.replace(tmp_path, path)
+    if max_bytes is not None:
+        evict_cache(cache_dir, max_bytes, keep=path)
+    return path
+
+
+def evict_cache(cache_dir: str, max_bytes: int, keep: str | None = None) -> list[str]:
+    """Delete least recently used entries until the cache fits ``max_bytes``.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Cache root directory.
+    max_bytes : int
+        Size limit in bytes.
+    keep : str, optional
+        Entry that must survive eviction (typically the one just written).
+
+    Returns
+    -------
+    list[str]
+        Paths of the removed entries.
+    """
+    entries = []
+    for dirpath, _, filenames in os.walk(cache_dir):
+        for name in filenames:
+            if name.endswith(CACHE_SUFFIX):
+                stat = os.stat(os.path.join(dirpath, name))
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(dirpath, name)))
+
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        os.remove(path)
+        total -= size
+        removed.append(path)
+    return removed
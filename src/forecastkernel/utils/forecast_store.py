@@ -0,0 +1,232 @@
+"""Memory-mapped forecast stores for serving.
+
+A store holds the forecasts of one run and lives in ``<root>/<serve_hash>/``:
+
+``meta.json``
+    Serve hash, model names, series count and free-form run metadata.
+``ids.npy``
+    Sorted ``unique_id`` values (fixed-width strings).
+``offsets.npy``
+    ``int64`` array of length ``n_series + 1``; the forecasts of series ``i``
+    are rows ``offsets[i]:offsets[i + 1]``.
+``ds.npy``
+    Forecast timestamps as ``datetime64[ns]``, one per row.
+``values.npy``
+    ``float32`` array of shape ``(n_models, n_rows)``, so the horizon of one
+    series for one model is a contiguous block.
+
+The arrays are opened with ``mmap_mode="r"``: loading a store costs only a
+few page mappings, and a lookup is a binary search over ``ids`` followed by
+one slice per model. ``<root>/CURRENT`` names the store served by default and
+is replaced atomically by :func:`activate_store`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+CURRENT_FILE = "CURRENT"
+_ARRAYS = ("ids", "offsets", "ds", "values")
+
+
+def compile_forecast_store(
+    forecasts: pd.DataFrame,
+    root: str,
+    serve_hash: str,
+    forecast_cols: list[str] | None = None,
+    metadata: dict | None = None,
+) -> str:
+    """Write ``forecasts`` as the store ``serve_hash`` below ``root``.
+
+    Parameters
+    ----------
+    forecasts : pandas.DataFrame
+        Long-format forecasts with ``unique_id``, ``ds`` and one column per
+        model.
+    root : str
+        Directory holding all stores.
+    serve_hash : str
+        Identifier of the run, see
+        :func:`~forecastkernel.core.hash_utils.generate_serve_hash`.
+    forecast_cols : list of str, optional
+        Model columns to store. Defaults to every numeric column other than
+        the run bookkeeping columns.
+    metadata : dict, optional
+        JSON-serialisable run details kept in ``meta.json``.
+
+    Returns
+    -------
+    str
+        Path of the store directory. An existing store with the same serve
+        hash is replaced.
+
+    Raises
+    ------
+    ValueError
+        If ``forecasts`` lacks ``unique_id``/``ds``, has no model columns or
+        the serve hash is not a plain name.
+    """
+    if not serve_hash or os.sep in serve_hash or serve_hash in (".", "..", CURRENT_FILE):
+        raise ValueError(f"Invalid serve hash: {serve_hash!r}")
+    missing = {"unique_id", "ds"} - set(forecasts.columns)
+    if missing:
+        raise ValueError(f"Forecasts are missing columns: {sorted(missing)}")
+    if forecast_cols is None:
+        skip = {"unique_id", "ds", "run_id", "horizon", "n_models"}
+        forecast_cols = [
+            c for c in forecasts.columns
+            if c not in skip and pd.api.types.is_numeric_dtype(forecasts[c])
+        ]
+    if not forecast_cols:
+        raise ValueError("Forecasts have no model columns to store")
+
+    frame = forecasts[["unique_id", "ds", *forecast_cols]].copy()
+    frame["unique_id"] = frame["unique_id"].astype(str)
+    frame = frame.sort_values(["unique_id", "ds"], kind="stable")
+    ids, starts = np.unique(frame["unique_id"].to_numpy(dtype=str), return_index=True)
+    offsets = np.append(starts, len(frame)).astype(np.int64)
+    ds = pd.to_datetime(frame["ds"]).to_numpy(dtype="datetime64[ns]")
+    arrays = {
+        "ids": ids,
+        "offsets": offsets,
+        "ds": ds,
+        "values": np.ascontiguousarray(frame[forecast_cols].to_numpy(dtype=np.float32).T),
+    }
+    meta = {
+        "version": STORE_VERSION,
+        "serve_hash": serve_hash,
+        "models": list(forecast_cols),
+        "n_series": int(len(ids)),
+        "n_rows": int(len(frame)),
+        # Daily forecasts are served as dates, anything finer as timestamps
+        "ds_unit": "D" if (ds == ds.astype("datetime64[D]")).all() else "s",
+        "metadata": metadata or {},
+    }
+
+    # Build next to the destination and rename, so readers never see a
+    # partially written store
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, serve_hash)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    if os.path.isdir(path):
+        # Directories cannot be replaced in one rename; move the old store
+        # aside first. Open memory maps keep its files alive until closed.
+        old_path = f"{path}.{os.getpid()}.old"
+        os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    else:
+        os.replace(tmp_path, path)
+    return path
+
+
+def open_forecast_store(path: str) -> dict:
+    """Memory-map the store at ``path``.
+
+    Parameters
+    ----------
+    path : str
+        Store directory written by :func:`compile_forecast_store`.
+
+    Returns
+    -------
+    dict
+        ``meta`` plus the memory-mapped ``ids``, ``offsets``, ``ds`` and
+        ``values`` arrays, and ``model_index`` mapping model names to rows of
+        ``values``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``path`` is not a forecast store.
+    ValueError
+        If the store was written by an incompatible version.
+    """
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"No forecast store at {path}")
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+    if meta.get("version") != STORE_VERSION:
+        raise ValueError(f"Unsupported forecast store version {meta.get('version')} at {path}")
+    store = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+    store["meta"] = meta
+    store["model_index"] = {model: i for i, model in enumerate(meta["models"])}
+    return store
+
+
+def lookup_forecast(store: dict, unique_id: str, models: list[str] | None = None) -> dict | None:
+    """Return the forecasts of one series.
+
+    Parameters
+    ----------
+    store : dict
+        Store from :func:`open_forecast_store`.
+    unique_id : str
+        Series to look up.
+    models : list of str, optional
+        Models to return. Defaults to all stored models.
+
+    Returns
+    -------
+    dict or None
+        ``{"unique_id", "serve_hash", "ds", "forecasts": {model: [...]}}``
+        with ISO timestamps, or ``None`` if the series is not in the store.
+
+    Raises
+    ------
+    KeyError
+        If a requested model is not stored.
+    """
+    ids = store["ids"]
+    i = int(np.searchsorted(ids, unique_id))
+    if i == len(ids) or ids[i] != unique_id:
+        return None
+    start, end = int(store["offsets"][i]), int(store["offsets"][i + 1])
+    models = store["meta"]["models"] if models is None else models
+    rows = [store["model_index"][m] for m in models]
+    block = store["values"][rows, start:end]
+    return {
+        "unique_id": unique_id,
+        "serve_hash": store["meta"]["serve_hash"],
+        "ds": np.datetime_as_string(store["ds"][start:end], unit=store["meta"]["ds_unit"]).tolist(),
+        "forecasts": {m: block[k].tolist() for k, m in enumerate(models)},
+    }
+
+
+def activate_store(root: str, serve_hash: str) -> None:
+    """Point ``<root>/CURRENT`` at the store ``serve_hash`` atomically.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the store does not exist.
+    """
+    if not os.path.exists(os.path.join(root, serve_hash, "meta.json")):
+        raise FileNotFoundError(f"No forecast store {serve_hash} in {root}")
+    current = os.path.join(root, CURRENT_FILE)
+    tmp_path = f"{current}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(serve_hash + "\n")
+    os.replace(tmp_path, current)
+
+
+def current_serve_hash(root: str) -> str | None:
+    """Return the serve hash named by ``<root>/CURRENT``, if any."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
@@ -2,8 +2,15 @@
 
 import hashlib
 import json
+import os
 
-def compute_file_hash(path: str, algo: str = 'sha256') -> str:
+from forecastkernel.utils.profiling import profiled
+
+BUFFER_SIZE = 4 * 1024 * 1024
+
+
+@profiled()
+def compute_file_hash(path: str, algo: str = 'sha256', buffer_size: int = BUFFER_SIZE) -> str:
     """Return the digest of ``path`` using the given algorithm.
 
     Parameters
@@ -11,7 +18,10 @@ def compute_file_hash(path: str, algo: str = 'sha256') -> str:
     path : str
         File path to hash.
     algo : str, optional
-        Hash algorithm name recognised by :mod:`hashlib`.
+        Hash algorithm name recognised by :mod:`hashlib`, e.g. ``"blake2b"``.
+    buffer_size : int, optional
+        Largest read. Files are read unbuffered into one reused buffer no
+        larger than the file itself.
 
     Returns
     -------
@@ -20,8 +30,11 @@ def compute_file_hash(path: str, algo: str = 'sha256') -> str:
     """
 
     hash_func = hashlib.new(algo)
-    with open(path, "rb") as f:
-        while chunk := f.read(8192):
-            hash_func.update(chunk)
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer = bytearray(max(1, min(buffer_size, size)))
+        view = memoryview(buffer)
+        while n := f.readinto(buffer):
+            hash_func.update(view[:n])
     return hash_func.hexdigest()
 
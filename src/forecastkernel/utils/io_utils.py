@@ -0,0 +1,331 @@
+"""Columnar artifact I/O with CSV kept as a compatibility format."""
+
+from __future__ import annotations
+
+import os
+from typing import Iterator, Sequence
+
+import pandas as pd
+
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+_EXTENSION_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+# Lookup order when resolving an artifact whose format is not known upfront
+_RESOLVE_ORDER = ("parquet", "feather", "csv")
+# CSV dtypes of the panel columns. Inferring them per file or per block lets
+# ids such as "007" turn into integers and a block of whole numbers give
+# ``y`` an integer type that later blocks cannot be written with
+_CSV_DTYPES = {"unique_id": str, "y": "float64"}
+
+
+def _csv_dtypes(columns, categorical_ids: bool = False) -> dict:
+    """Return the pinned CSV dtypes of the panel columns among ``columns``."""
+    dtypes = {col: dtype for col, dtype in _CSV_DTYPES.items() if col in columns}
+    if categorical_ids and "unique_id" in dtypes:
+        dtypes["unique_id"] = "category"
+    return dtypes
+
+
+def infer_format(path: str) -> str:
+    """Return the storage format implied by the extension of ``path``.
+
+    Parameters
+    ----------
+    path : str
+        File path ending in ``.csv``, ``.parquet``/``.pq`` or
+        ``.feather``/``.arrow``/``.ipc``.
+
+    Returns
+    -------
+    str
+        One of ``"csv"``, ``"parquet"`` or ``"feather"``.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _EXTENSION_FORMATS:
+        raise ValueError(f"Unsupported artifact format: {path}")
+    return _EXTENSION_FORMATS[ext]
+
+
+def artifact_path(output_dir: str, stem: str, fmt: str = "csv") -> str:
+    """Return ``output_dir/stem`` with the extension for ``fmt``."""
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported artifact format: {fmt}")
+    return os.path.join(output_dir, stem + FORMAT_EXTENSIONS[fmt])
+
+
+def remove_stale_artifacts(output_dir: str, stem: str, fmt: str) -> None:
+    """Delete ``stem`` in every format other than ``fmt`` from ``output_dir``.
+
+    Call before writing an artifact so a copy left by an earlier run in
+    another format cannot be resolved by :func:`find_artifact` instead.
+    """
+    for other in FORMAT_EXTENSIONS:
+        path = artifact_path(output_dir, stem, other)
+        if other != fmt and os.path.exists(path):
+            os.remove(path)
+
+
+def find_artifact(output_dir: str, stem: str) -> str | None:
+    """Locate ``stem`` in ``output_dir`` in any supported format.
+
+    Parameters
+    ----------
+    output_dir : str
+        Run directory to search.
+    stem : str
+        File name without extension, e.g. ``"baseline_forecasts"``.
+
+    Returns
+    -------
+    str or None
+        Path of the most recently written file, preferring columnar formats
+        on ties, or ``None`` if the artifact is missing.
+    """
+    found = []
+    for rank, fmt in enumerate(_RESOLVE_ORDER):
+        path = artifact_path(output_dir, stem, fmt)
+        try:
+            found.append((-os.stat(path).st_mtime_ns, rank, path))
+        except FileNotFoundError:
+            continue
+    return min(found)[2] if found else None
+
+
+def _id_filter(unique_ids: Sequence[str] | None):
+    import pyarrow.dataset as pds
+
+    if unique_ids is None:
+        return None
+    return pds.field("unique_id").isin(list(unique_ids))
+
+
+def read_frame(
+    path: str,
+    columns: Sequence[str] | None = None,
+    unique_ids: Sequence[str] | None = None,
+    fmt: str | None = None,
+    categorical_ids: bool = False,
+) -> pd.DataFrame:
+    """Read a long-format frame with a typed ``ds`` column.
+
+    Parameters
+    ----------
+    path : str
+        File to read.
+    columns : sequence of str, optional
+        Columns to load. Parquet and Feather only read these columns from disk.
+    unique_ids : sequence of str, optional
+        Restrict the result to these series. For Parquet and Feather the
+        predicate is pushed down to the Arrow scanner so non-matching row
+        groups are skipped; CSV files are filtered after parsing.
+    fmt : str, optional
+        Override the format inferred from the file extension.
+    categorical_ids : bool, optional
+        Decode ``unique_id`` straight into a pandas ``Categorical`` instead of
+        one Python string per row (see
+        :func:`forecastkernel.utils.dtypes.compact_ids` for sorted categories).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Loaded data with ``ds`` as ``datetime64`` when present.
+    """
+    fmt = fmt or infer_format(path)
+    columns = list(columns) if columns is not None else None
+
+    if fmt == "csv":
+        header = pd.read_csv(path, nrows=0).columns
+        wanted = header if columns is None else [c for c in header if c in columns]
+        df = pd.read_csv(
+            path,
+            usecols=columns,
+            parse_dates=["ds"] if "ds" in wanted else None,
+            dtype=_csv_dtypes(wanted, categorical_ids),
+        )
+        if unique_ids is not None:
+            df = df[df["unique_id"].isin(list(unique_ids))].reset_index(drop=True)
+    else:
+        import pyarrow.dataset as pds
+
+        dataset = pds.dataset(path, format="parquet" if fmt == "parquet" else "feather")
+        table = dataset.to_table(columns=columns, filter=_id_filter(unique_ids))
+        categories = ["unique_id"] if categorical_ids and "unique_id" in table.column_names else None
+        df = table.to_pandas(categories=categories)
+
+    if "ds" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["ds"]):
+        df["ds"] = pd.to_datetime(df["ds"])
+    return df
+
+
+def write_frame(df: pd.DataFrame, path: str, fmt: str | None = None) -> str:
+    """Write ``df`` in the format implied by ``path``.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Frame to persist. The index is not written.
+    path : str
+        Destination file.
+    fmt : str, optional
+        Override the format inferred from the file extension.
+
+    Returns
+    -------
+    str
+        The path written.
+    """
+    fmt = fmt or infer_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+    return path
+
+
+def iter_frame_batches(
+    path: str, batch_rows: int, columns: Sequence[str] | None = None, fmt: str | None = None
+) -> Iterator[pd.DataFrame]:
+    """Yield ``path`` in blocks of roughly ``batch_rows`` rows.
+
+    Parameters
+    ----------
+    path : str
+        File to stream.
+    batch_rows : int
+        Target rows per yielded frame.
+    columns : sequence of str, optional
+        Columns to load.
+    fmt : str, optional
+        Override the format inferred from the file extension.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Consecutive row blocks with a typed ``ds`` column. ``unique_id`` is
+        read from CSV as strings and ``y`` as ``float64`` in every format, so
+        all blocks share one schema whatever values they hold.
+    """
+    fmt = fmt or infer_format(path)
+    if fmt == "csv":
+        header = pd.read_csv(path, nrows=0).columns
+        wanted = header if columns is None else [c for c in header if c in columns]
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=batch_rows, dtype=_csv_dtypes(wanted)):
+            if "ds" in chunk.columns:
+                chunk["ds"] = pd.to_datetime(chunk["ds"])
+            yield chunk
+        return
+
+    import pyarrow.dataset as pds
+
+    dataset = pds.dataset(path, format="parquet" if fmt == "parquet" else "feather")
+    for batch in dataset.to_batches(columns=list(columns) if columns else None, batch_size=batch_rows):
+        if batch.num_rows:
+            chunk = batch.to_pandas()
+            if "y" in chunk.columns:
+                chunk["y"] = chunk["y"].astype("float64")
+            yield chunk
+
+
+def iter_series_chunks(
+    path: str, chunk_rows: int, columns: Sequence[str] | None = None, fmt: str | None = None
+) -> Iterator[pd.DataFrame]:
+    """Yield ``path`` in chunks of whole series.
+
+    Batches of about ``chunk_rows`` rows are read with
+    :func:`iter_frame_batches`; the rows of the last series in a batch are
+    held back and prepended to the next one, so no series is split. A series
+    longer than ``chunk_rows`` is yielded as a larger chunk of its own.
+
+    Parameters
+    ----------
+    path : str
+        File sorted by ``unique_id``.
+    chunk_rows : int
+        Target rows per chunk.
+    columns : sequence of str, optional
+        Columns to load; must include ``unique_id``.
+    fmt : str, optional
+        Override the format inferred from the file extension.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Consecutive chunks with disjoint, ascending series.
+
+    Raises
+    ------
+    ValueError
+        If the file is not sorted by ``unique_id``.
+    """
+    carry = None
+    for batch in iter_frame_batches(path, chunk_rows, columns=columns, fmt=fmt):
+        if carry is not None:
+            batch = pd.concat([carry, batch], ignore_index=True)
+        ids = batch["unique_id"]
+        if not ids.is_monotonic_increasing:
+            raise ValueError(f"{path} must be sorted by unique_id to be read in chunks.")
+        # Rows of the last series may continue in the next batch
+        boundary = int(ids.searchsorted(ids.iloc[-1], side="left"))
+        carry = batch.iloc[boundary:].reset_index(drop=True)
+        if boundary:
+            yield batch.iloc[:boundary].reset_index(drop=True)
+    if carry is not None and len(carry):
+        yield carry
+
+
+def append_frame(df: pd.DataFrame, path: str, writers: dict, fmt: str | None = None) -> None:
+    """Append ``df`` to ``path``, creating the file on the first call.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Rows to append. Later frames are cast to the schema of the first.
+    path : str
+        Destination file; CSV, Parquet (one row group per call) or Feather.
+    writers : dict
+        Open writers keyed by path, shared between calls. Pass it to
+        :func:`close_frame_writers` once all rows are written.
+    fmt : str, optional
+        Override the format inferred from the file extension.
+    """
+    fmt = fmt or infer_format(path)
+    if fmt == "csv":
+        df.to_csv(path, mode="a" if path in writers else "w", header=path not in writers, index=False)
+        writers[path] = None
+        return
+
+    import pyarrow as pa
+
+    if path in writers:
+        writer, schema = writers[path]
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            writer = pq.ParquetWriter(path, table.schema)
+        else:
+            writer = pa.ipc.new_file(path, table.schema)
+        writers[path] = (writer, table.schema)
+    writer.write_table(table)
+
+
+def close_frame_writers(writers: dict) -> None:
+    """Close the writers opened by :func:`append_frame`."""
+    for entry in writers.values():
+        if entry is not None:
+            entry[0].close()
+    writers.clear()
@@ -32,3 +32,42 @@ def setup_logger(log_path: str | None = None, logger_name: str = "forecast") ->
         handlers=handlers
     )
     return logging.getLogger(logger_name)
+
+
+def setup_run_logger(log_path: str, logger_name: str = "forecast") -> logging.Logger:
+    """Return a child logger writing to its own ``log_path``.
+
+    Several runs in one process (e.g. a cascade) each keep a separate log
+    file, while console output still goes through the root handlers set up
+    by :func:`setup_logger`.
+
+    Parameters
+    ----------
+    log_path : str
+        File receiving this run's records. Handlers left over from an earlier
+        run with the same path are replaced.
+    logger_name : str, optional
+        Parent logger name.
+
+    Returns
+    -------
+    logging.Logger
+        Logger named after ``logger_name`` and the absolute ``log_path``.
+    """
+    setup_logger(None, logger_name)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    child = os.path.abspath(log_path).replace(".", "_")
+    logger = logging.getLogger(logger_name).getChild(child)
+    close_run_logger(logger)
+
+    handler = logging.FileHandler(log_path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+def close_run_logger(logger: logging.Logger) -> None:
+    """Detach and close the file handlers of a :func:`setup_run_logger` logger."""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
@@ -0,0 +1,204 @@
+"""Parallel, cached hashing of run artifacts for audit manifests.
+
+An audit manifest maps file names relative to a run directory to digests::
+
+    {"algorithm": "blake2b", "files": {"baseline_metrics.json": "9f2c..."}}
+
+Manifests without ``algorithm`` (older audit logs) use SHA256. Files are
+hashed in a thread pool, since :mod:`hashlib` releases the GIL while digesting
+large buffers. Every file is read unless a stat cache file is passed: digests
+are then reused for files whose size, modification time and inode are
+unchanged. A stat cache cannot see a rewrite that keeps those, so it is
+opt-in and is kept outside the directory it describes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from forecastkernel.utils.hash_utils import compute_file_hash
+from forecastkernel.utils.profiling import profiled
+
+DEFAULT_ALGORITHM = "sha256"
+# A file written within this window of being hashed may change again without
+# its mtime moving, so its digest is not cached
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def load_hash_cache(path: str) -> dict:
+    """Return the cache stored at ``path``, or an empty one if unreadable."""
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_hash_cache(cache: dict, path: str) -> None:
+    """Write ``cache`` to ``path`` atomically."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def hash_files(
+    base_dir: str,
+    names: list[str],
+    algorithm: str = DEFAULT_ALGORITHM,
+    max_workers: int | None = None,
+    cache: dict | None = None,
+) -> dict:
+    """Hash ``names`` below ``base_dir`` concurrently.
+
+    Parameters
+    ----------
+    base_dir : str
+        Directory the names are relative to.
+    names : list of str
+        Files to hash, using ``/`` as separator.
+    algorithm : str, optional
+        :mod:`hashlib` algorithm, e.g. ``"sha256"`` or the faster ``"blake2b"``.
+    max_workers : int, optional
+        Hashing threads. Defaults to ``min(8, cpu_count)``.
+    cache : dict, optional
+        Stat cache from :func:`load_hash_cache`, updated in place. Entries
+        whose size, mtime, inode and algorithm still match are reused.
+
+    Returns
+    -------
+    dict
+        Digest of every name in input order, ``None`` for missing files.
+    """
+    hashlib.new(algorithm)  # unknown algorithms fail before any file is read
+    started = time.time_ns()
+    digests, todo = {}, []
+    for name in names:
+        path = os.path.join(base_dir, *name.split("/"))
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            digests[name] = None
+            continue
+        key = [st.st_size, st.st_mtime_ns, st.st_ino, algorithm]
+        entry = cache.get(name) if cache is not None else None
+        if entry is not None and entry[:4] == key:
+            digests[name] = entry[4]
+        else:
+            todo.append((name, path, key))
+
+    def work(item):
+        return compute_file_hash(item[1], algorithm)
+
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    if len(todo) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(todo))) as pool:
+            results = list(pool.map(work, todo))
+    else:
+        results = [work(item) for item in todo]
+
+    for (name, _, key), digest in zip(todo, results):
+        digests[name] = digest
+        if cache is not None and key[1] < started - _RACY_WINDOW_NS:
+            cache[name] = key + [digest]
+    return {name: digests[name] for name in names}
+
+
+def _hash_with_cache(base_dir, names, algorithm, max_workers, cache_path) -> dict:
+    if cache_path is None:
+        return hash_files(base_dir, names, algorithm, max_workers)
+    base = os.path.realpath(base_dir)
+    if os.path.commonpath([base, os.path.realpath(cache_path)]) == base:
+        raise ValueError(f"Hash cache {cache_path} must be outside the audited directory {base_dir}.")
+    cache = load_hash_cache(cache_path)
+    before = dict(cache)
+    digests = hash_files(base_dir, names, algorithm, max_workers, cache)
+    if cache != before:
+        save_hash_cache(cache, cache_path)
+    return digests
+
+
+@profiled()
+def build_manifest(
+    base_dir: str,
+    names: list[str],
+    algorithm: str = DEFAULT_ALGORITHM,
+    max_workers: int | None = None,
+    cache_path: str | None = None,
+) -> dict:
+    """Return the manifest of ``names`` below ``base_dir``.
+
+    Parameters
+    ----------
+    base_dir : str
+        Run directory.
+    names : list of str
+        Files to record, relative to ``base_dir``.
+    algorithm : str, optional
+        Digest algorithm recorded in the manifest.
+    max_workers : int, optional
+        Hashing threads, see :func:`hash_files`.
+    cache_path : str, optional
+        Stat cache file to read and update, outside ``base_dir``.
+
+    Returns
+    -------
+    dict
+        ``{"algorithm": ..., "files": {name: digest}}``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If any of ``names`` does not exist.
+    """
+    digests = _hash_with_cache(base_dir, names, algorithm, max_workers, cache_path)
+    missing = [name for name, digest in digests.items() if digest is None]
+    if missing:
+        raise FileNotFoundError(f"Cannot hash missing files in {base_dir}: {missing}")
+    return {"algorithm": algorithm, "files": digests}
+
+
+def verify_manifest(
+    manifest: dict,
+    base_dir: str,
+    max_workers: int | None = None,
+    cache_path: str | None = None,
+) -> dict:
+    """Compare the files below ``base_dir`` with ``manifest``.
+
+    Parameters
+    ----------
+    manifest : dict
+        Audit log or manifest with ``files`` and optionally ``algorithm``.
+    base_dir : str
+        Directory containing the files.
+    max_workers : int, optional
+        Hashing threads, see :func:`hash_files`.
+    cache_path : str, optional
+        Stat cache file, outside ``base_dir``, whose digests are reused for
+        files with unchanged stats. By default every file is read, which is
+        what an integrity gate should do.
+
+    Returns
+    -------
+    dict
+        Mapping of file names to ``"Missing file"`` or to a dictionary with
+        ``expected`` and ``actual`` digests. Empty if all match.
+    """
+    expected = manifest.get("files", {})
+    algorithm = manifest.get("algorithm", DEFAULT_ALGORITHM)
+    digests = _hash_with_cache(base_dir, list(expected), algorithm, max_workers, cache_path)
+
+    mismatches = {}
+    for name, expected_hash in expected.items():
+        actual = digests[name]
+        if actual is None:
+            mismatches[name] = "Missing file"
+        elif actual != expected_hash:
+            mismatches[name] = {"expected": expected_hash, "actual": actual}
+    return mismatches
@@ -1,6 +1,8 @@
 import os
 import mlflow
 
+from forecastkernel.utils.io_utils import find_artifact
+
 
 def log_mlflow_metrics(run_id, df, h, metrics_dict, selected_model, pass_ci, output_path, phase):
     """Log metrics and artifacts for a StatsForecast baseline run.
@@ -26,7 +28,8 @@ def log_mlflow_metrics(run_id, df, h, metrics_dict, selected_model, pass_ci, out
 
     Returns
     -------
-    None
+    str
+        Identifier of the MLflow run, see :func:`log_mlflow_timings`.
     """
     # Route logs to hidden subfolder to avoid root clutter
     tracking_dir = os.getenv("MLFLOW_TRACKING_URI", "file:./.mlflow_logs")
@@ -55,5 +58,35 @@ def log_mlflow_metrics(run_id, df, h, metrics_dict, selected_model, pass_ci, out
                 mlflow.log_artifact(path)
 
         safe_log(os.path.join(output_path, "baseline_metrics.json"))
-        safe_log(os.path.join(output_path, "baseline_forecasts.csv"))
+        forecast_file = find_artifact(output_path, "baseline_forecasts")
+        if forecast_file:
+            safe_log(forecast_file)
         safe_log(os.path.join(output_path, "run_info.json"))
+        return run.info.run_id
+
+
+def log_mlflow_timings(mlflow_run_id: str, timings: dict, timings_path: str | None = None) -> None:
+    """Add stage timings to a finished run of :func:`log_mlflow_metrics`.
+
+    Parameters
+    ----------
+    mlflow_run_id : str
+        Identifier returned by :func:`log_mlflow_metrics`.
+    timings : dict
+        Payload of ``timings.json``, see
+        :func:`forecastkernel.utils.profiling.profile_run`. Every stage is
+        logged as ``timing/<stage>/<stat>`` metrics.
+    timings_path : str, optional
+        ``timings.json`` file to attach as an artifact.
+
+    Returns
+    -------
+    None
+    """
+    from forecastkernel.utils.profiling import timing_metrics
+
+    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "file:./.mlflow_logs"))
+    with mlflow.start_run(run_id=mlflow_run_id):
+        mlflow.log_metrics(timing_metrics(timings))
+        if timings_path and os.path.exists(timings_path):
+            mlflow.log_artifact(timings_path)
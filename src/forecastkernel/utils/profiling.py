@@ -0,0 +1,262 @@
+"""Stage timings for pipeline runs.
+
+A run is wrapped in :func:`profile_run`; inside it, :func:`span` blocks (or
+functions decorated with :func:`profiled`) record their wall time, CPU time
+of this process and of reaped child processes, peak resident set size and
+row counts. Nested spans are named by path (``"evaluate/compute_file_hash"``)
+and repeated spans of the same name are summed, so a stage run once per chunk
+is reported once. Spans outside a profiled run cost one context variable
+lookup.
+
+The active run is held in a :class:`contextvars.ContextVar`: threads start
+without one, so concurrent runs in one process (see
+:mod:`forecastkernel.scripts.cascade`) record separately. CPU time and memory
+are per process, so they include everything the process did during a span.
+
+Peak memory is the high-water mark of the resident set size. Where the
+kernel allows it (Linux ``/proc/self/clear_refs``) the mark is reset at every
+span boundary and each span gets its own peak; elsewhere a span reports the
+process peak so far and ``timings.json`` records ``"peak_rss_per_span":
+false``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TIMINGS_FILE = "timings.json"
+
+_CURRENT = contextvars.ContextVar("forecastkernel_profile", default=None)
+# Open spans of every run in the process: peak readings are shared by all of
+# them before the high-water mark is reset
+_OPEN_SPANS: dict[int, dict] = {}
+_RSS_LOCK = threading.Lock()
+_CLEAR_REFS = "/proc/self/clear_refs"
+_CAN_RESET_PEAK = sys.platform.startswith("linux") and os.access(_CLEAR_REFS, os.W_OK)
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _children_cpu() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _record_peak() -> None:
+    """Fold the current high-water mark into all open spans and reset it."""
+    with _RSS_LOCK:
+        peak = _peak_rss_mb()
+        for record in _OPEN_SPANS.values():
+            record["peak"] = max(record["peak"], peak)
+        if _CAN_RESET_PEAK:
+            try:
+                with open(_CLEAR_REFS, "w") as f:
+                    f.write("5")
+            except OSError:
+                pass
+
+
+def _stage(profile: dict, name: str) -> dict:
+    with profile["lock"]:
+        if name not in profile["stages"]:
+            profile["stages"][name] = {
+                "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "children_cpu_s": 0.0,
+                "peak_rss_mb": 0.0, "rows": None,
+            }
+        return profile["stages"][name]
+
+
+@contextmanager
+def _measure(profile: dict, name: str, info: dict):
+    stats = _stage(profile, name)
+    _record_peak()
+    record = {"peak": 0.0}
+    with _RSS_LOCK:
+        _OPEN_SPANS[id(record)] = record
+    wall, cpu, children = time.perf_counter(), time.process_time(), _children_cpu()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        children = _children_cpu() - children
+        _record_peak()
+        with _RSS_LOCK:
+            del _OPEN_SPANS[id(record)]
+        with profile["lock"]:
+            stats["calls"] += 1
+            stats["wall_s"] += wall
+            stats["cpu_s"] += cpu
+            stats["children_cpu_s"] += children
+            stats["peak_rss_mb"] = max(stats["peak_rss_mb"], record["peak"])
+            if info["rows"] is not None:
+                stats["rows"] = (stats["rows"] or 0) + int(info["rows"])
+
+
+@contextmanager
+def span(stage: str, rows: int | None = None):
+    """Time the enclosed block as ``stage`` of the active run.
+
+    Parameters
+    ----------
+    stage : str
+        Stage name, nested below the enclosing span.
+    rows : int, optional
+        Rows processed by the stage. Can also be set on the yielded dict as
+        ``info["rows"] = n`` once known.
+
+    Yields
+    ------
+    dict
+        Mutable ``{"rows": ...}`` annotations of this call.
+    """
+    current = _CURRENT.get()
+    info = {"rows": rows}
+    if current is None:
+        yield info
+        return
+    profile, prefix = current
+    name = f"{prefix}/{stage}" if prefix else stage
+    token = _CURRENT.set((profile, name))
+    try:
+        with _measure(profile, name, info):
+            yield info
+    finally:
+        _CURRENT.reset(token)
+
+
+def profiled(stage: str | None = None):
+    """Decorate a function so every call is a :func:`span` (named after it by default)."""
+    def decorate(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def annotate(**values) -> None:
+    """Attach ``values`` to the ``metadata`` of the active run, if any."""
+    current = _CURRENT.get()
+    if current is not None:
+        current[0]["metadata"].update(values)
+
+
+@contextmanager
+def profile_run(label: str, timings_path: str | None, cprofile: bool = False):
+    """Profile a run and write its stage timings to ``timings_path``.
+
+    Parameters
+    ----------
+    label : str
+        Name of the run, e.g. the command.
+    timings_path : str or None
+        JSON file receiving the timings, also written when the run fails.
+        ``None`` keeps them in memory only.
+    cprofile : bool, optional
+        Also run :mod:`cProfile` in this thread and dump its statistics next
+        to ``timings_path`` (``.pstats`` and a ``.txt`` summary sorted by
+        cumulative time).
+
+    Yields
+    ------
+    dict
+        The profile; after the block ``profile["result"]`` holds the
+        ``timings.json`` payload.
+    """
+    profile = {
+        "label": label,
+        "stages": {},
+        "metadata": {},
+        "lock": threading.Lock(),
+        "result": None,
+    }
+    profiler = None
+    if cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:  # another profiler is active in this process
+            profile["metadata"]["cprofile_error"] = str(exc)
+            profiler = None
+
+    status = "failed"
+    token = _CURRENT.set((profile, ""))
+    try:
+        with _measure(profile, "total", {"rows": None}):
+            yield profile
+        status = "completed"
+    finally:
+        _CURRENT.reset(token)
+        if profiler is not None:
+            profiler.disable()
+        profile["result"] = _finish(profile, status, timings_path, profiler)
+
+
+def _finish(profile: dict, status: str, timings_path: str | None, profiler) -> dict:
+    stages = []
+    for name, stats in profile["stages"].items():
+        entry = {"stage": name, **stats}
+        for key in ("wall_s", "cpu_s", "children_cpu_s", "peak_rss_mb"):
+            entry[key] = round(entry[key], 4)
+        stages.append(entry)
+    payload = {
+        "label": profile["label"],
+        "status": status,
+        "timestamp": datetime.now().isoformat(),
+        "pid": os.getpid(),
+        "peak_rss_per_span": _CAN_RESET_PEAK,
+        "metadata": profile["metadata"],
+        "stages": stages,
+    }
+    if timings_path:
+        directory = os.path.dirname(timings_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        if profiler is not None:
+            import pstats
+
+            base = os.path.splitext(timings_path)[0]
+            profiler.dump_stats(f"{base}.pstats")
+            with open(f"{base}.txt", "w") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(60)
+            payload["cprofile"] = f"{base}.pstats"
+        tmp_path = f"{timings_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, timings_path)
+    return payload
+
+
+def timing_metrics(payload: dict) -> dict:
+    """Flatten a ``timings.json`` payload into ``timing/<stage>/<stat>`` metrics."""
+    metrics = {}
+    for entry in payload["stages"]:
+        for key in ("wall_s", "cpu_s", "children_cpu_s", "peak_rss_mb", "rows"):
+            if entry.get(key) is not None:
+                metrics[f"timing/{entry['stage']}/{key}"] = float(entry[key])
+    return metrics
@@ -0,0 +1,248 @@
+"""Disk usage accounting for data and output directories.
+
+Directory trees are listed with :func:`os.scandir`, so each file costs a
+single ``lstat``. Hard-linked files (e.g. a DVC cache linked into the
+workspace) are counted once, and symbolic links are not followed. The
+listing of every directory is kept in a snapshot together with the
+directory's mtime, so a later scan only re-lists directories whose entries
+were added, removed or renamed. Files rewritten in place do not change their
+directory's mtime, so the files of a reused listing are still ``lstat``-ed
+for their current size; only the ``listdir`` is saved. Pass ``full=True`` to
+:func:`scan_storage` to re-list everything.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import time
+
+SNAPSHOT_VERSION = 1
+# Directories modified this close to the scan may change again without their
+# mtime moving, so they are re-listed next time
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def load_snapshot(path: str) -> dict:
+    """Return the directory listings saved at ``path``, or an empty snapshot."""
+    try:
+        with open(path, "r") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return {}
+    return snapshot.get("directories", {})
+
+
+def save_snapshot(directories: dict, path: str) -> None:
+    """Write directory listings to ``path`` atomically."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": SNAPSHOT_VERSION, "directories": directories}, f)
+    os.replace(tmp_path, path)
+
+
+def _normalise_roots(roots: list[str]) -> list[str]:
+    """Return absolute roots, dropping missing and nested ones."""
+    roots = sorted({os.path.abspath(r) for r in roots if os.path.isdir(r)})
+    kept = []
+    for root in roots:
+        if not any(os.path.commonpath([root, outer]) == outer for outer in kept):
+            kept.append(root)
+    return kept
+
+
+def _list_directory(path: str, st: os.stat_result, started: int) -> dict:
+    files, subdirs = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    fst = entry.stat(follow_symlinks=False)
+                    files.append([entry.name, fst.st_size, fst.st_ino, fst.st_nlink])
+            except FileNotFoundError:  # removed while scanning
+                continue
+    mtime = st.st_mtime_ns if st.st_mtime_ns < started - _RACY_WINDOW_NS else -1
+    return {"mtime_ns": mtime, "dev": st.st_dev, "files": files, "subdirs": subdirs}
+
+
+def _refresh_files(path: str, record: dict) -> dict:
+    """Return ``record`` with current sizes of its files, which may have been rewritten."""
+    files = []
+    for name, *_ in record["files"]:
+        try:
+            fst = os.lstat(os.path.join(path, name))
+        except FileNotFoundError:
+            continue
+        files.append([name, fst.st_size, fst.st_ino, fst.st_nlink])
+    return {**record, "files": files}
+
+
+def scan_storage(
+    roots: list[str], previous: dict | None = None, full: bool = False
+) -> tuple[dict, dict]:
+    """List every directory below ``roots``, reusing unchanged listings.
+
+    Parameters
+    ----------
+    roots : list of str
+        Directories to account for. Missing roots are skipped and roots
+        nested inside another root are only scanned once. Listings are
+        keyed by absolute path.
+    previous : dict, optional
+        Directory listings from an earlier scan (:func:`load_snapshot`).
+    full : bool, optional
+        Ignore ``previous`` and re-list every directory.
+
+    Returns
+    -------
+    tuple[dict, dict]
+        Listings of all directories found, keyed by path, and scan counters
+        ``dirs_listed`` and ``dirs_reused``.
+    """
+    previous = {} if previous is None or full else previous
+    started = time.time_ns()
+    directories = {}
+    listed = reused = 0
+    stack = _normalise_roots(roots)
+    while stack:
+        path = stack.pop()
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        record = previous.get(path)
+        if record is not None and record["mtime_ns"] == st.st_mtime_ns:
+            record = _refresh_files(path, record)
+            reused += 1
+        else:
+            record = _list_directory(path, st, started)
+            listed += 1
+        directories[path] = record
+        stack.extend(os.path.join(path, name) for name in record["subdirs"])
+    return directories, {"dirs_listed": listed, "dirs_reused": reused}
+
+
+_SUFFIX_PATTERN = re.compile(r"\*(\.[^*?\[\]/]+)")
+
+
+def _compile_types(artifact_types: dict) -> list[tuple]:
+    """Turn ``{type: [glob, ...]}`` into matchers.
+
+    Patterns containing ``/`` match the file path, others the file name.
+    Plain ``*.ext`` patterns become a suffix set, which is much cheaper to
+    test than a regex; the remaining patterns are joined into one regex.
+    """
+    compiled = []
+    for name, patterns in artifact_types.items():
+        suffixes = tuple(m.group(1) for p in patterns if (m := _SUFFIX_PATTERN.fullmatch(p)))
+        by_name = [fnmatch.translate(p) for p in patterns if "/" not in p and not _SUFFIX_PATTERN.fullmatch(p)]
+        by_path = [fnmatch.translate(p) for p in patterns if "/" in p]
+        compiled.append((
+            name,
+            suffixes,
+            re.compile("|".join(by_name)) if by_name else None,
+            re.compile("|".join(by_path)) if by_path else None,
+        ))
+    return compiled
+
+
+def _classify(types: list[tuple], path: str, name: str) -> str:
+    for kind, suffixes, name_re, path_re in types:
+        if suffixes and name.endswith(suffixes):
+            return kind
+        if name_re is not None and name_re.match(name):
+            return kind
+        if path_re is not None and path_re.match(os.path.join(path, name).replace(os.sep, "/")):
+            return kind
+    return "other"
+
+
+def summarize_storage(
+    directories: dict,
+    roots: list[str],
+    artifact_types: dict | None = None,
+    depth: int = 1,
+) -> dict:
+    """Aggregate listings into totals per directory and artifact type.
+
+    Parameters
+    ----------
+    directories : dict
+        Listings from :func:`scan_storage`.
+    roots : list of str
+        The scanned roots, used for the directory breakdown.
+    artifact_types : dict, optional
+        ``{type: [glob, ...]}``. A file belongs to the first type with a
+        matching pattern, otherwise to ``"other"``.
+    depth : int, optional
+        Path components below each root reported in the breakdown.
+
+    Returns
+    -------
+    dict
+        ``total_bytes``, ``n_files``, ``directories`` (bytes below each
+        directory ``depth`` levels under a root; files in shallower
+        directories count towards that directory) and ``artifact_types``
+        (bytes per type).
+    """
+    types = _compile_types(artifact_types or {})
+    roots = _normalise_roots(roots)
+    seen_links = set()
+    total = n_files = 0
+    by_dir, by_type = {}, {}
+    for path, record in directories.items():
+        root = next((r for r in roots if os.path.commonpath([path, r]) == r), None)
+        if root is None:
+            continue
+        parts = os.path.relpath(path, root).split(os.sep)
+        parts = [] if parts == ["."] else parts
+        bucket = os.path.join(root, *parts[:depth])
+        dir_bytes = 0
+        for name, size, ino, nlink in record["files"]:
+            if nlink > 1:
+                key = (record["dev"], ino)
+                if key in seen_links:
+                    continue
+                seen_links.add(key)
+            dir_bytes += size
+            n_files += 1
+            kind = _classify(types, path, name) if types else "other"
+            by_type[kind] = by_type.get(kind, 0) + size
+        total += dir_bytes
+        by_dir[bucket] = by_dir.get(bucket, 0) + dir_bytes
+    return {
+        "total_bytes": total,
+        "n_files": n_files,
+        "directories": {d: b for d, b in sorted(by_dir.items(), key=lambda kv: -kv[1]) if b},
+        "artifact_types": dict(sorted(by_type.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def check_budgets(summary: dict, budgets: dict) -> dict:
+    """Compare a summary with byte budgets.
+
+    Parameters
+    ----------
+    summary : dict
+        Output of :func:`summarize_storage`.
+    budgets : dict
+        ``{"total": bytes, type: bytes, ...}``.
+
+    Returns
+    -------
+    dict
+        Budgets that are exceeded, mapped to ``{"used": ..., "limit": ...}``.
+    """
+    exceeded = {}
+    for name, limit in budgets.items():
+        used = summary["total_bytes"] if name == "total" else summary["artifact_types"].get(name, 0)
+        if used > limit:
+            exceeded[name] = {"used": used, "limit": limit}
+    return exceeded
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.accumulators import block_moments, merge_moments, moment_stats
+from forecastkernel.core.decomposition import (
+    breakdown_from_moments,
+    decompose_errors,
+    error_moments,
+    merge_error_moments,
+)
+from forecastkernel.core.dm_test import (
+    accumulate_dm_tests,
+    finalize_dm_tests,
+    merge_dm_accumulators,
+    panel_dm_test,
+    summarize_dm_tests,
+)
+from forecastkernel.core.evaluation import evaluate_forecasts, metrics_from_moments
+
+
+def _residuals(n_series: int = 6, length: int = 20) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n = n_series * length
+    return pd.DataFrame({
+        "unique_id": np.repeat([f"s{i}" for i in range(n_series)], length),
+        "ds": np.tile(pd.date_range("2024-01-01", periods=length), n_series),
+        "A": rng.normal(1.0, 2.0, n),
+        "B": rng.normal(-0.5, 1.0, n),
+    })
+
+
+def _halves(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    cut = df["unique_id"].searchsorted("s2")
+    return df.iloc[:cut], df.iloc[cut:]
+
+
+def test_merged_moments_match_single_pass() -> None:
+    values = np.random.default_rng(0).normal(1e6, 1.0, size=(1000, 3))
+    values[5, 1] = np.nan
+    merged = block_moments(values[:10])
+    for start in range(10, 1000, 97):
+        merged = merge_moments(merged, block_moments(values[start:start + 97]))
+
+    stats = moment_stats(merged)
+    np.testing.assert_allclose(stats["mean"], np.nanmean(values, axis=0))
+    np.testing.assert_allclose(stats["var"], np.nanvar(values, axis=0), rtol=1e-9)
+    np.testing.assert_array_equal(stats["n"], [1000, 999, 1000])
+
+
+def test_chunked_metrics_match_full_evaluation() -> None:
+    df = _residuals()
+    forecasts = df[["unique_id", "ds"]].assign(A=df["A"], B=df["B"])
+    actuals = df[["unique_id", "ds"]].assign(y=0.0)
+    full, resid = evaluate_forecasts(forecasts, actuals, ["A", "B"], "")
+
+    first, second = _halves(resid)
+    moments = merge_moments(block_moments(first[["A", "B"]]), block_moments(second[["A", "B"]]))
+    pd.testing.assert_frame_equal(metrics_from_moments(moments, ["A", "B"]), full)
+
+
+def test_chunked_decomposition_and_dm_match_full() -> None:
+    df = _residuals()
+    first, second = _halves(df)
+
+    errors = merge_error_moments(error_moments(first, ["A", "B"]), error_moments(second, ["A", "B"]))
+    bias = moment_stats(errors["residuals"])["mean"]
+    spread = merge_moments(
+        block_moments(np.abs(first[["A", "B"]].to_numpy() - bias)),
+        block_moments(np.abs(second[["A", "B"]].to_numpy() - bias)),
+    )
+    breakdown = breakdown_from_moments(errors, ["A", "B"], moment_stats(spread)["mean"])
+    assert breakdown == decompose_errors(df, ["A", "B"])
+
+    pooled = merge_dm_accumulators(
+        accumulate_dm_tests(panel_dm_test(first, ["A", "B"])),
+        accumulate_dm_tests(panel_dm_test(second, ["A", "B"])),
+    )
+    pd.testing.assert_frame_equal(
+        finalize_dm_tests(pooled), summarize_dm_tests(panel_dm_test(df, ["A", "B"]))
+    )
@@ -18,6 +18,23 @@ def test_compute_anchor_bias() -> None:
     assert bias.iloc[0] == 2.0
 
 
+def test_compute_anchor_bias_with_mapping() -> None:
+    atomic = pd.DataFrame({
+        "unique_id": ["s1", "s2", "s3"],
+        "ds": [pd.Timestamp("2023-01-01")] * 3,
+        "model_a": [4.0, 5.0, 7.0],
+    })
+    anchor = pd.DataFrame({
+        "unique_id": ["A", "B"],
+        "ds": [pd.Timestamp("2023-01-01")] * 2,
+        "model_a": [10.0, 6.0],
+    })
+    bias = compute_anchor_bias(atomic, anchor, "model_a", {"s1": "A", "s2": "A", "s3": "B"})
+    assert bias.tolist() == [-1.0, 1.0]
+    with pytest.raises(ValueError):
+        compute_anchor_bias(atomic, anchor, "model_a", {"s1": "A"})
+
+
 def test_enforce_cascade_checks(tmp_path) -> None:
     parent = tmp_path / "parent"
     parent.mkdir()
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.core.backtest import (
+    WINDOW_FILE, backtest_residuals, run_backtest_windows, score_backtest,
+)
+
+
+def _window(tmp_path, window: int, y: list, pred: list) -> str:
+    df = pd.DataFrame({
+        "window": window,
+        "unique_id": ["A", "A", "B", "B"],
+        "ds": pd.date_range("2024-01-01", periods=2).tolist() * 2,
+        "y": y,
+        "m": pred,
+    })
+    path = tmp_path / WINDOW_FILE.format(window)
+    df.to_parquet(path, index=False)
+    return str(path)
+
+
+def test_score_backtest_pools_windows(tmp_path) -> None:
+    paths = [
+        _window(tmp_path, 0, [1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 3.0, 3.0]),
+        _window(tmp_path, 1, [1.0, 2.0, 3.0, 4.0], [2.0, 3.0, 4.0, 5.0]),
+    ]
+    series_path = tmp_path / "series.parquet"
+    pooled, per_window = score_backtest(paths, ["m"], series_metrics_path=str(series_path))
+
+    resid = np.array([0, 1, 0, 1, -1, -1, -1, -1], dtype=float)
+    assert np.isclose(pooled.loc[0, "mae"], np.abs(resid).mean())
+    assert np.isclose(pooled.loc[0, "bias"], resid.mean())
+    assert per_window["window"].tolist() == [0, 1]
+    assert np.allclose(per_window["bias"], [0.5, -1.0])
+
+    series = pd.read_parquet(series_path)
+    assert len(series) == 4
+    assert series.loc[(series["window"] == 0) & (series["unique_id"] == "A"), "mae"].item() == 0.5
+
+
+def test_backtest_residuals_centres_each_window(tmp_path) -> None:
+    path = _window(tmp_path, 0, [1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 1.0, 1.0])
+    raw = backtest_residuals([path], ["m"])
+    assert raw["m"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    centred = backtest_residuals([path], ["m"], center=True)
+    assert centred["m"].tolist() == [-0.5, 0.5, -0.5, 0.5]
+    assert centred[["unique_id", "ds"]].equals(raw[["unique_id", "ds"]])
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_backtest_windows_skips_unfittable_optional_origins(tmp_path, max_workers) -> None:
+    from statsforecast.models import HoltWinters, Naive
+
+    h = 7
+    panel = pd.DataFrame({
+        "unique_id": "A",
+        "ds": pd.date_range("2024-01-01", periods=35, freq="D"),
+        "y": np.random.default_rng(0).gamma(2.0, 10.0, 35),
+    })
+    models = [Naive(), HoltWinters(season_length=12)]
+    # The earliest origin leaves 14 observations, too few for HoltWinters
+    paths = run_backtest_windows(
+        panel, models, h, 3, str(tmp_path / "backtest"), max_workers=max_workers, required_windows=1,
+    )
+    assert [p.rsplit("/", 1)[-1] for p in paths] == [WINDOW_FILE.format(w) for w in (1, 2)]
+
+    with pytest.raises(Exception, match="no model able to be fitted"):
+        run_backtest_windows(panel, models, h, 3, str(tmp_path / "strict"), max_workers=max_workers)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_backtest_windows_cuts_at_each_origin(tmp_path, max_workers) -> None:
+    from statsforecast.models import Naive, SeasonalNaive
+
+    h, n_windows = 3, 3
+    end = pd.Timestamp("2024-03-01")
+    panel = pd.concat([
+        pd.DataFrame({
+            "unique_id": uid,
+            "ds": pd.date_range(end=end, periods=length, freq="D"),
+            "y": np.arange(length, dtype=float) * scale,
+        })
+        for uid, length, scale in [("A", 30, 1.0), ("B", 20, 10.0)]
+    ], ignore_index=True)
+
+    paths = run_backtest_windows(
+        panel, [Naive(), SeasonalNaive(season_length=2)], h, n_windows,
+        str(tmp_path / "backtest"), max_workers=max_workers,
+    )
+    assert [p.rsplit("/", 1)[-1] for p in paths] == [WINDOW_FILE.format(w) for w in range(n_windows)]
+
+    actual = panel.set_index(["unique_id", "ds"])["y"]
+    for window, path in enumerate(paths):
+        cv = pd.read_parquet(path)
+        assert (cv["window"] == window).all()
+        assert cv.groupby("unique_id").size().to_dict() == {"A": h, "B": h}
+        # Origins step back h days per window; the last one is the holdout
+        cutoff = end - pd.Timedelta(days=(n_windows - window) * h)
+        assert (pd.to_datetime(cv["cutoff"]) == cutoff).all()
+        assert (pd.to_datetime(cv["ds"]) > cutoff).all()
+        assert (pd.to_datetime(cv["ds"]) <= cutoff + pd.Timedelta(days=h)).all()
+        # Naive repeats the last training value, so any holdout row leaking
+        # into training would move it past the value at the cutoff
+        keys = list(zip(cv["unique_id"], pd.to_datetime(cv["ds"])))
+        assert np.allclose(cv["y"], actual.loc[keys])
+        at_cutoff = actual.loc[list(zip(cv["unique_id"], [cutoff] * len(cv)))].to_numpy()
+        assert np.allclose(cv["Naive"], at_cutoff)
+        assert np.allclose(cv["ensemble_naive"], (cv["Naive"] + cv["SeasonalNaive"]) / 2)
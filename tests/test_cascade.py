@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+import forecastkernel.scripts.baseline_sf as baseline_sf
+from forecastkernel.scripts.cascade import load_cascade_spec, run_cascade
+
+
+def _write_spec(tmp_path, body: str) -> str:
+    path = tmp_path / "cascade.yaml"
+    path.write_text(body)
+    return str(path)
+
+
+def test_load_cascade_spec_validates_parents(tmp_path) -> None:
+    levels, defaults = load_cascade_spec(_write_spec(tmp_path, """
+defaults: {horizon: 3}
+levels:
+  - {name: L1, data: a.csv, output_dir: out/L1}
+  - {name: L2, parent: L1, data: a.csv, output_dir: out/L2}
+"""))
+    assert [level["name"] for level in levels] == ["L1", "L2"]
+    assert defaults == {"horizon": 3}
+
+    with pytest.raises(ValueError, match="Unknown parent"):
+        load_cascade_spec(_write_spec(tmp_path, """
+levels:
+  - {name: L2, parent: L1, data: a.csv, output_dir: out/L2}
+"""))
+    with pytest.raises(ValueError, match="cycle"):
+        load_cascade_spec(_write_spec(tmp_path, """
+levels:
+  - {name: A, parent: B, data: a.csv, output_dir: out/A}
+  - {name: B, parent: A, data: a.csv, output_dir: out/B}
+"""))
+
+
+def test_run_cascade_shares_frames_and_anchors(tmp_path, monkeypatch) -> None:
+    data = tmp_path / "data.csv"
+    pd.DataFrame({"unique_id": ["A"], "ds": ["2024-01-01"], "y": [1.0]}).to_csv(data, index=False)
+    calls = []
+
+    def fake_run_baseline(config, data=None, anchor_forecasts=None):
+        calls.append((config.output_dir, config.parent_run, id(data), anchor_forecasts))
+        if config.output_dir.endswith("bad"):
+            raise ValueError("gate failed")
+        return {"level": config.output_dir}, pd.DataFrame({"from": [config.output_dir]})
+
+    monkeypatch.setattr(baseline_sf, "run_baseline", fake_run_baseline)
+    levels = [
+        {"name": "L1", "data": str(data), "output_dir": "L1"},
+        {"name": "L2a", "parent": "L1", "data": str(data), "output_dir": "L2a"},
+        {"name": "L2b", "parent": "L1", "data": str(data), "output_dir": "L2b"},
+    ]
+    results = run_cascade(levels, {"horizon": 1})
+
+    assert set(results) == {"L1", "L2a", "L2b"}
+    assert calls[0][:2] == ("L1", None)
+    children = {call[0]: call for call in calls[1:]}
+    assert children["L2a"][1] == "L1"
+    assert children["L2a"][3]["from"].item() == "L1"
+    assert len({call[2] for call in calls}) == 1
+
+    levels = [
+        {"name": "bad", "data": str(data), "output_dir": "bad"},
+        {"name": "child", "parent": "bad", "data": str(data), "output_dir": "child"},
+    ]
+    with pytest.raises(ValueError, match=r"failed at \['bad'\]; skipped descendants \['child'\]"):
+        run_cascade(levels)
@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.pipelines.chunked import UNSUPPORTED_OPTIONS, run_chunked_baseline
+from forecastkernel.scripts.baseline_sf import make_config, run_baseline
+from forecastkernel.utils.io_utils import find_artifact, read_frame
+
+
+def _panel(tmp_path) -> str:
+    rng = np.random.default_rng(0)
+    days = np.arange(60)
+    df = pd.concat([
+        pd.DataFrame({
+            "unique_id": uid,
+            "ds": pd.date_range("2024-01-01", periods=len(days), freq="D"),
+            "y": level + 3 * np.sin(2 * np.pi * days / 7) + rng.normal(0, 1, len(days)),
+        })
+        for uid, level in [("A", 10.0), ("B", 20.0), ("C", 30.0), ("D", 40.0)]
+    ], ignore_index=True)
+    path = tmp_path / "panel.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _run(data: str, output_dir, **overrides) -> tuple[dict, dict, pd.DataFrame]:
+    config = make_config(
+        data, output_dir=str(output_dir), phase=1, n_jobs=1, no_plots=True, no_mlflow=True,
+        no_cache=True, **overrides,
+    )
+    metrics, _ = run_baseline(config)
+    with open(output_dir / "forecastability.json") as f:
+        forecastability = json.load(f)
+    forecasts = read_frame(find_artifact(str(output_dir), "baseline_forecasts"))
+    return metrics, forecastability, forecasts.sort_values(["unique_id", "ds"]).reset_index(drop=True)
+
+
+def test_chunked_run_matches_in_memory_run(tmp_path) -> None:
+    data = _panel(tmp_path)
+    full_metrics, full_profile, full_forecasts = _run(data, tmp_path / "full")
+    chunked_metrics, chunked_profile, chunked_forecasts = _run(data, tmp_path / "chunked", chunk_rows=100)
+
+    assert chunked_metrics["chunked"]["n_chunks"] > 1
+    assert chunked_metrics["chunked"]["n_series"] == 4
+    assert chunked_metrics["selected_model"] == full_metrics["selected_model"]
+    assert chunked_metrics["pass_ci"] == full_metrics["pass_ci"]
+    assert chunked_metrics["metrics"] == full_metrics["metrics"]
+    assert chunked_profile == full_profile
+    pd.testing.assert_frame_equal(chunked_forecasts, full_forecasts)
+
+
+@pytest.mark.parametrize("option", UNSUPPORTED_OPTIONS)
+def test_chunked_run_rejects_in_memory_options(tmp_path, option) -> None:
+    value = 2 if option == "cv_windows" else "x" if option in ("parent_run", "serve_dir") else True
+    config = make_config(_panel(tmp_path), output_dir=str(tmp_path / "out"), chunk_rows=100, **{option: value})
+    with pytest.raises(ValueError, match=option):
+        run_chunked_baseline(config)
@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from forecastkernel.cli import COMMANDS, main
+
+HEAVY_MODULES = ["statsforecast", "mlflow", "matplotlib", "seaborn", "tabulate", "pandera", "scipy"]
+# Cold start of a lightweight subcommand in a fresh interpreter, in seconds
+STARTUP_BUDGET = float(os.environ.get("FK_STARTUP_BUDGET", "1.5"))
+
+
+def _loaded_heavy_modules(statement: str) -> list[str]:
+    code = f"import sys; {statement}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def test_baseline_import_defers_heavy_dependencies() -> None:
+    assert _loaded_heavy_modules("import forecastkernel.cli") == []
+    assert _loaded_heavy_modules("import forecastkernel.scripts.baseline_sf") == []
+
+
+@pytest.mark.parametrize("command", ["validate-hashes", "ci-check"])
+def test_lightweight_command_startup_budget(command) -> None:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "forecastkernel.cli", command, "--help"],
+        capture_output=True, check=True,
+    )
+    elapsed = time.perf_counter() - start
+    assert elapsed < STARTUP_BUDGET, f"{command} --help took {elapsed:.2f}s"
+
+
+def test_main_dispatches_and_restores_argv(capsys) -> None:
+    argv = list(sys.argv)
+    with pytest.raises(SystemExit):
+        main(["validate-hashes", "--help"])
+    assert "forecastkernel validate-hashes" in capsys.readouterr().out
+    assert sys.argv == argv
+
+    assert main([]) == 2
+    assert main(["nope"]) == 2
+    assert all(module.startswith("forecastkernel.scripts.") for module, _ in COMMANDS.values())
+
+
+def _visual_audit_run(run_dir) -> None:
+    import json
+
+    import pandas as pd
+
+    ds = pd.date_range("2024-01-01", periods=4)
+    pd.DataFrame({"unique_id": "A", "ds": ds, "y": [1.0, 2.0, 3.0, 4.0]}).to_csv(run_dir / "input.csv", index=False)
+    pd.DataFrame({"unique_id": "A", "ds": ds[2:], "Naive": [2.0, 2.0], "ensemble_naive": [2.5, 2.5]}).to_csv(
+        run_dir / "baseline_forecasts.csv", index=False
+    )
+    metrics = {"Naive": {"Score": 2.0}, "ensemble_naive": {"Score": 1.5}}
+    (run_dir / "baseline_metrics.json").write_text(json.dumps({"input_file": str(run_dir / "input.csv"), "metrics": metrics}))
+
+
+def test_every_command_dispatches_real_arguments(tmp_path, monkeypatch) -> None:
+    # Every command gets options that pass its parser; inputs that do not
+    # exist make the heavy commands stop right after parsing
+    monkeypatch.chdir(tmp_path)
+    missing = str(tmp_path / "missing")
+    _visual_audit_run(tmp_path)
+    cli_args = {
+        "baseline": ["--data", f"{missing}.csv", "--output_dir", "out", "--no_mlflow", "--no_plots"],
+        "cascade": ["--spec", f"{missing}.yaml"],
+        "partition": ["--data", f"{missing}.csv", "--output_dir", "parts"],
+        "reconcile": ["--spec", f"{missing}.csv", "--level", "total"],
+        "preflight": ["--input", str(tmp_path / "input.csv"), "--output", "report.json"],
+        "validate-hashes": ["--audit_log", f"{missing}.json", "--base_dir", str(tmp_path)],
+        "ci-check": ["--audit_log", f"{missing}.json", "--base_dir", str(tmp_path)],
+        "publish": ["--run_dir", missing],
+        "serve": ["--root", missing],
+        "check-storage": ["--roots", str(tmp_path), "--log_path", "storage.log", "--snapshot", "snapshot.json"],
+        "visual-audit": ["--output_path", str(tmp_path)],
+    }
+    assert set(cli_args) == set(COMMANDS)
+
+    for command, args in cli_args.items():
+        try:
+            status = main([command, *args])
+        except SystemExit as exc:
+            assert exc.code not in (0, 2), f"{command} rejected its arguments"
+        except (OSError, ValueError):
+            pass
+        else:
+            assert status == 0, command
+    assert os.path.exists(tmp_path / "storage.log")
+    assert os.path.exists(tmp_path / "report_timings.json")
+    assert any(name.endswith(".png") for _, _, files in os.walk(tmp_path) for name in files)
@@ -1,9 +1,11 @@
 import pandas as pd
 import numpy as np
 
-from forecastkernel.core.drift import detect_residual_drift
-from forecastkernel.core.decomposition import decompose_errors
-from forecastkernel.core.dm_test import compute_dm_test
+from scipy.stats import ks_2samp
+
+from forecastkernel.core.drift import detect_panel_drift, detect_residual_drift, summarize_panel_drift
+from forecastkernel.core.decomposition import decompose_errors, decompose_series_errors
+from forecastkernel.core.dm_test import compute_dm_test, dm_pair_result, panel_dm_test, summarize_dm_tests
 
 
 def test_detect_residual_drift_detects_change() -> None:
@@ -25,6 +27,46 @@ def test_detect_residual_drift_insufficient_history() -> None:
     assert result == {"drift_detected": False, "p_value": 1.0}
 
 
+def test_detect_panel_drift_matches_per_series_ks() -> None:
+    rng = np.random.default_rng(0)
+    frames = []
+    for i, n in enumerate([40, 30, 20]):
+        resid = rng.normal(size=n).round(1)
+        if i == 0:
+            resid[-14:] += 5
+        frames.append(pd.DataFrame({
+            "unique_id": f"s{i}",
+            "ds": pd.date_range("2024-01-01", periods=n, freq="D"),
+            "model_a": resid,
+        }))
+    df = pd.concat(frames).sample(frac=1, random_state=0)
+
+    table = detect_panel_drift(df, ["model_a"], window_size=14)
+    for uid, n in [("s0", 40), ("s1", 30)]:
+        series = df[df["unique_id"] == uid].sort_values("ds")["model_a"].to_numpy()
+        expected = ks_2samp(series[:-14], series[-14:], method="asymp")
+        row = table[table["unique_id"] == uid].iloc[0]
+        assert np.isclose(row["ks_stat"], expected.statistic)
+        assert np.isclose(row["p_value"], expected.pvalue)
+
+    assert table["drift_detected"].tolist() == [True, False, False]
+    assert np.isnan(table.loc[2, "p_value"])
+
+    summary = summarize_panel_drift(table, "model_a")
+    assert summary["drift_detected"] is True
+    assert summary["n_series_tested"] == 2
+    assert summary["n_series_drifted"] == 1
+    assert summary["inconclusive"] is False
+    assert summarize_panel_drift(table, "model_a", max_share=0.5)["drift_detected"] is False
+
+    short = detect_panel_drift(df, ["model_a"], window_size=30)
+    assert short["p_value"].isna().all()
+    untested = summarize_panel_drift(short, "model_a")
+    assert untested["n_series_tested"] == 0
+    assert untested["p_value"] is None
+    assert untested["inconclusive"] is True
+
+
 def test_decompose_errors_basic() -> None:
     df = pd.DataFrame({"model_a": range(14)})
     breakdown = decompose_errors(df, ["model_a"])
@@ -39,6 +81,25 @@ def test_decompose_errors_basic() -> None:
     assert breakdown == expected
 
 
+def test_decompose_series_errors_respects_series_boundaries() -> None:
+    df = pd.DataFrame({
+        "unique_id": ["a"] * 10 + ["b"] * 3,
+        "ds": list(pd.date_range("2024-01-01", periods=10)) + list(pd.date_range("2024-01-01", periods=3)),
+        "model_a": list(range(10)) + [100.0, 50.0, 100.0],
+    }).iloc[::-1]
+
+    table = decompose_series_errors(df, ["model_a"], season_length=2).set_index("unique_id")
+    assert table.loc["a", "bias_error"] == 4.5
+    assert table.loc["a", "variance_error"] == 8.25
+    assert table.loc["a", "noise"] == 2.5
+    assert table.loc["a", "seasonality_miss"] == 2.0
+    assert table.loc["b", "seasonality_miss"] == 0.0
+    assert np.isnan(decompose_series_errors(df, ["model_a"], season_length=7).set_index("unique_id").loc["b", "seasonality_miss"])
+
+    pooled = decompose_errors(df, ["model_a"], season_length=2)["model_a"]
+    assert pooled["Seasonality Miss"] == round((8 * 2.0 + 0.0) / 9, 4)
+
+
 def test_compute_dm_test_expected_values() -> None:
     forecasts = pd.DataFrame({
         "model_1": [10, 12, 8],
@@ -50,3 +111,43 @@ def test_compute_dm_test_expected_values() -> None:
     assert abs(result["dm_stat"] - 0.756) < 1e-3
     assert abs(result["p_value"] - 0.529) < 1e-3
 
+
+
+def test_panel_dm_test_matches_single_series_formula() -> None:
+    rng = np.random.default_rng(0)
+    n, h = 40, 3
+    df = pd.DataFrame({
+        "unique_id": np.repeat(["a", "b"], n),
+        "ds": np.tile(pd.date_range("2024-01-01", periods=n, freq="D"), 2),
+        "m1": rng.normal(size=2 * n),
+        "m2": rng.normal(size=2 * n) * 2,
+        "m3": rng.normal(size=2 * n),
+    }).iloc[::-1]
+
+    table = panel_dm_test(df, ["m1", "m2", "m3"], h=h)
+    assert len(table) == 6
+
+    a = df[df["unique_id"] == "a"].sort_values("ds")
+    d = (a["m1"] ** 2 - a["m2"] ** 2).to_numpy()
+    c = d - d.mean()
+    gamma = [(c[lag:] * c[:n - lag]).sum() / n for lag in range(h)]
+    lrv = gamma[0] + 2 * sum((1 - lag / h) * gamma[lag] for lag in range(1, h))
+    expected = d.mean() / np.sqrt(lrv / n) * np.sqrt((n + 1 - 2 * h + h * (h - 1) / n) / n)
+
+    row = table[(table["unique_id"] == "a") & (table["model_1"] == "m1") & (table["model_2"] == "m2")]
+    assert np.isclose(row["dm_stat"].item(), expected)
+
+    # Multi-step errors get Newey-West lags and the HLN correction for h
+    one_step = panel_dm_test(df, ["m1", "m2", "m3"])
+    assert not np.allclose(one_step["dm_stat"], table["dm_stat"])
+    assert not np.allclose(one_step["lrv"], table["lrv"])
+    # A single holdout of h steps cannot be tested at horizon h
+    holdout = df.sort_values(["unique_id", "ds"]).groupby("unique_id").tail(h)
+    assert panel_dm_test(holdout, ["m1", "m2"], h=h)["dm_stat"].isna().all()
+
+    summary = summarize_dm_tests(table)
+    result = dm_pair_result(summary, "m2", "m1")
+    assert result["vs"] == "m1"
+    assert result["dm_stat"] > 0
+    assert result["share_worse"] > 0
+    assert dm_pair_result(summary, "m1", "m1")["dm_stat"] is None
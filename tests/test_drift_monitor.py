@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.core.aggregation import enforce_cascade_checks
+from forecastkernel.core.drift_monitor import (
+    init_monitor, load_monitor, monitor_status, monitor_table, reset_series,
+    save_monitor, update_monitor, write_monitor_status,
+)
+
+
+def _stream(n: int = 60, shift_at: int | None = None, seed: int = 0) -> np.ndarray:
+    values = np.random.default_rng(seed).normal(size=n)
+    if shift_at is not None:
+        values[shift_at:] += 4
+    return values
+
+
+def test_monitor_alarms_only_on_shifted_series() -> None:
+    state = init_monitor()
+    stable, shifted = _stream(seed=1), _stream(shift_at=40, seed=2)
+    for a, b in zip(stable, shifted):
+        update_monitor(state, ["stable", "shifted"], [a, b])
+
+    table = monitor_table(state).set_index("unique_id")
+    assert table.loc["shifted", "drift_detected"]
+    assert not table.loc["stable", "drift_detected"]
+    assert table.loc["stable", "n_obs"] == 60
+    assert np.isclose(table.loc["stable", "std"], stable.std(ddof=1))
+
+    status = monitor_status(state)
+    assert status["drift_detected"] is True
+    assert status["n_series_drifted"] == 1
+    assert monitor_status(state, max_share=0.5)["drift_detected"] is False
+
+    reset_series(state, ["shifted"])
+    assert monitor_status(state)["drift_detected"] is False
+
+
+def test_batched_updates_match_one_at_a_time() -> None:
+    ids = np.array(["a", "b", "a", "a", "b", "c"] * 10)
+    values = _stream(len(ids), seed=3)
+
+    batched = update_monitor(init_monitor(min_obs=3), ids, values)
+    single = init_monitor(min_obs=3)
+    for uid, value in zip(ids, values):
+        update_monitor(single, [uid], [value])
+
+    pd.testing.assert_frame_equal(monitor_table(batched), monitor_table(single))
+
+
+def test_monitor_checkpoint_round_trip(tmp_path) -> None:
+    state = update_monitor(init_monitor(threshold=3.0), ["a"] * 30, _stream(30, shift_at=20))
+    path = save_monitor(state, str(tmp_path / "monitor.npz"))
+    restored = load_monitor(path)
+
+    assert restored["threshold"] == 3.0
+    pd.testing.assert_frame_equal(monitor_table(restored), monitor_table(state))
+    update_monitor(restored, ["a", "b"], [0.0, 1.0])
+    assert list(restored["unique_id"]) == ["a", "b"]
+
+
+def test_cascade_blocked_by_online_monitor(tmp_path) -> None:
+    (tmp_path / "baseline_forecasts.csv").write_text("unique_id,ds,model_a\nA,2023-01-01,1\n")
+    with open(tmp_path / "baseline_metrics.json", "w") as f:
+        json.dump({"pass_ci": True, "drift_monitor": {"drift_detected": False}}, f)
+    enforce_cascade_checks(str(tmp_path))
+
+    state = update_monitor(init_monitor(), ["A"] * 60, _stream(shift_at=40))
+    write_monitor_status(state, str(tmp_path))
+    with pytest.raises(ValueError, match="Online drift monitor"):
+        enforce_cascade_checks(str(tmp_path))
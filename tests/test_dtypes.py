@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.core.aggregation import compute_anchor_bias
+from forecastkernel.core.keys import align_rows
+from forecastkernel.utils.dtypes import (
+    compact_ids,
+    compact_panel,
+    load_id_dictionary,
+    save_id_dictionary,
+)
+from forecastkernel.utils.io_utils import read_frame
+
+
+def _panel() -> pd.DataFrame:
+    return pd.DataFrame({
+        "unique_id": ["b", "b", "a", "a", "c"],
+        "ds": pd.to_datetime(["2024-01-01", "2024-01-02"] * 2 + ["2024-01-01"]),
+        "y": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+
+def test_compact_panel_and_dictionary_round_trip(tmp_path) -> None:
+    df = _panel()
+    compact = compact_panel(df, y_float32=True)
+    assert list(compact["unique_id"].cat.categories) == ["a", "b", "c"]
+    assert compact["unique_id"].astype(object).tolist() == df["unique_id"].tolist()
+    assert compact["y"].dtype == np.float32
+    assert df["unique_id"].dtype == object
+
+    path = save_id_dictionary(compact["unique_id"].cat.categories, str(tmp_path / "ids.parquet"))
+    categories = load_id_dictionary(path)
+    assert list(categories) == ["a", "b", "c"]
+    again = compact_ids(df["unique_id"].iloc[:2], categories)
+    assert again.cat.codes.tolist() == [1, 1]
+    with pytest.raises(ValueError, match="missing from the id dictionary"):
+        compact_ids(pd.Series(["z"]), categories)
+
+    df.to_parquet(tmp_path / "panel.parquet", index=False)
+    loaded = read_frame(str(tmp_path / "panel.parquet"), categorical_ids=True)
+    assert isinstance(loaded["unique_id"].dtype, pd.CategoricalDtype)
+
+
+def test_align_rows_across_id_dtypes() -> None:
+    right = _panel()
+    left = right.iloc[[4, 0, 3]].reset_index(drop=True)
+    missing = pd.DataFrame({"unique_id": ["a", "z"], "ds": pd.to_datetime(["2024-01-05", "2024-01-01"])})
+    expected = [4, 0, 3]
+
+    for lhs, rhs in [
+        (left, right),
+        (compact_panel(left), compact_panel(right)),
+        (compact_panel(left), right),
+        (left, compact_panel(right)),
+    ]:
+        assert align_rows(lhs, rhs).tolist() == expected
+    assert align_rows(missing, compact_panel(right)).tolist() == [-1, -1]
+    assert align_rows(compact_panel(missing), compact_panel(right)).tolist() == [-1, -1]
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        align_rows(left, pd.concat([right, right.iloc[:1]]))
+
+
+def test_anchor_bias_with_categorical_ids() -> None:
+    atomic = compact_panel(_panel().rename(columns={"y": "M"}))
+    anchor = pd.DataFrame({
+        "unique_id": ["p", "p", "q"],
+        "ds": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-01"]),
+        "M": [1.0, 1.0, 1.0],
+    })
+    bias = compute_anchor_bias(atomic, anchor, "M", {"a": "p", "b": "p", "c": "q"})
+    assert bias.tolist() == [3.0, 5.0, 4.0]
+    with pytest.raises(ValueError, match="Anchor forecasts missing"):
+        compute_anchor_bias(atomic, anchor.iloc[:2], "M", {"a": "p", "b": "p", "c": "q"})
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.core.evaluation import evaluate_forecasts, grouped_metrics
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    ds = pd.date_range("2024-01-01", periods=2, freq="D")
+    true_future = pd.DataFrame({
+        "unique_id": ["A", "A", "B", "B"],
+        "ds": list(ds) * 2,
+        "y": [10.0, 10.0, 20.0, 20.0],
+    })
+    forecasts = true_future[["unique_id", "ds"]].copy()
+    forecasts["model_a"] = [12.0, 12.0, 20.0, 20.0]
+    forecasts["model_b"] = [9.0, 11.0, 18.0, 18.0]
+    return forecasts, true_future
+
+
+def test_evaluate_forecasts_all_models() -> None:
+    forecasts, true_future = _frames()
+    metrics, residuals = evaluate_forecasts(forecasts, true_future, ["model_a", "model_b"], "")
+
+    a = metrics.set_index("model").loc["model_a"]
+    assert a["mae"] == 1.0
+    assert a["bias"] == -1.0
+    assert a["score"] == 2.0
+    assert list(residuals.columns) == ["unique_id", "ds", "model_a", "model_b"]
+    assert residuals["model_b"].tolist() == [1.0, -1.0, 2.0, 2.0]
+
+
+def test_evaluate_forecasts_per_series() -> None:
+    forecasts, true_future = _frames()
+    _, _, series = evaluate_forecasts(
+        forecasts, true_future, ["model_a", "model_b"], "", per_series=True
+    )
+    row = series[(series["unique_id"] == "B") & (series["model"] == "model_b")].iloc[0]
+    assert row["mae"] == 2.0
+    assert row["bias"] == 2.0
+    assert row["score"] == 4.0
+    assert len(series) == 4
+
+
+def test_evaluate_forecasts_missing_actuals() -> None:
+    forecasts, true_future = _frames()
+    with pytest.raises(ValueError):
+        evaluate_forecasts(forecasts, true_future.iloc[:2], ["model_a"], "")
+
+
+def test_grouped_metrics_unsorted_ids() -> None:
+    ids = np.array(["B", "A", "B", "A"])
+    resid = np.array([[1.0, -2.0], [3.0, 0.0], [-1.0, -2.0], [1.0, 4.0]])
+    table = grouped_metrics(ids, resid, ["m1", "m2"])
+
+    assert table["unique_id"].tolist() == ["A", "A", "B", "B"]
+    assert table["model"].tolist() == ["m1", "m2", "m1", "m2"]
+    assert table["n_obs"].tolist() == [2, 2, 2, 2]
+    assert table["mae"].tolist() == [2.0, 2.0, 1.0, 2.0]
+    assert table["bias"].tolist() == [2.0, 2.0, 0.0, -2.0]
+    assert table["score"].tolist() == [4.0, 4.0, 1.0, 4.0]
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from forecastkernel.core.fingerprints import changed_series, series_fingerprints
+
+
+def _panel() -> pd.DataFrame:
+    return pd.DataFrame({
+        "unique_id": ["A", "A", "B", "B", "C"],
+        "ds": pd.to_datetime(["2024-01-01", "2024-01-02"] * 2 + ["2024-01-01"]),
+        "y": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+
+def test_fingerprints_ignore_row_order() -> None:
+    df = _panel()
+    shuffled = df.sample(frac=1.0, random_state=1)
+    pd.testing.assert_frame_equal(series_fingerprints(df), series_fingerprints(shuffled))
+
+
+def test_changed_series_detects_edits_additions_and_removals() -> None:
+    before = _panel()
+    after = before[before["unique_id"] != "C"].copy()
+    after.loc[after.index[1], "y"] = 99.0
+    after = pd.concat([after, pd.DataFrame({
+        "unique_id": ["D"], "ds": [pd.Timestamp("2024-01-01")], "y": [0.0],
+    })])
+
+    changed, removed = changed_series(series_fingerprints(before), series_fingerprints(after))
+    assert sorted(changed) == ["A", "D"]
+    assert list(removed) == ["C"]
+
+
+def test_swapped_values_change_fingerprint() -> None:
+    df = _panel()
+    swapped = df.copy()
+    swapped.loc[[0, 1], "y"] = [2.0, 1.0]
+    changed, _ = changed_series(series_fingerprints(df), series_fingerprints(swapped))
+    assert list(changed) == ["A"]
@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from forecastkernel.utils.forecast_cache import (
+    evict_cache,
+    load_cached_forecasts,
+    make_cache_key,
+    store_forecasts,
+)
+
+
+class _Model:
+    def __init__(self, season_length: int) -> None:
+        self.season_length = season_length
+        self.alias = "Dummy"
+
+
+def test_cache_key_depends_on_config() -> None:
+    key = make_cache_key("abc", [_Model(7)], h=7, season_length=7)
+    assert key == make_cache_key("abc", [_Model(7)], h=7, season_length=7)
+    assert key != make_cache_key("abc", [_Model(12)], h=7, season_length=7)
+    assert key != make_cache_key("abc", [_Model(7)], h=14, season_length=7)
+    assert key != make_cache_key("abd", [_Model(7)], h=7, season_length=7)
+    assert key != make_cache_key("abc", [_Model(7)], h=7, season_length=7, dtype="float32")
+
+
+def test_store_and_load_round_trip(tmp_path) -> None:
+    df = pd.DataFrame({"unique_id": ["A"], "ds": [pd.Timestamp("2024-01-01")], "Naive": [1.0]})
+    assert load_cached_forecasts(str(tmp_path), "ff" * 32) is None
+
+    store_forecasts(str(tmp_path), "ff" * 32, df)
+    pd.testing.assert_frame_equal(load_cached_forecasts(str(tmp_path), "ff" * 32), df)
+
+
+def test_evict_cache_drops_least_recent(tmp_path) -> None:
+    df = pd.DataFrame({"y": range(100)})
+    old = store_forecasts(str(tmp_path), "aa" * 32, df)
+    new = store_forecasts(str(tmp_path), "bb" * 32, df)
+    os.utime(old, (1, 1))
+
+    removed = evict_cache(str(tmp_path), max_bytes=os.path.getsize(new))
+    assert removed == [old]
+    assert os.path.exists(new)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.scripts.serve_forecasts import make_state, route, serve
+from forecastkernel.utils.forecast_store import (
+    activate_store,
+    compile_forecast_store,
+    current_serve_hash,
+    lookup_forecast,
+    open_forecast_store,
+)
+
+
+def _forecasts(offset: float = 0.0) -> pd.DataFrame:
+    ds = pd.date_range("2024-01-01", periods=3, freq="D")
+    return pd.DataFrame({
+        "run_id": "r1",
+        "unique_id": np.repeat(["B", "A", "10"], 3),
+        "ds": np.tile(ds, 3),
+        "Naive": np.arange(9, dtype=float) + offset,
+        "ETS": -np.arange(9, dtype=float),
+    })
+
+
+def test_compile_and_lookup(tmp_path) -> None:
+    path = compile_forecast_store(_forecasts(), str(tmp_path), "abc12345")
+    store = open_forecast_store(path)
+    assert isinstance(store["values"], np.memmap)
+    assert store["values"].dtype == np.float32
+    assert list(store["ids"]) == ["10", "A", "B"]
+
+    result = lookup_forecast(store, "A")
+    assert result["ds"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert result["forecasts"] == {"Naive": [3.0, 4.0, 5.0], "ETS": [-3.0, -4.0, -5.0]}
+    assert lookup_forecast(store, "B", ["ETS"])["forecasts"] == {"ETS": [-0.0, -1.0, -2.0]}
+    assert lookup_forecast(store, "C") is None
+    with pytest.raises(KeyError):
+        lookup_forecast(store, "A", ["Theta"])
+
+    # Recompiling the same serve hash replaces the store in place
+    compile_forecast_store(_forecasts(100.0), str(tmp_path), "abc12345")
+    assert lookup_forecast(open_forecast_store(path), "A")["forecasts"]["Naive"][0] == 103.0
+
+
+def test_route_and_hot_swap(tmp_path) -> None:
+    root = str(tmp_path)
+    compile_forecast_store(_forecasts(), root, "old")
+    compile_forecast_store(_forecasts(100.0), root, "new")
+    activate_store(root, "old")
+    assert current_serve_hash(root) == "old"
+
+    state = make_state(root)
+    status, payload = route(state, "GET", "/forecast/A?model=Naive")
+    assert status == 200 and payload["serve_hash"] == "old"
+    assert payload["forecasts"] == {"Naive": [3.0, 4.0, 5.0]}
+    assert route(state, "GET", "/forecast/A?serve_hash=new")[1]["forecasts"]["Naive"][0] == 103.0
+    assert route(state, "GET", "/forecast/Z")[0] == 404
+    assert route(state, "GET", "/forecast/A?model=Theta")[0] == 400
+    assert route(state, "GET", "/forecast/A?serve_hash=..")[0] == 404
+    assert route(state, "GET", "/activate/new")[0] == 405
+
+    assert route(state, "POST", "/activate/new") == (200, {"serve_hash": "new"})
+    assert route(state, "GET", "/forecast/A")[1]["serve_hash"] == "new"
+    assert route(state, "POST", "/activate/missing")[0] == 404
+    assert route(state, "GET", "/health")[1]["serve_hash"] == "new"
+
+
+def test_server_follows_current(tmp_path) -> None:
+    root = str(tmp_path)
+    compile_forecast_store(_forecasts(), root, "old")
+    compile_forecast_store(_forecasts(100.0), root, "new")
+    activate_store(root, "old")
+    state = make_state(root)
+
+    async def get(path: str) -> dict:
+        reader, writer = await asyncio.open_connection(*state["address"])
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+    async def scenario() -> list[str]:
+        server = asyncio.create_task(serve(state, port=0, poll_interval=0.01))
+        while "address" not in state:
+            await asyncio.sleep(0.01)
+        seen = [(await get("/forecast/A"))["serve_hash"]]
+        activate_store(root, "new")
+        while state["active"] != "new":
+            await asyncio.sleep(0.01)
+        seen.append((await get("/forecast/A"))["serve_hash"])
+        server.cancel()
+        return seen
+
+    assert asyncio.run(scenario()) == ["old", "new"]
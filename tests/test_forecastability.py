@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.forecastability import (
+    classify_forecastability,
+    classify_forecastability_batch,
+    compute_forecastability_metrics,
+    profile_forecastability,
+)
+
+
+def test_profile_matches_single_series_metrics() -> None:
+    rng = np.random.default_rng(0)
+    frames = []
+    for i, n in enumerate([30, 30, 45, 16]):
+        y = rng.poisson(0.6 if i == 3 else 20, n).astype(float)
+        frames.append(pd.DataFrame({
+            "unique_id": f"S{i}",
+            "ds": pd.date_range("2024-01-01", periods=n, freq="D"),
+            "y": y,
+        }))
+    panel = pd.concat(frames[::-1], ignore_index=True)
+
+    profile = profile_forecastability(panel, max_block_size=40)
+    assert profile["unique_id"].tolist() == ["S0", "S1", "S2", "S3"]
+
+    for frame, row in zip(frames, profile.itertuples()):
+        expected = compute_forecastability_metrics(frame)
+        assert round(row.ADI, 2) == expected["ADI"]
+        assert round(row.CV2, 2) == expected["CV2"]
+        assert round(row.SpectralEntropy, 3) == expected["SpectralEntropy"]
+        assert row.classification == expected["classification"]
+
+
+def test_classify_batch_matches_scalar() -> None:
+    adi = np.array([1.5, 1.5, 1.0, 1.0, 1.0])
+    cv2 = np.array([0.6, 0.1, 0.1, 0.1, 0.1])
+    entropy = np.array([0.5, 0.5, 0.7, 0.2, 0.5])
+    labels = classify_forecastability_batch(adi, cv2, entropy)
+    assert list(labels) == [
+        classify_forecastability(a, c, e) for a, c, e in zip(adi, cv2, entropy)
+    ]
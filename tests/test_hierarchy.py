@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.core.hierarchy import (
+    aggregate_hierarchy, parent_map, reconcile, summing_matrix, top_down_proportions,
+)
+from forecastkernel.scripts.reconcile import reconcile_forecasts
+
+SPEC = pd.DataFrame({
+    "unique_id": ["s4", "s1", "s2", "s3"],
+    "region": ["B", "A", "A", "B"],
+})
+
+
+def test_summing_matrix_structure() -> None:
+    S, nodes = summing_matrix(SPEC, [[], ["region"]])
+    assert nodes["unique_id"].tolist() == ["total", "A", "B", "s1", "s2", "s3", "s4"]
+    assert nodes["level"].tolist() == ["total", "region", "region"] + ["unique_id"] * 4
+    expected = np.array([
+        [1, 1, 1, 1],
+        [1, 1, 0, 0],
+        [0, 0, 1, 1],
+        [1, 0, 0, 0],
+        [0, 1, 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, 0, 1],
+    ])
+    assert (S.toarray() == expected).all()
+    assert parent_map(SPEC, ["region"]).to_dict() == {"s4": "B", "s1": "A", "s2": "A", "s3": "B"}
+
+
+def test_aggregate_hierarchy_sums_observed_values() -> None:
+    S, nodes = summing_matrix(SPEC, [[], ["region"]])
+    df = pd.DataFrame({
+        "unique_id": ["s1", "s2", "s3", "s4", "s1"],
+        "ds": pd.to_datetime(["2024-01-01"] * 4 + ["2024-01-02"]),
+        "y": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+    panel = aggregate_hierarchy(df, S, nodes, ["y"]).set_index(["unique_id", "ds"])["y"]
+    assert panel[("total", pd.Timestamp("2024-01-01"))] == 10.0
+    assert panel[("A", pd.Timestamp("2024-01-02"))] == 5.0
+    assert ("B", pd.Timestamp("2024-01-02")) not in panel.index
+
+
+@pytest.mark.parametrize("method", ["bottom_up", "ols", "wls_struct", "mint_shrink", "top_down"])
+def test_reconcile_is_coherent(method) -> None:
+    S, _ = summing_matrix(SPEC, [[], ["region"]])
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(7, 3)) + np.array([[40], [20], [20], [10], [10], [10], [10]])
+    coherent = reconcile(
+        base, S, method,
+        proportions=np.full(4, 0.25),
+        residuals=rng.normal(size=(30, 7)),
+    )
+    assert np.allclose(S @ coherent[3:], coherent)
+
+
+def test_reconcile_matches_dense_formulas() -> None:
+    S, _ = summing_matrix(SPEC, [[], ["region"]])
+    base = np.random.default_rng(1).normal(size=(7, 2))
+    dense = S.toarray()
+    ols = dense @ np.linalg.solve(dense.T @ dense, dense.T @ base)
+    assert np.allclose(reconcile(base, S, "ols"), ols)
+    assert np.allclose(reconcile(base, S, "ols", max_dense_nodes=0), ols)
+
+    w_inv = np.diag(1 / dense.sum(axis=1))
+    wls = dense @ np.linalg.solve(dense.T @ w_inv @ dense, dense.T @ w_inv @ base)
+    assert np.allclose(reconcile(base, S, "wls_struct"), wls)
+
+
+def test_reconcile_guards() -> None:
+    S, _ = summing_matrix(SPEC, [[], ["region"]])
+    base = np.ones((7, 1))
+    with pytest.raises(ValueError, match="dense"):
+        reconcile(base, S, "mint_shrink", residuals=np.ones((5, 7)), max_dense_nodes=3)
+    with pytest.raises(ValueError, match="proportions"):
+        reconcile(base, S, "top_down")
+    assert np.allclose(top_down_proportions(np.array([[1.0, np.nan], [3.0, 0.0]])), [0.25, 0.75])
+
+
+def test_reconcile_forecasts_script(tmp_path) -> None:
+    SPEC.to_csv(tmp_path / "spec.csv", index=False)
+    nodes = ["total", "A", "B", "s1", "s2", "s3", "s4"]
+    forecasts = pd.DataFrame({
+        "unique_id": np.repeat(nodes, 2),
+        "ds": np.tile(pd.to_datetime(["2024-01-01", "2024-01-02"]), len(nodes)),
+        "Naive": np.arange(14, dtype=float),
+    })
+    forecasts.to_parquet(tmp_path / "base.parquet", index=False)
+
+    out = reconcile_forecasts(
+        str(tmp_path / "base.parquet"), str(tmp_path / "spec.csv"), [[], ["region"]],
+        str(tmp_path / "reconciled.parquet"), method="bottom_up",
+    )
+    wide = out.pivot(index="ds", columns="unique_id", values="Naive")
+    assert np.allclose(wide["total"], wide[["s1", "s2", "s3", "s4"]].sum(axis=1))
+    assert np.allclose(wide["s1"], [6.0, 7.0])
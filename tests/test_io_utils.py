@@ -0,0 +1,95 @@
+import os
+
+import pandas as pd
+import pytest
+
+from forecastkernel.utils.io_utils import (
+    append_frame,
+    close_frame_writers,
+    find_artifact,
+    iter_frame_batches,
+    iter_series_chunks,
+    read_frame,
+    remove_stale_artifacts,
+    write_frame,
+)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "unique_id": ["A", "A", "B", "C"],
+        "ds": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-01", "2024-01-01"]),
+        "y": [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet", ".feather"])
+def test_round_trip_with_projection_and_filter(tmp_path, ext) -> None:
+    path = write_frame(_frame(), str(tmp_path / f"data{ext}"))
+
+    df = read_frame(path, columns=["unique_id", "ds"], unique_ids=["A", "C"])
+    assert list(df.columns) == ["unique_id", "ds"]
+    assert df["unique_id"].tolist() == ["A", "A", "C"]
+    assert pd.api.types.is_datetime64_any_dtype(df["ds"])
+
+
+def test_find_artifact_prefers_columnar(tmp_path) -> None:
+    assert find_artifact(str(tmp_path), "baseline_forecasts") is None
+    write_frame(_frame(), str(tmp_path / "baseline_forecasts.csv"))
+    write_frame(_frame(), str(tmp_path / "baseline_forecasts.parquet"))
+    assert find_artifact(str(tmp_path), "baseline_forecasts").endswith(".parquet")
+
+
+def test_find_artifact_ignores_stale_formats(tmp_path) -> None:
+    parquet = write_frame(_frame(), str(tmp_path / "baseline_forecasts.parquet"))
+    csv = write_frame(_frame(), str(tmp_path / "baseline_forecasts.csv"))
+    os.utime(parquet, ns=(0, 0))
+    assert find_artifact(str(tmp_path), "baseline_forecasts") == csv
+
+    remove_stale_artifacts(str(tmp_path), "baseline_forecasts", "csv")
+    assert not os.path.exists(parquet)
+    assert os.path.exists(csv)
+
+
+def test_iter_frame_batches(tmp_path) -> None:
+    path = write_frame(_frame(), str(tmp_path / "data.csv"))
+    batches = list(iter_frame_batches(path, batch_rows=3))
+    assert [len(b) for b in batches] == [3, 1]
+    assert pd.api.types.is_datetime64_any_dtype(batches[1]["ds"])
+
+
+def test_iter_frame_batches_pins_panel_dtypes(tmp_path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_text("unique_id,ds,y\n007,2024-01-01,1\n007,2024-01-02,2\n008,2024-01-01,3.5\n")
+    batches = list(iter_frame_batches(str(path), batch_rows=2))
+    assert [b["y"].dtype for b in batches] == ["float64", "float64"]
+    assert batches[0]["unique_id"].tolist() == ["007", "007"]
+    assert read_frame(str(path))["unique_id"].tolist() == ["007", "007", "008"]
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet"])
+def test_iter_series_chunks_keeps_series_whole(tmp_path, ext) -> None:
+    df = pd.DataFrame({
+        "unique_id": ["A"] * 5 + ["B"] * 2 + ["C"] * 3,
+        "ds": pd.date_range("2024-01-01", periods=10),
+        "y": range(10),
+    })
+    path = write_frame(df, str(tmp_path / f"data{ext}"))
+
+    chunks = list(iter_series_chunks(path, chunk_rows=3))
+    assert [c["unique_id"].unique().tolist() for c in chunks] == [["A"], ["B"], ["C"]]
+    assert sum(len(c) for c in chunks) == 10
+
+    write_frame(df.iloc[::-1], path)
+    with pytest.raises(ValueError):
+        list(iter_series_chunks(path, chunk_rows=3))
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet", ".feather"])
+def test_append_frame(tmp_path, ext) -> None:
+    path = str(tmp_path / f"out{ext}")
+    writers = {}
+    append_frame(_frame().iloc[:2], path, writers)
+    append_frame(_frame().iloc[2:], path, writers)
+    close_frame_writers(writers)
+    pd.testing.assert_frame_equal(read_frame(path), _frame())
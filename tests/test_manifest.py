@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from forecastkernel.utils.ci_utils import validate_file_hashes
+from forecastkernel.utils.hash_utils import compute_file_hash
+from forecastkernel.utils.manifest import (
+    build_manifest, hash_files, load_hash_cache, verify_manifest,
+)
+
+
+def _age(path, seconds: int = 60) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+def test_compute_file_hash_matches_hashlib(tmp_path) -> None:
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    path = tmp_path / "blob.bin"
+    path.write_bytes(payload)
+    assert compute_file_hash(str(path), buffer_size=1024 * 1024) == hashlib.sha256(payload).hexdigest()
+    assert compute_file_hash(str(path), "blake2b") == hashlib.blake2b(payload).hexdigest()
+    (tmp_path / "empty").write_bytes(b"")
+    assert compute_file_hash(str(tmp_path / "empty")) == hashlib.sha256(b"").hexdigest()
+
+
+def test_manifest_round_trip_and_mismatches(tmp_path) -> None:
+    names = [f"plots/p{i}.png" for i in range(20)] + ["metrics.json"]
+    for name in names:
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(name)
+
+    manifest = build_manifest(str(tmp_path), names, algorithm="blake2b", max_workers=4)
+    assert manifest["algorithm"] == "blake2b"
+    assert manifest["files"]["metrics.json"] == hashlib.blake2b(b"metrics.json").hexdigest()
+    assert verify_manifest(manifest, str(tmp_path)) == {}
+
+    (tmp_path / "metrics.json").write_text("tampered")
+    os.remove(tmp_path / "plots" / "p3.png")
+    mismatches = verify_manifest(manifest, str(tmp_path))
+    assert mismatches["plots/p3.png"] == "Missing file"
+    assert mismatches["metrics.json"]["expected"] == manifest["files"]["metrics.json"]
+    assert set(mismatches) == {"plots/p3.png", "metrics.json"}
+
+    with pytest.raises(FileNotFoundError):
+        build_manifest(str(tmp_path), ["plots/p3.png"])
+
+    # Audit logs written before the algorithm key default to SHA256
+    audit = {"files": {"metrics.json": hashlib.sha256(b"tampered").hexdigest()}}
+    (tmp_path / "audit_log.json").write_text(json.dumps(audit))
+    assert validate_file_hashes(str(tmp_path / "audit_log.json"), str(tmp_path)) == {}
+
+
+def test_stat_cache_skips_unchanged_files(tmp_path, monkeypatch) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    cache_path = str(tmp_path / "hash_cache.json")
+    for name in ["a.txt", "b.txt"]:
+        (run_dir / name).write_text(name)
+        _age(run_dir / name)
+    manifest = build_manifest(str(run_dir), ["a.txt", "b.txt"], cache_path=cache_path)
+    assert set(load_hash_cache(cache_path)) == {"a.txt", "b.txt"}
+    assert sorted(os.listdir(run_dir)) == ["a.txt", "b.txt"]
+    with pytest.raises(ValueError, match="outside"):
+        verify_manifest(manifest, str(run_dir), cache_path=str(run_dir / "cache.json"))
+
+    calls = []
+    real_hash = compute_file_hash
+    monkeypatch.setattr(
+        "forecastkernel.utils.manifest.compute_file_hash",
+        lambda path, algo: calls.append(os.path.basename(path)) or real_hash(path, algo),
+    )
+    (run_dir / "b.txt").write_text("changed")
+    mismatches = verify_manifest(manifest, str(run_dir), cache_path=cache_path)
+    assert calls == ["b.txt"]
+    assert set(mismatches) == {"b.txt"}
+
+    # Files written just now are hashed but not cached
+    cache = {}
+    hash_files(str(run_dir), ["b.txt"], cache=cache)
+    assert cache == {}
+
+    # Without a cache every file is read, so a same-size rewrite with its
+    # mtime restored is still caught
+    st = os.stat(run_dir / "a.txt")
+    (run_dir / "a.txt").write_text("A.txt")
+    os.utime(run_dir / "a.txt", ns=(st.st_atime_ns, st.st_mtime_ns))
+    calls.clear()
+    assert verify_manifest(manifest, str(run_dir), cache_path=cache_path).keys() == {"b.txt"}
+    assert set(verify_manifest(manifest, str(run_dir))) == {"a.txt", "b.txt"}
+    assert sorted(calls) == ["a.txt", "b.txt", "b.txt"]
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from forecastkernel.scripts.baseline_sf import make_config, run_baseline
+from forecastkernel.scripts.partitioned_baseline import assign_partitions, run_partitioned, write_partitions
+from forecastkernel.utils.io_utils import find_artifact, read_frame
+
+
+def test_assign_partitions_is_stable() -> None:
+    ids = pd.Series([f"id_{i}" for i in range(100)])
+    first = assign_partitions(ids, 4)
+    second = assign_partitions(ids[::-1], 4)[::-1]
+    assert (first == second).all()
+    assert set(first) <= {0, 1, 2, 3}
+
+
+def test_write_partitions_keeps_series_together(tmp_path) -> None:
+    df = pd.DataFrame({
+        "unique_id": ["A", "B", "C", "A", "B", "C"],
+        "ds": ["2024-01-01"] * 3 + ["2024-01-02"] * 3,
+        "y": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    data_path = tmp_path / "data.csv"
+    df.to_csv(data_path, index=False)
+
+    paths = write_partitions(str(data_path), str(tmp_path / "parts"), 2, chunksize=2)
+    parts = [read_frame(p) for p in paths]
+
+    assert sum(len(p) for p in parts) == len(df)
+    assert all(pd.api.types.is_datetime64_any_dtype(p["ds"]) for p in parts)
+    seen = [set(p["unique_id"]) for p in parts]
+    assert all(not (a & b) for i, a in enumerate(seen) for b in seen[i + 1:])
+
+
+def test_write_partitions_with_mixed_block_dtypes(tmp_path) -> None:
+    data_path = tmp_path / "data.csv"
+    data_path.write_text("unique_id,ds,y\nA,2024-01-01,1\nA,2024-01-02,2\nA,2024-01-03,3.5\n")
+
+    paths = write_partitions(str(data_path), str(tmp_path / "parts"), 1, chunksize=2)
+    assert read_frame(paths[0])["y"].tolist() == [1.0, 2.0, 3.5]
+
+
+def test_partitioned_run_matches_single_run(tmp_path) -> None:
+    rng = np.random.default_rng(0)
+    ids = [f"id_{i}" for i in range(6)]
+    df = pd.concat([
+        pd.DataFrame({
+            "unique_id": uid,
+            "ds": pd.date_range("2024-01-01", periods=40, freq="D"),
+            "y": 10.0 * (i + 1) + rng.normal(0, 1, 40),
+        })
+        for i, uid in enumerate(ids)
+    ], ignore_index=True)
+    data_path = tmp_path / "data.csv"
+    df.to_csv(data_path, index=False)
+    assert set(assign_partitions(pd.Series(ids), 2)) == {0, 1}
+
+    options = dict(phase=1, n_jobs=1, no_plots=True, no_mlflow=True, no_cache=True)
+    merged = run_partitioned(str(data_path), str(tmp_path / "parts"), 2, max_workers=2, **options)
+    single, _ = run_baseline(make_config(str(data_path), output_dir=str(tmp_path / "single"), **options))
+
+    assert len(merged["partitions"]) == 2
+    assert merged["metrics"] == single["metrics"]
+    assert merged["selected_model"] == single["selected_model"]
+    assert merged["pass_ci"] == single["pass_ci"]
+    merged_forecasts, single_forecasts = (
+        read_frame(find_artifact(str(tmp_path / d), "baseline_forecasts"))
+        .sort_values(["unique_id", "ds"]).reset_index(drop=True)
+        for d in ("parts", "single")
+    )
+    pd.testing.assert_frame_equal(merged_forecasts, single_forecasts)
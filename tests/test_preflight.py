@@ -1,6 +1,8 @@
+import json
 import os
 import pandas as pd
-from forecastkernel.scripts.data_preflight import run_preflight
+import pytest
+from forecastkernel.scripts.data_preflight import run_preflight, run_streaming_preflight
 
 def test_preflight_run(tmp_path):
     df = pd.DataFrame({
@@ -17,3 +19,41 @@ def test_preflight_run(tmp_path):
     assert report["pandera_pass"] is True
     assert report["row_count"] == 3
     assert os.path.exists(report_path)
+
+
+def test_streaming_preflight_run(tmp_path):
+    df = pd.DataFrame({
+        "ds": list(pd.date_range("2024-01-01", periods=3, freq="D")) * 2,
+        "unique_id": ["A"] * 3 + ["B"] * 3,
+        "y": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    csv_path = tmp_path / "sample.csv"
+    df.to_csv(csv_path, index=False)
+    report_path = tmp_path / "report.json"
+
+    report = run_streaming_preflight(str(csv_path), str(report_path), batch_rows=4)
+
+    assert report["pandera_pass"] is True
+    assert report["sql_checks_pass"] is True
+    assert report["validated_rows"] == 6
+    assert report["series_count"] == 2
+    assert report["series_length"]["min"] == 3
+
+
+def test_streaming_preflight_flags_duplicates(tmp_path):
+    df = pd.DataFrame({
+        "ds": ["2024-01-01", "2024-01-02", "2024-01-02"],
+        "unique_id": ["A"] * 3,
+        "y": [1.0, 2.0, 3.0],
+    })
+    csv_path = tmp_path / "dupes.csv"
+    df.to_csv(csv_path, index=False)
+    report_path = tmp_path / "report.json"
+
+    with pytest.raises(ValueError):
+        run_streaming_preflight(str(csv_path), str(report_path))
+
+    with open(report_path) as f:
+        report = json.load(f)
+    assert report["duplicate_keys"] == 1
+    assert report["non_monotonic_ds"] == 1
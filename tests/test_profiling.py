@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from forecastkernel.utils.profiling import annotate, profile_run, profiled, span, timing_metrics
+
+
+@profiled()
+def _hash_chunk(rows: int) -> int:
+    with span("inner", rows=rows):
+        return rows
+
+
+def test_profile_run_nests_and_sums_spans(tmp_path) -> None:
+    path = tmp_path / "timings.json"
+    with profile_run("demo", str(path)) as profile:
+        with span("load") as stage:
+            _hash_chunk(3)
+            stage["rows"] = 10
+        for rows in (4, 5):
+            with span("fit", rows=rows):
+                pass
+        annotate(mlflow_run_id="abc")
+
+    payload = json.loads(path.read_text())
+    assert payload == profile["result"]
+    assert payload["status"] == "completed"
+    assert payload["metadata"] == {"mlflow_run_id": "abc"}
+    stages = {entry["stage"]: entry for entry in payload["stages"]}
+    assert set(stages) == {"total", "load", "load/_hash_chunk", "load/_hash_chunk/inner", "fit"}
+    assert stages["load"]["rows"] == 10
+    assert stages["load/_hash_chunk/inner"]["rows"] == 3
+    assert stages["fit"]["calls"] == 2
+    assert stages["fit"]["rows"] == 9
+    assert stages["total"]["wall_s"] >= stages["load"]["wall_s"]
+
+    metrics = timing_metrics(payload)
+    assert metrics["timing/fit/rows"] == 9.0
+    assert "timing/total/rows" not in metrics
+
+
+def test_failed_run_still_writes_timings(tmp_path) -> None:
+    path = tmp_path / "timings.json"
+    with pytest.raises(ValueError, match="boom"):
+        with profile_run("demo", str(path)):
+            with span("validate"):
+                raise ValueError("boom")
+    payload = json.loads(path.read_text())
+    assert payload["status"] == "failed"
+    assert [entry["stage"] for entry in payload["stages"]] == ["total", "validate"]
+
+
+def test_spans_outside_a_run_are_no_ops() -> None:
+    with span("load", rows=2) as stage:
+        stage["rows"] = 5
+    assert _hash_chunk(1) == 1
+    annotate(ignored=True)
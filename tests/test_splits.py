@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from forecastkernel.core.splits import holdout_split, rolling_origin_splits
+
+
+def _panel() -> pd.DataFrame:
+    frames = [
+        pd.DataFrame({
+            "unique_id": uid,
+            "ds": pd.date_range("2024-01-01", periods=n, freq="D"),
+            "y": np.arange(n, dtype=float),
+        })
+        for uid, n in [("B", 6), ("A", 10), ("C", 2)]
+    ]
+    # Shuffle rows so the split has to do its own ordering
+    return pd.concat(frames).sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+def test_holdout_split_matches_groupby() -> None:
+    df = _panel()
+    h = 3
+    train_idx, holdout_idx = holdout_split(df, h)
+
+    ordered = df.sort_values(["unique_id", "ds"])
+    expected_train = ordered.groupby("unique_id").head(-h)
+    expected_holdout = ordered.groupby("unique_id").tail(h)
+
+    pd.testing.assert_frame_equal(df.take(train_idx), expected_train)
+    pd.testing.assert_frame_equal(df.take(holdout_idx), expected_holdout)
+
+
+def test_rolling_origin_splits_windows() -> None:
+    df = _panel()
+    splits = rolling_origin_splits(df, h=2, n_windows=2, step_size=1)
+    assert len(splits) == 2
+
+    last_train, last_holdout = splits[-1]
+    assert set(df.take(last_holdout)["y"][df.take(last_holdout)["unique_id"] == "A"]) == {8.0, 9.0}
+
+    first_train, first_holdout = splits[0]
+    a_holdout = df.take(first_holdout)
+    assert a_holdout.loc[a_holdout["unique_id"] == "A", "y"].tolist() == [7.0, 8.0]
+    assert df.take(first_train).groupby("unique_id").size()["A"] == 7
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from forecastkernel.scripts.check_storage import check_storage, get_total_size
+from forecastkernel.utils.storage import load_snapshot, scan_storage, summarize_storage
+
+
+def _age_tree(root) -> None:
+    for dirpath, _, _ in os.walk(root):
+        st = os.stat(dirpath)
+        os.utime(dirpath, ns=(st.st_atime_ns, st.st_mtime_ns - 60 * 10**9))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    data = tmp_path / "data"
+    (data / "outputs" / "plots").mkdir(parents=True)
+    (data / "raw").mkdir()
+    (data / "raw" / "input.csv").write_bytes(b"x" * 1000)
+    (data / "outputs" / "metrics.json").write_bytes(b"x" * 100)
+    (data / "outputs" / "plots" / "a.png").write_bytes(b"x" * 300)
+    os.link(data / "raw" / "input.csv", data / "outputs" / "input_link.csv")
+    os.symlink(data / "raw" / "input.csv", data / "outputs" / "input_symlink.csv")
+    return data
+
+
+def test_summary_dedups_links_and_nested_roots(tree) -> None:
+    roots = [str(tree), str(tree / "outputs")]
+    directories, counters = scan_storage(roots)
+    assert counters == {"dirs_listed": 4, "dirs_reused": 0}
+
+    summary = summarize_storage(
+        directories, roots, {"plots": ["*.png"], "raw": [f"{tree.as_posix()}/raw/*"]}, depth=1
+    )
+    assert summary["total_bytes"] == 1400
+    assert summary["n_files"] == 3
+    assert summary["artifact_types"] == {"raw": 1000, "plots": 300, "other": 100}
+    assert summary["directories"] == {str(tree / "raw"): 1000, str(tree / "outputs"): 400}
+    assert get_total_size(str(tree)) == 1400
+
+
+def test_relative_roots(tree, monkeypatch) -> None:
+    monkeypatch.chdir(tree)
+    directories, _ = scan_storage([".", "outputs"])
+    assert summarize_storage(directories, ["."])["total_bytes"] == 1400
+
+
+def test_snapshot_only_relists_changed_directories(tree, tmp_path) -> None:
+    snapshot = str(tmp_path / "snapshot.json")
+    _age_tree(tree)
+    first = check_storage([str(tree)], snapshot_path=snapshot)
+    assert first["dirs_listed"] == 4
+    assert len(load_snapshot(snapshot)) == 4
+
+    second = check_storage([str(tree)], snapshot_path=snapshot)
+    assert (second["dirs_listed"], second["dirs_reused"]) == (0, 4)
+    assert second["total_bytes"] == first["total_bytes"]
+
+    (tree / "outputs" / "plots" / "b.png").write_bytes(b"x" * 50)
+    third = check_storage([str(tree)], snapshot_path=snapshot)
+    assert (third["dirs_listed"], third["dirs_reused"]) == (1, 3)
+    assert third["total_bytes"] == first["total_bytes"] + 50
+
+    # Rewriting a file in place leaves its directory's mtime alone
+    _age_tree(tree)
+    check_storage([str(tree)], snapshot_path=snapshot)
+    (tree / "outputs" / "metrics.json").write_bytes(b"x" * 5000)
+    fourth = check_storage([str(tree)], max_mb=0.005, snapshot_path=snapshot)
+    assert fourth["dirs_listed"] == 0
+    assert fourth["total_bytes"] == third["total_bytes"] + 4900
+    assert "total" in fourth["exceeded"]
+
+    assert check_storage([str(tree)], snapshot_path=snapshot, full=True)["dirs_listed"] == 4
+
+
+def test_budgets(tree, tmp_path) -> None:
+    budget_file = tmp_path / "budgets.yaml"
+    budget_file.write_text("total_mb: 1\ntypes:\n  plots: {patterns: ['*.png'], max_mb: 0.0001}\n")
+    result = check_storage([str(tree)], str(budget_file), snapshot_path=None)
+    assert set(result["exceeded"]) == {"plots"}
+    assert result["exceeded"]["plots"]["used"] == 300
+    assert check_storage([str(tree)], max_mb=0.001, snapshot_path=None)["exceeded"]["total"]["used"] == 1400
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecastkernel.pipelines.visuals import (
+    dispatch_jobs, plan_residual_drift, plan_visual_debug, render_jobs, sample_series,
+    start_renderer, wait_for_jobs,
+)
+
+
+def _panel(n_series: int = 5, n_obs: int = 40) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    frames = [
+        pd.DataFrame({
+            "unique_id": f"s{i}",
+            "ds": pd.date_range("2024-01-01", periods=n_obs, freq="D"),
+            "y": rng.normal(size=n_obs),
+            "model_a": rng.normal(size=n_obs),
+        })
+        for i in range(n_series)
+    ]
+    return pd.concat(frames).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_sample_series_policies() -> None:
+    ids = np.array(["c", "a", "c", "b", "d"])
+    assert sample_series(ids).tolist() == ["c", "a", "b", "d"]
+    assert sample_series(ids, 2).tolist() == ["c", "a"]
+    assert sample_series(ids, 2, "random", seed=1).tolist() == sample_series(ids, 2, "random", seed=1).tolist()
+    scores = pd.Series({"a": 1.0, "b": 5.0, "c": 3.0})
+    assert sample_series(ids, 2, "worst", scores).tolist() == ["b", "c"]
+    with pytest.raises(ValueError):
+        sample_series(ids, 2, "worst")
+    with pytest.raises(ValueError):
+        sample_series(ids, 2, "largest")
+
+
+def test_plans_group_and_cap_series(tmp_path) -> None:
+    df = _panel()
+    jobs = plan_residual_drift(df, "model_a", str(tmp_path), max_series=3)
+    assert len(jobs) == 3
+    uid = sample_series(df["unique_id"], 3)[0]
+    _, kwargs = jobs[0]
+    (ds, values, _), = kwargs["lines"]
+    series = df[df["unique_id"] == uid].sort_values("ds")
+    assert kwargs["title"].endswith(uid)
+    np.testing.assert_array_equal(ds, series["ds"].to_numpy())
+    np.testing.assert_array_equal(values, series["model_a"].to_numpy())
+
+    forecasts = df.rename(columns={"y": "actual"})
+    jobs = plan_visual_debug(
+        df, forecasts, {"SpectralEntropy": 0.5, "CV2": 0.1}, ["model_a"], str(tmp_path), df, max_series=2
+    )
+    # Two forecast plots, the scatter, a residual line and its histogram
+    assert len(jobs) == 5
+
+
+def test_render_in_process_and_pool(tmp_path) -> None:
+    df = _panel(n_series=3, n_obs=35)
+    jobs = plan_residual_drift(df, "model_a", str(tmp_path / "serial"))
+    assert dispatch_jobs(jobs) == []
+    assert len(list((tmp_path / "serial" / "drift").glob("*.png"))) == 3
+
+    jobs = plan_visual_debug(
+        df, df, {"SpectralEntropy": 0.5, "CV2": 0.1}, ["model_a"], str(tmp_path / "pool"), df
+    )
+    with start_renderer(1) as pool:
+        futures = dispatch_jobs(jobs, pool, batch_size=2)
+        assert wait_for_jobs(futures) == len(jobs)
+    written = sorted(p.name for p in (tmp_path / "pool" / "plots").rglob("*.png"))
+    assert written == sorted(
+        ["s0_forecast.png", "s1_forecast.png", "forecastability_scatter.png",
+         "model_a_residuals.png", "model_a_resid_hist.png"]
+    )
+    assert render_jobs([]) == 0